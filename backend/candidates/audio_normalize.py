@@ -0,0 +1,173 @@
+"""
+Audio normalization before transcription.
+
+Answers arrive in whatever the browser's MediaRecorder produced (usually 48 kHz
+webm/opus, labelled audio/wav). Before any transcription provider sees them they
+are converted with ffmpeg to 16 kHz mono, which is what speech models work at:
+
+- 'opus' (default): Ogg/Opus at 24 kbit/s, a fraction of the upload size
+- 'flac': lossless 16-bit FLAC, for providers or accounts that prefer it
+
+The format is chosen with AUDIO_NORMALIZE_FORMAT. A recording ffmpeg cannot
+decode fails here with AudioNormalizationError instead of after a round trip to
+the provider.
+
+Normalized audio is cached in the GridFS audio bucket keyed by the SHA-256 of
+the original bytes, so transcribing the same answer again (a retry, another
+provider, the report) skips the conversion. If ffmpeg isn't installed,
+normalize_audio() returns None and callers send the original bytes.
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from collections import namedtuple
+
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+SAMPLE_RATE = 16000
+AUDIO_NORMALIZE_TIMEOUT = int(os.getenv('AUDIO_NORMALIZE_TIMEOUT', 60))
+
+# Output format -> ffmpeg encoder arguments and how the result is described to providers
+NORMALIZED_FORMATS = {
+    'opus': {
+        'args': ['-c:a', 'libopus', '-b:a', '24k', '-application', 'voip', '-f', 'ogg'],
+        'content_type': 'audio/ogg',
+        'suffix': '.ogg',
+        'encoding': 'OGG_OPUS',
+    },
+    'flac': {
+        'args': ['-c:a', 'flac', '-sample_fmt', 's16', '-f', 'flac'],
+        'content_type': 'audio/flac',
+        'suffix': '.flac',
+        'encoding': 'FLAC',
+    },
+}
+AUDIO_NORMALIZE_FORMAT = os.getenv('AUDIO_NORMALIZE_FORMAT', 'opus')
+if AUDIO_NORMALIZE_FORMAT not in NORMALIZED_FORMATS:
+    print(f"⚠️ Ignoring unknown AUDIO_NORMALIZE_FORMAT={AUDIO_NORMALIZE_FORMAT!r}, using 'opus'")
+    AUDIO_NORMALIZE_FORMAT = 'opus'
+
+NORMALIZED_AUDIO_TYPE = 'normalized_audio'
+
+# data, content_type, suffix (for providers that want a file), encoding (Google Speech enum name),
+# sample_rate; encoding and sample_rate are None for audio that was not normalized
+NormalizedAudio = namedtuple('NormalizedAudio', 'data content_type suffix encoding sample_rate')
+
+
+class AudioNormalizationError(ValueError):
+    """Raised when ffmpeg cannot decode the audio (or takes too long)"""
+
+
+def ffmpeg_available():
+    return shutil.which(FFMPEG_BINARY) is not None
+
+
+def convert_audio(content, output_format=None):
+    """
+    Convert audio to 16 kHz mono in one of NORMALIZED_FORMATS.
+
+    Args:
+        content (bytes): Audio in any format ffmpeg can read
+        output_format (str): 'opus' or 'flac' (default AUDIO_NORMALIZE_FORMAT)
+
+    Returns:
+        bytes: Converted audio
+
+    Raises:
+        AudioNormalizationError: ffmpeg failed or timed out
+    """
+    spec = NORMALIZED_FORMATS[output_format or AUDIO_NORMALIZE_FORMAT]
+
+    # Input goes through a file rather than stdin: containers like mp4 keep their index
+    # at the end, which ffmpeg can only reach by seeking
+    with tempfile.NamedTemporaryFile(suffix='.audio') as source:
+        source.write(content)
+        source.flush()
+        try:
+            result = subprocess.run(
+                [FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-nostdin', '-y',
+                 '-i', source.name, '-vn', '-ac', '1', '-ar', str(SAMPLE_RATE), *spec['args'], 'pipe:1'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=AUDIO_NORMALIZE_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            raise AudioNormalizationError(f'Audio conversion took longer than {AUDIO_NORMALIZE_TIMEOUT}s')
+
+    if result.returncode != 0 or not result.stdout:
+        lines = result.stderr.decode('utf-8', 'replace').strip().splitlines()
+        raise AudioNormalizationError(f"Audio could not be decoded: {lines[-1] if lines else 'no audio stream'}")
+    return result.stdout
+
+
+def _load_cached(sha256, output_format):
+    from .audio_store import get_audio_helper
+
+    helper = get_audio_helper()
+    gridfs_file = helper.fs.find_one({
+        'metadata.type': NORMALIZED_AUDIO_TYPE,
+        'metadata.sha256': sha256,
+        'metadata.format': output_format,
+    })
+    return gridfs_file.read() if gridfs_file else None
+
+
+def _store_cached(sha256, output_format, data):
+    from .audio_store import get_audio_helper
+
+    spec = NORMALIZED_FORMATS[output_format]
+    get_audio_helper().store_file(
+        data,
+        filename=f'{sha256}{spec["suffix"]}',
+        content_type=spec['content_type'],
+        metadata={'type': NORMALIZED_AUDIO_TYPE, 'sha256': sha256, 'format': output_format},
+    )
+
+
+def normalize_audio(content, output_format=None):
+    """
+    Get the normalized version of an answer's audio, converting it on first use.
+
+    Args:
+        content (bytes): Original audio
+        output_format (str): 'opus' or 'flac' (default AUDIO_NORMALIZE_FORMAT)
+
+    Returns:
+        NormalizedAudio: or None if ffmpeg is not installed
+
+    Raises:
+        AudioNormalizationError: The audio cannot be decoded
+    """
+    output_format = output_format or AUDIO_NORMALIZE_FORMAT
+    spec = NORMALIZED_FORMATS[output_format]
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    try:
+        data = _load_cached(sha256, output_format)
+    except Exception as e:
+        print(f"Normalized audio cache unavailable: {e}")
+        data = None
+
+    if data is None:
+        if not ffmpeg_available():
+            return None
+        data = convert_audio(content, output_format)
+        print(f"🎚️ Normalized audio {len(content)} -> {len(data)} bytes ({output_format}, {SAMPLE_RATE} Hz mono)")
+        try:
+            _store_cached(sha256, output_format, data)
+        except Exception as e:
+            print(f"Could not cache normalized audio: {e}")
+
+    return NormalizedAudio(data, spec['content_type'], spec['suffix'], spec['encoding'], SAMPLE_RATE)
+
+
+def delete_normalized_audio(sha256, helper=None):
+    """Drop every cached normalization of the audio with this hash"""
+    if not sha256:
+        return
+    from .audio_store import get_audio_helper
+
+    helper = helper or get_audio_helper()
+    for gridfs_file in helper.fs.find({'metadata.type': NORMALIZED_AUDIO_TYPE, 'metadata.sha256': sha256}):
+        helper.delete_file(gridfs_file._id)
@@ -0,0 +1,98 @@
+# GridFS storage for interview audio answers
+# Recordings live in the 'audio' GridFS bucket; each entry of Candidate.audio_responses keeps only
+# a reference (audio_file_id) plus the question, duration and transcription, so the candidate
+# document stays small no matter how long the answers are.
+# Responses saved before this may still carry the bytes inline in audio_data until
+# `python manage.py migrate_audio_to_gridfs` has moved them out; read_audio handles both.
+#
+# Stored bytes may be compressed (see blob_codecs.py); the codec and raw size are recorded on
+# the response and in the GridFS file metadata, as for resumes.
+# Normalized copies made for transcription (see audio_normalize.py) share the bucket,
+# tagged metadata.type='normalized_audio' instead of 'audio_response'.
+
+import hashlib
+
+from .blob_codecs import sniff_content_type, encode_blob, unpack_audio
+from .gridfs_models import GridFSHelper
+
+AUDIO_BUCKET = 'audio'
+MAX_AUDIO_SIZE = 50 * 1024 * 1024  # 50MB, several minutes of uncompressed WAV
+
+
+def get_audio_helper():
+    """GridFSHelper on the audio bucket"""
+    return GridFSHelper(bucket=AUDIO_BUCKET)
+
+
+def store_audio(candidate_id, question_id, question_text, content, transcription='', filename=None, helper=None):
+    """
+    Store one recorded answer in GridFS.
+
+    Args:
+        candidate_id (str): Candidate ID
+        question_id (str): ID of the question answered
+        question_text (str): Text of the question answered
+        content (bytes): Raw audio
+        transcription (str): Transcript of the answer, if known
+        filename (str): Original filename
+        helper (GridFSHelper): Audio bucket helper to reuse
+
+    Returns:
+        dict: audio_file_id, audio_codec, audio_content_type, audio_size for the audio response
+    """
+    helper = helper or get_audio_helper()
+    content_type = sniff_content_type(content, 'audio/wav')
+    stored, codec = encode_blob(content, content_type)
+    file_id = helper.store_file(
+        stored,
+        filename=filename or f"{candidate_id}_{question_id}.audio",
+        content_type=content_type,
+        metadata={
+            'type': 'audio_response',
+            'candidate_id': candidate_id,
+            'question_id': question_id,
+            'question_text': question_text,
+            'transcribed_text': transcription or '',
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'codec': codec,
+            'size': len(content),
+        },
+    )
+    return {
+        'audio_file_id': file_id,
+        'audio_codec': codec,
+        'audio_content_type': content_type,
+        'audio_size': len(content),
+    }
+
+
+def read_audio(response, helper=None):
+    """
+    Raw audio bytes of an audio response, from GridFS or (legacy) inline
+
+    Args:
+        response (dict): Entry of Candidate.audio_responses
+        helper (GridFSHelper): Audio bucket helper to reuse
+
+    Returns:
+        bytes: or None if the response has no audio
+    """
+    file_id = response.get('audio_file_id')
+    if not file_id:
+        return unpack_audio(response)
+    helper = helper or get_audio_helper()
+    gridfs_file = helper.get_file(file_id)
+    return helper.read_file(gridfs_file) if gridfs_file else None
+
+
+def delete_audio(response, helper=None):
+    """Delete the GridFS file behind an audio response, if it has one, and its normalized copies"""
+    if not response or not response.get('audio_file_id'):
+        return
+    from .audio_normalize import delete_normalized_audio
+
+    helper = helper or get_audio_helper()
+    gridfs_file = helper.get_file(response['audio_file_id'])
+    if gridfs_file is not None:
+        delete_normalized_audio((gridfs_file.metadata or {}).get('sha256'), helper)
+    helper.delete_file(response['audio_file_id'])
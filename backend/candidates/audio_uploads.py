@@ -0,0 +1,245 @@
+# Resumable, chunked uploads of interview answers
+# The browser opens an upload session when recording starts and sends each piece of the
+# recording as MediaRecorder produces it, so by the time the candidate presses stop almost
+# everything is already on the server. Chunks are appended at an explicit byte offset:
+# a chunk that was received but whose response got lost can be resent safely, and after a
+# dropped connection the client asks for the session's offset and carries on from there.
+# Finalizing assembles the chunks into one recording and stores it like any other answer
+# (see audio_store.py).
+#
+# Sessions and chunks live in MongoDB rather than on local disk, so consecutive chunks may
+# land on different worker processes. Abandoned sessions expire after UPLOAD_TTL_SECONDS, and
+# a finalize that died half-way is taken over by the next finalize after FINALIZE_TIMEOUT_SECONDS.
+
+from mongoengine import Document, StringField, IntField, BinaryField, DateTimeField, ListField
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+import uuid
+
+from .audio_store import MAX_AUDIO_SIZE
+
+MAX_CHUNK_SIZE = 4 * 1024 * 1024  # 4MB, well under DATA_UPLOAD_MAX_MEMORY_SIZE
+UPLOAD_TTL_SECONDS = 24 * 60 * 60
+FINALIZE_TIMEOUT_SECONDS = 5 * 60  # a finalize still running after this long is presumed dead
+
+STATUS_OPEN = 'open'
+STATUS_FINALIZING = 'finalizing'
+
+
+class UploadError(ValueError):
+    """Raised for a chunk or finalize request that cannot be applied to the session"""
+
+
+class OffsetMismatch(UploadError):
+    """Raised for a chunk that doesn't start where the received bytes end"""
+
+    def __init__(self, expected):
+        super().__init__(f'Expected a chunk at offset {expected}')
+        self.expected = expected
+
+
+class AudioUpload(Document):
+    """
+    An in-progress answer upload; size is the number of contiguous bytes received so far
+    and chunks the ids of the chunks holding them
+    """
+    upload_id = StringField(primary_key=True)
+    candidate_id = StringField(max_length=100, required=True)
+    question_id = StringField(max_length=100, required=True)
+    question_text = StringField()
+    filename = StringField(max_length=255)
+    size = IntField(default=0)
+    chunks = ListField(StringField())
+    status = StringField(max_length=20, default=STATUS_OPEN)
+    created_at = DateTimeField(default=datetime.utcnow)
+    updated_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'audio_uploads',
+        'indexes': [
+            {'fields': ['updated_at'], 'expireAfterSeconds': UPLOAD_TTL_SECONDS},
+        ],
+    }
+
+
+class AudioUploadChunk(Document):
+    """
+    One received piece of an upload, keyed '<upload_id>:<offset>:<nonce>' so that concurrent
+    writers of the same offset never overwrite each other (sessions opened before the nonce
+    was added have '<upload_id>:<offset>' chunks)
+    """
+    chunk_id = StringField(primary_key=True)
+    upload_id = StringField(max_length=100, required=True)
+    offset = IntField(required=True)
+    data = BinaryField()
+    created_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'audio_upload_chunks',
+        'indexes': [
+            ('upload_id', 'offset'),
+            {'fields': ['created_at'], 'expireAfterSeconds': UPLOAD_TTL_SECONDS},
+        ],
+    }
+
+
+def create_upload(candidate_id, question_id, question_text, filename=None):
+    """
+    Open an upload session for one answer.
+
+    Returns:
+        dict: The audio_uploads row
+    """
+    now = datetime.utcnow()
+    row = {
+        '_id': uuid.uuid4().hex,
+        'candidate_id': candidate_id,
+        'question_id': question_id,
+        'question_text': question_text,
+        'filename': filename,
+        'size': 0,
+        'chunks': [],
+        'status': STATUS_OPEN,
+        'created_at': now,
+        'updated_at': now,
+    }
+    AudioUpload._get_collection().insert_one(row)
+    return row
+
+
+def get_upload(upload_id):
+    """The audio_uploads row, or None if it doesn't exist or has expired"""
+    return AudioUpload._get_collection().find_one({'_id': upload_id})
+
+
+def append_chunk(upload_id, offset, data):
+    """
+    Append a chunk to an open upload.
+
+    Args:
+        upload_id (str): Upload session ID
+        offset (int): Byte offset of the chunk in the recording
+        data (bytes): Chunk content
+
+    Returns:
+        int: Bytes received so far (the offset of the next chunk), or None if there is no such upload
+
+    Raises:
+        OffsetMismatch: The chunk doesn't continue the received bytes; .expected says where to resume
+        UploadError: The chunk is too large or the upload is no longer open
+    """
+    sessions = AudioUpload._get_collection()
+    session = sessions.find_one({'_id': upload_id}, {'size': 1, 'status': 1})
+    if session is None:
+        return None
+    if session['status'] != STATUS_OPEN:
+        raise UploadError('Upload is already finalized')
+    if not data:
+        raise UploadError('Chunk is empty')
+    if len(data) > MAX_CHUNK_SIZE:
+        raise UploadError(f'Chunk too large (max {MAX_CHUNK_SIZE // (1024 * 1024)}MB)')
+
+    size = session['size']
+    if offset != size:
+        # A resend of bytes we already have (the response to the first attempt was lost)
+        if 0 <= offset and offset + len(data) <= size:
+            return size
+        raise OffsetMismatch(size)
+    if size + len(data) > MAX_AUDIO_SIZE:
+        raise UploadError(f'Audio too large (max {MAX_AUDIO_SIZE // (1024 * 1024)}MB)')
+
+    # Write the chunk under its own id first, then claim its bytes on the session: only the
+    # writer whose update still finds the session at this offset records its chunk. A chunk
+    # left behind by a losing writer (or a crash) is never listed, so it is never read.
+    now = datetime.utcnow()
+    chunk_id = f'{upload_id}:{offset}:{uuid.uuid4().hex[:8]}'
+    chunks = AudioUploadChunk._get_collection()
+    chunks.insert_one({'_id': chunk_id, 'upload_id': upload_id, 'offset': offset, 'data': data, 'created_at': now})
+    claimed = sessions.find_one_and_update(
+        {'_id': upload_id, 'size': offset, 'status': STATUS_OPEN},
+        {'$inc': {'size': len(data)}, '$push': {'chunks': chunk_id}, '$set': {'updated_at': now}},
+        projection={'size': 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if claimed is None:
+        chunks.delete_one({'_id': chunk_id})
+        current = sessions.find_one({'_id': upload_id}, {'size': 1, 'status': 1})
+        if current is None or current['status'] != STATUS_OPEN:
+            raise UploadError('Upload is already finalized')
+        # The same bytes may have just been accepted from a concurrent resend of this chunk
+        if offset + len(data) <= current['size']:
+            return current['size']
+        raise OffsetMismatch(current['size'])
+    return claimed['size']
+
+
+def claim_upload(upload_id, expected_size=None):
+    """
+    Close an upload to further chunks and assemble the recording.
+
+    Args:
+        upload_id (str): Upload session ID
+        expected_size (int): Total size the client sent, checked against what was received
+
+    Returns:
+        tuple: (audio_uploads row, assembled bytes), or None if there is no such upload
+
+    Raises:
+        UploadError: The upload is empty, incomplete, or being finalized by another request
+    """
+    sessions = AudioUpload._get_collection()
+    now = datetime.utcnow()
+    session = sessions.find_one_and_update(
+        {'_id': upload_id, '$or': [
+            {'status': STATUS_OPEN},
+            # Left finalizing by a request that crashed; updated_at is when it claimed the upload
+            {'status': STATUS_FINALIZING, 'updated_at': {'$lt': now - timedelta(seconds=FINALIZE_TIMEOUT_SECONDS)}},
+        ]},
+        {'$set': {'status': STATUS_FINALIZING, 'updated_at': now}},
+    )
+    if session is None:
+        if get_upload(upload_id) is None:
+            return None
+        raise UploadError('Upload is already being finalized')
+
+    try:
+        size = session['size']
+        if not size:
+            raise UploadError('No audio was uploaded')
+        if expected_size is not None and expected_size != size:
+            raise OffsetMismatch(size)
+
+        parts = []
+        position = 0
+        accepted = set(session.get('chunks') or [])
+        chunks = AudioUploadChunk._get_collection().find(
+            {'upload_id': upload_id, 'offset': {'$lt': size}}
+        ).sort('offset', 1)
+        for chunk in chunks:
+            if chunk['_id'] not in accepted and chunk['_id'] != f"{upload_id}:{chunk['offset']}":
+                continue  # written by a request that lost the race for its offset
+            if chunk['offset'] != position:
+                raise UploadError(f'Upload is missing bytes at offset {position}')
+            parts.append(bytes(chunk['data']))
+            position += len(chunk['data'])
+        if position != size:
+            raise UploadError(f'Upload is missing bytes at offset {position}')
+    except Exception:
+        release_upload(upload_id)
+        raise
+
+    return session, b''.join(parts)
+
+
+def release_upload(upload_id):
+    """Reopen an upload whose finalize failed, so the client can resume or retry"""
+    AudioUpload._get_collection().update_one(
+        {'_id': upload_id, 'status': STATUS_FINALIZING},
+        {'$set': {'status': STATUS_OPEN, 'updated_at': datetime.utcnow()}},
+    )
+
+
+def delete_upload(upload_id):
+    """Drop a finished upload session and its chunks"""
+    AudioUploadChunk._get_collection().delete_many({'upload_id': upload_id})
+    AudioUpload._get_collection().delete_one({'_id': upload_id})
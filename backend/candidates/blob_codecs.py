@@ -0,0 +1,212 @@
+"""
+Compression codecs for stored blobs (resume PDFs, audio answers).
+
+Every stored blob carries a codec tag ('identity', 'zstd' or 'zlib') next to
+its bytes, and readers decode according to the tag, so blobs written before
+compression existed ('identity' or no tag at all) keep working unchanged.
+
+Content that is already compressed (opus/webm/ogg audio, mp3, images, zips,
+PDFs, whose streams are deflated) is stored as-is; everything else is
+compressed and the result kept only if it saves at least MIN_SAVING of the
+size. zstd is used when the zstandard package is installed, zlib otherwise.
+"""
+import base64
+import binascii
+import zlib
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+CODEC_IDENTITY = 'identity'
+CODEC_ZSTD = 'zstd'
+CODEC_ZLIB = 'zlib'
+
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+MIN_SAVING = 0.05  # keep a compressed copy only if it is at least 5% smaller
+
+# Formats whose payload is already entropy-coded; compressing them again only costs CPU.
+# PDFs are included because a compressed blob can't serve byte ranges (see DecompressingReader)
+INCOMPRESSIBLE_TYPES = {
+    'audio/webm', 'audio/ogg', 'audio/opus', 'audio/mpeg', 'audio/mp4', 'audio/aac', 'audio/flac',
+    'video/webm', 'image/jpeg', 'image/png', 'image/webp', 'application/zip', 'application/gzip',
+    'application/pdf',
+}
+
+_MAGIC_TYPES = (
+    (b'\x1a\x45\xdf\xa3', 'audio/webm'),
+    (b'OggS', 'audio/ogg'),
+    (b'fLaC', 'audio/flac'),
+    (b'ID3', 'audio/mpeg'),
+    (b'%PDF-', 'application/pdf'),
+    (b'\x89PNG', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'PK\x03\x04', 'application/zip'),
+)
+
+
+def sniff_content_type(data, declared=None):
+    """
+    Detect the real format from the leading bytes.
+    Browsers label MediaRecorder output 'audio/wav' even when it is webm/opus, so the
+    declared type is only used when the bytes are not recognised.
+    """
+    head = bytes(data[:12])
+    for magic, content_type in _MAGIC_TYPES:
+        if head.startswith(magic):
+            return content_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'audio/wav'
+    return declared or 'application/octet-stream'
+
+
+def preferred_codec():
+    return CODEC_ZSTD if ZSTD_AVAILABLE else CODEC_ZLIB
+
+
+def is_compressible(content_type):
+    return (content_type or '').split(';')[0].strip().lower() not in INCOMPRESSIBLE_TYPES
+
+
+def compressor(codec):
+    """Incremental compressor with compress(chunk) and flush() for a codec"""
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    if codec == CODEC_ZLIB:
+        return zlib.compressobj(ZLIB_LEVEL)
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def decompressor(codec):
+    """Incremental decompressor with decompress(chunk) for a codec"""
+    if codec == CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Blob is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompressobj()
+    if codec == CODEC_ZLIB:
+        return zlib.decompressobj()
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def encode_blob(data, content_type=None):
+    """
+    Compress data for storage if that pays off.
+
+    Args:
+        data (bytes): Raw content
+        content_type (str): MIME type, used to skip already-compressed formats
+
+    Returns:
+        tuple: (stored bytes, codec tag)
+    """
+    if not data or not is_compressible(content_type):
+        return data, CODEC_IDENTITY
+
+    codec = preferred_codec()
+    compress = compressor(codec)
+    stored = compress.compress(data) + compress.flush()
+    if len(stored) > len(data) * (1 - MIN_SAVING):
+        return data, CODEC_IDENTITY
+    return stored, codec
+
+
+def decode_blob(data, codec=None):
+    """Return the raw content of a stored blob"""
+    if not codec or codec == CODEC_IDENTITY or not data:
+        return data
+    return decompressor(codec).decompress(bytes(data))
+
+
+class DecompressingReader:
+    """
+    Read-only file object over a compressed stream, decoding one chunk at a time.
+    It reports itself as not seekable: seek() works, but seeking forward decodes and
+    discards and seeking backward restarts from the beginning of the stream, so byte
+    ranges cost O(file size) each and callers should serve the whole stream instead.
+    """
+
+    def __init__(self, raw, codec, chunk_size=255 * 1024):
+        self._raw = raw
+        self._codec = codec
+        self._chunk_size = chunk_size
+        self._restart()
+
+    def _restart(self):
+        self._raw.seek(0)
+        self._decompress = decompressor(self._codec)
+        self._buffer = b''
+        self._position = 0
+        self._eof = False
+
+    def _fill(self, size):
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = self._raw.read(self._chunk_size)
+            if not chunk:
+                self._eof = True
+                break
+            self._buffer += self._decompress.decompress(chunk)
+
+    def read(self, size=-1):
+        self._fill(size)
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        self._position += len(data)
+        return data
+
+    def seek(self, offset, whence=0):
+        if whence != 0:
+            raise ValueError("DecompressingReader only supports absolute seeks")
+        if offset < self._position:
+            self._restart()
+        while self._position < offset:
+            if not self.read(min(self._chunk_size, offset - self._position)):
+                break
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def seekable(self):
+        return False
+
+    def close(self):
+        self._raw.close()
+
+
+def decode_audio_base64(audio_base64):
+    """
+    Decode an audio answer posted as base64 text by older clients.
+
+    Args:
+        audio_base64 (str): Base64-encoded audio (a data: URL prefix is tolerated)
+
+    Returns:
+        bytes: Raw audio
+
+    Raises:
+        ValueError: If audio_base64 is not valid base64
+    """
+    if audio_base64.startswith('data:') and ',' in audio_base64:
+        audio_base64 = audio_base64.split(',', 1)[1]
+    try:
+        return base64.b64decode(audio_base64, validate=True)
+    except (binascii.Error, ValueError):
+        raise ValueError('audio_data must be base64-encoded')
+
+
+def unpack_audio(response):
+    """
+    Raw audio bytes of an audio response stored inline (see audio_store.py for GridFS ones).
+    Responses saved before compression hold a base64 string and no codec tag.
+    """
+    audio_data = response.get('audio_data')
+    if not audio_data:
+        return None
+    if isinstance(audio_data, str):
+        return base64.b64decode(audio_data)
+    return decode_blob(bytes(audio_data), response.get('audio_codec'))
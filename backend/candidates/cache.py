@@ -0,0 +1,154 @@
+"""
+Cache for recruiter candidate lists and individual candidate summaries.
+
+Uses Django's default cache (Redis via django_redis in production, local memory
+in development). List and dashboard stats entries are keyed by a per-recruiter version that
+Candidate.save() replaces on every write, so one write invalidates every cached
+page, delta and filter of that recruiter's list without enumerating keys.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+KEY_PREFIX = 'candidates'
+CACHE_TIMEOUT = 300  # seconds; invalidation is explicit, this only bounds memory
+
+
+def _list_version_key(user_id):
+    return f'{KEY_PREFIX}:list_version:{user_id}'
+
+
+def _summary_key(candidate_id):
+    return f'{KEY_PREFIX}:summary:{candidate_id}'
+
+
+def _stats_key(name):
+    return f'{KEY_PREFIX}:stats:{name}'
+
+
+def _count(name):
+    key = _stats_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def _list_version(user_id):
+    # A fresh timestamp (rather than a counter) means an evicted version key can
+    # never bring an old generation of entries back to life
+    version = cache.get(_list_version_key(user_id))
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(_list_version_key(user_id), version, None):
+            version = cache.get(_list_version_key(user_id), version)
+    return version
+
+
+def list_cache_key(user_id, query_string=''):
+    """
+    Cache key for a recruiter's list under the current list version.
+
+    Compute it once per request, before querying, and pass the same key to both
+    get_cached_list() and cache_list(): a write that lands while the query runs
+    bumps the version, so the possibly stale result is stored under a key no
+    later request will look up.
+    """
+    query_hash = hashlib.md5(query_string.encode('utf-8')).hexdigest()
+    return f'{KEY_PREFIX}:list:{user_id}:{_list_version(user_id)}:{query_hash}'
+
+
+def get_cached_list(key):
+    """
+    Cached list response stored under a list_cache_key().
+
+    Returns:
+        dict: {'etag': str, 'data': serialized response body} or None on a miss
+    """
+    try:
+        entry = cache.get(key)
+        _count('list_hits' if entry is not None else 'list_misses')
+        return entry
+    except Exception as e:
+        print(f"Candidate list cache read failed: {e}")
+        return None
+
+
+def cache_list(key, etag, data):
+    try:
+        cache.set(key, {'etag': etag, 'data': data}, CACHE_TIMEOUT)
+    except Exception as e:
+        print(f"Candidate list cache write failed: {e}")
+
+
+def stats_cache_key(user_id):
+    """Cache key for a recruiter's dashboard stats, versioned like the list keys"""
+    return f'{KEY_PREFIX}:recruiter_stats:{user_id}:{_list_version(user_id)}'
+
+
+def get_cached_stats(key):
+    """Cached stats response stored under a stats_cache_key(), as {'etag', 'data'}, or None"""
+    try:
+        return cache.get(key)
+    except Exception as e:
+        print(f"Candidate stats cache read failed: {e}")
+        return None
+
+
+def cache_stats(key, etag, data):
+    try:
+        cache.set(key, {'etag': etag, 'data': data}, CACHE_TIMEOUT)
+    except Exception as e:
+        print(f"Candidate stats cache write failed: {e}")
+
+
+def get_cached_summary(candidate_id):
+    """Cached summary dict for a candidate (see cache_summary), or None on a miss"""
+    try:
+        entry = cache.get(_summary_key(candidate_id))
+        _count('summary_hits' if entry is not None else 'summary_misses')
+        return entry
+    except Exception as e:
+        print(f"Candidate summary cache read failed: {e}")
+        return None
+
+
+def cache_summary(candidate_id, summary):
+    try:
+        cache.set(_summary_key(candidate_id), summary, CACHE_TIMEOUT)
+    except Exception as e:
+        print(f"Candidate summary cache write failed: {e}")
+
+
+def invalidate_candidate(candidate_id, created_by_id):
+    """Drop a candidate's summary and every cached list of its recruiter"""
+    try:
+        cache.delete(_summary_key(candidate_id))
+        cache.set(_list_version_key(created_by_id), time.time_ns(), None)
+    except Exception as e:
+        print(f"Candidate cache invalidation failed: {e}")
+
+
+def invalidate_recruiter(created_by_id):
+    """Drop every cached list of a recruiter (e.g. after a bulk insert)"""
+    try:
+        cache.set(_list_version_key(created_by_id), time.time_ns(), None)
+    except Exception as e:
+        print(f"Candidate cache invalidation failed: {e}")
+
+
+def get_cache_stats():
+    """Hit/miss counters since the cache was last flushed"""
+    names = ['list_hits', 'list_misses', 'summary_hits', 'summary_misses']
+    try:
+        values = cache.get_many([_stats_key(name) for name in names])
+    except Exception as e:
+        return {'error': str(e)}
+
+    stats = {name: values.get(_stats_key(name), 0) for name in names}
+    for kind in ('list', 'summary'):
+        total = stats[f'{kind}_hits'] + stats[f'{kind}_misses']
+        stats[f'{kind}_hit_rate'] = round(stats[f'{kind}_hits'] / total, 3) if total else None
+    return stats
@@ -0,0 +1,289 @@
+"""
+Server-push change feed for recruiter dashboards.
+
+One background watcher per process follows the candidates collection and fans
+changes out to every connected dashboard of the owning recruiter, so N open
+dashboards cost one database cursor instead of N pollers.
+
+The watcher uses a MongoDB change stream when the server supports it (replica
+sets and Atlas) and falls back to polling updated_at on a standalone mongod.
+
+To try the change stream path locally, run a single-node replica set:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 --port 27017
+    mongosh --eval 'rs.initiate()'
+
+point MONGODB_URL at mongodb://localhost:27017/?replicaSet=rs0 and run
+``python manage.py watch_candidate_changes`` while changing candidates.
+"""
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from pymongo.errors import OperationFailure, PyMongoError
+from rest_framework.renderers import BaseRenderer
+
+from .models import Candidate, CandidateTombstone
+from .serializers import serialize_candidate_row
+
+# Fields whose change is worth a named event, most significant first
+STATE_EVENTS = (
+    ('evaluation_score', 'evaluation_completed'),
+    ('interview_terminated', 'interview_terminated'),
+    ('interview_completed', 'interview_completed'),
+    ('interview_started', 'interview_started'),
+)
+
+# Same events keyed by the status they lead to, with the field recording when the document
+# reached that status (used when only the document is known; terminating also sets the completion time)
+STATUS_EVENTS = {
+    'evaluated': ('evaluation_completed', 'evaluation_timestamp'),
+    'terminated': ('interview_terminated', 'interview_completion_time'),
+    'completed': ('interview_completed', 'interview_completion_time'),
+    'started': ('interview_started', 'interview_start_time'),
+}
+
+HEARTBEAT_INTERVAL = 15  # seconds between keep-alive comments on idle streams
+POLL_INTERVAL = 2  # seconds between updated_at polls on standalone servers
+RETRY_DELAY = 5  # seconds before reopening a failed change stream
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def candidate_status(doc):
+    """Coarse interview status of a raw candidate document"""
+    if doc.get('evaluation_score'):
+        return 'evaluated'
+    if doc.get('interview_terminated'):
+        return 'terminated'
+    if doc.get('interview_completed'):
+        return 'completed'
+    if doc.get('interview_started'):
+        return 'started'
+    return 'invited'
+
+
+def _summary_projection():
+    projection = {Candidate._fields[name].db_field: 1 for name in Candidate.LIST_FIELDS}
+    projection.update({
+        'interview_started': 1,
+        'interview_completed': 1,
+        'interview_terminated': 1,
+    })
+    projection.update({field: 1 for _, field in STATUS_EVENTS.values()})
+    return projection
+
+
+class CandidateChangeFeed:
+    """Process-wide fan-out of candidate changes to per-recruiter subscriber queues"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # recruiter id (None = everyone) -> set of queues
+        self._thread = None
+        self._resume_token = None
+        self._last_seen = {}  # polling fallback only: candidate_id -> updated_at, for the current overlap window
+        self.mode = None
+
+    def subscribe(self, recruiter_id=None):
+        """
+        Register a new listener.
+
+        Args:
+            recruiter_id: Only receive changes to this recruiter's candidates (None for all)
+
+        Returns:
+            queue.Queue: receives event dicts; pass it back to unsubscribe()
+        """
+        q = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(recruiter_id, set()).add(q)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='candidate-change-feed', daemon=True)
+                self._thread.start()
+        return q
+
+    def unsubscribe(self, recruiter_id, q):
+        with self._lock:
+            listeners = self._subscribers.get(recruiter_id)
+            if listeners:
+                listeners.discard(q)
+                if not listeners:
+                    del self._subscribers[recruiter_id]
+
+    def publish(self, doc, event):
+        """Deliver one change to the owning recruiter's listeners and to catch-all listeners"""
+        payload = {
+            'event': event,
+            'status': candidate_status(doc),
+            'candidate': serialize_candidate_row(doc),
+        }
+        with self._lock:
+            targets = list(self._subscribers.get(doc.get('created_by_id'), ())) + list(self._subscribers.get(None, ()))
+        for q in targets:
+            try:
+                q.put_nowait(payload)
+            except queue.Full:
+                # A stalled client shouldn't hold up everyone else; it will resync via the list endpoint
+                pass
+
+    def publish_removal(self, document_id, tombstone=None):
+        """
+        Tell listeners a candidate was deleted. Without a tombstone the owner is unknown, so every
+        listener gets the bare _id, which only matches a row on the owning recruiter's dashboard.
+        """
+        candidate = {'id': str(document_id), 'candidate_id': None, 'is_active': False}
+        if tombstone:
+            candidate['candidate_id'] = tombstone['_id']
+            recruiters = (tombstone.get('created_by_id'), None)
+        with self._lock:
+            if tombstone:
+                targets = [q for recruiter in recruiters for q in self._subscribers.get(recruiter, ())]
+            else:
+                targets = [q for listeners in self._subscribers.values() for q in listeners]
+        payload = {'event': 'candidate_deleted', 'status': 'deleted', 'candidate': candidate}
+        for q in targets:
+            try:
+                q.put_nowait(payload)
+            except queue.Full:
+                pass
+
+    def _has_subscribers(self):
+        with self._lock:
+            return bool(self._subscribers)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            try:
+                self.mode = 'change_stream'
+                self._watch()
+            except OperationFailure as e:
+                # Change streams need a replica set; standalone servers report code 40573
+                if e.code == 40573 or 'replica set' in str(e).lower():
+                    self.mode = 'polling'
+                    self._poll()
+                else:
+                    print(f"Candidate change stream failed: {e}")
+                    self._resume_token = None
+                    time.sleep(RETRY_DELAY)
+            except PyMongoError as e:
+                print(f"Candidate change stream failed: {e}")
+                time.sleep(RETRY_DELAY)
+
+    def _watch(self):
+        collection = Candidate._get_collection()
+        projection = {'operationType': 1, 'documentKey': 1, 'updateDescription.updatedFields': 1}
+        projection.update({f'fullDocument.{field}': 1 for field in _summary_projection()})
+        pipeline = [
+            {'$match': {'operationType': {'$in': ['insert', 'update', 'replace', 'delete']}}},
+            # Trim blobs on the server; updateLookup would otherwise ship the whole document
+            {'$project': projection},
+        ]
+        with collection.watch(
+            pipeline,
+            full_document='updateLookup',
+            resume_after=self._resume_token,
+            max_await_time_ms=1000,
+        ) as stream:
+            while stream.alive and self._has_subscribers():
+                change = stream.try_next()
+                if change is None:
+                    continue
+                self._resume_token = stream.resume_token
+                if change['operationType'] == 'delete':
+                    # Only the _id survives a delete; Candidate.delete() leaves a tombstone naming the owner
+                    document_id = change['documentKey']['_id']
+                    tombstone = CandidateTombstone._get_collection().find_one({'document_id': document_id})
+                    self.publish_removal(document_id, tombstone)
+                    continue
+                doc = change.get('fullDocument')
+                if not doc:
+                    continue
+                if change['operationType'] == 'insert':
+                    event = 'candidate_created'
+                else:
+                    updated = change.get('updateDescription', {}).get('updatedFields', {})
+                    event = next((name for field, name in STATE_EVENTS if field in updated), 'candidate_updated')
+                self.publish(doc, event)
+
+    def _poll(self):
+        collection = Candidate._get_collection()
+        projection = _summary_projection()
+        since = datetime.utcnow()
+        while self._has_subscribers():
+            time.sleep(POLL_INTERVAL)
+            # Overlap slightly so writes in flight during the previous poll aren't missed
+            window_start = since - timedelta(seconds=POLL_INTERVAL)
+            cursor = collection.find({'updated_at': {'$gte': window_start}}, projection).sort('updated_at', 1)
+            for doc in cursor:
+                seen_at = self._last_seen.get(doc['candidate_id'])
+                if seen_at is not None and doc['updated_at'] <= seen_at:
+                    continue  # already published during the overlap window
+                self._last_seen[doc['candidate_id']] = doc['updated_at']
+                since = max(since, doc['updated_at'])
+                self.publish(doc, self._poll_event(doc, seen_at, window_start))
+
+            # Deleted documents no longer match the query above; their tombstones do
+            tombstones = CandidateTombstone._get_collection().find({'deleted_at': {'$gte': window_start}})
+            for tombstone in tombstones:
+                if tombstone['_id'] in self._last_seen and self._last_seen[tombstone['_id']] >= tombstone['deleted_at']:
+                    continue
+                self._last_seen[tombstone['_id']] = tombstone['deleted_at']
+                since = max(since, tombstone['deleted_at'])
+                self.publish_removal(tombstone.get('document_id'), tombstone)
+
+            # Anything older than the next window can't come back as a duplicate
+            cutoff = since - timedelta(seconds=POLL_INTERVAL)
+            self._last_seen = {cid: seen for cid, seen in self._last_seen.items() if seen >= cutoff}
+
+    @staticmethod
+    def _poll_event(doc, seen_at, window_start):
+        """
+        Status event if the document reached its status since it was last published (or, if it
+        wasn't, within this poll window), else candidate_updated. Read from the document's own
+        status timestamps, so it doesn't depend on what this process saw before.
+        """
+        status_event = STATUS_EVENTS.get(candidate_status(doc))
+        if status_event:
+            event, changed_at_field = status_event
+            changed_at = doc.get(changed_at_field)
+            if changed_at and (changed_at > seen_at if seen_at else changed_at >= window_start):
+                return event
+        return 'candidate_updated'
+
+
+_change_feed = None
+_change_feed_lock = threading.Lock()
+
+
+def get_change_feed():
+    """Lazily created per-process feed (created after fork, so each worker has its own watcher)"""
+    global _change_feed
+    with _change_feed_lock:
+        if _change_feed is None:
+            _change_feed = CandidateChangeFeed()
+        return _change_feed
+
+
+def format_sse(payload):
+    """Encode an event dict as a server-sent event frame"""
+    data = json.dumps(payload, cls=DjangoJSONEncoder)
+    return f"event: {payload['event']}\ndata: {data}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF negotiate text/event-stream; non-stream responses (errors) become one SSE frame"""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return format_sse({'event': 'error', **data}).encode(self.charset)
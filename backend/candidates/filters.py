@@ -0,0 +1,73 @@
+"""
+Server-side filters for the recruiter candidate list.
+
+Every filter is an equality, prefix or range condition on a field that sits in
+a compound index behind created_by_id (see Candidate.meta), so MongoDB narrows
+the recruiter's candidates instead of the dashboard downloading and filtering
+them.
+
+Query parameters:
+    status      started | in_progress | completed | terminated | evaluated | invited
+    min_score   lower bound on the 0-10 evaluation score (inclusive)
+    max_score   upper bound on the 0-10 evaluation score (inclusive)
+    role        exact role
+    company     exact company
+    email       email prefix
+"""
+from mongoengine.queryset.visitor import Q
+
+STATUS_FILTERS = {
+    'invited': Q(interview_started__ne=True),
+    'started': Q(interview_started=True),
+    'in_progress': Q(interview_started=True, interview_completed__ne=True, interview_terminated__ne=True),
+    'completed': Q(interview_completed=True, interview_terminated__ne=True),
+    'terminated': Q(interview_terminated=True),
+    'evaluated': Q(evaluation_score_value__ne=None),
+}
+
+FILTER_PARAMS = ('status', 'min_score', 'max_score', 'role', 'company', 'email')
+
+
+class FilterError(ValueError):
+    """Raised for an unknown status or a malformed score bound"""
+
+
+def _parse_score(name, value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise FilterError(f'Invalid {name}: {value}')
+
+
+def apply_filters(queryset, params):
+    """
+    Narrow a candidate queryset by the list query parameters.
+
+    Args:
+        queryset: Candidate queryset already filtered by created_by_id
+        params: request.query_params (or any mapping)
+
+    Returns:
+        Filtered queryset
+    """
+    status = params.get('status')
+    if status:
+        if status not in STATUS_FILTERS:
+            raise FilterError(f'Invalid status: {status}. Use one of: {", ".join(STATUS_FILTERS)}')
+        queryset = queryset.filter(STATUS_FILTERS[status])
+
+    if params.get('min_score') not in (None, ''):
+        queryset = queryset.filter(evaluation_score_value__gte=_parse_score('min_score', params['min_score']))
+    if params.get('max_score') not in (None, ''):
+        queryset = queryset.filter(evaluation_score_value__lte=_parse_score('max_score', params['max_score']))
+
+    if params.get('role'):
+        queryset = queryset.filter(role=params['role'])
+    if params.get('company'):
+        queryset = queryset.filter(company=params['company'])
+
+    # Anchored, case-sensitive prefix so the (created_by_id, email) index is used
+    if params.get('email'):
+        queryset = queryset.filter(email__startswith=params['email'])
+
+    return queryset
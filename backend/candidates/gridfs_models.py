@@ -1,250 +1,437 @@
-# GridFS Implementation for Large File Storage in MongoDB
-# This is an alternative approach for storing large files (>16MB) in MongoDB
+# GridFS storage for candidate resumes
+# Resume PDFs live in the 'resumes' GridFS bucket and Candidate.resume_file_id points at them,
+# so loading a Candidate no longer pulls up to 10MB of PDF bytes over the wire.
+# Older candidates may still carry the bytes inline in resume_data until
+# `python manage.py migrate_resumes_to_gridfs` has moved them out.
+#
+# Resumes are content-addressed: a ResumeBlob keyed by the PDF's SHA-256 owns one GridFS
+# file and counts the candidates referencing it, so the same PDF uploaded for several
+# recruiters is stored once. Anything derived from a resume (text, chunks, embeddings)
+# should be keyed by Candidate.resume_sha256 so it is shared the same way.
+#
+# Stored bytes may be compressed (see blob_codecs.py): the codec and the raw size are
+# recorded on the ResumeBlob and in the GridFS file metadata, and every reader here
+# decodes transparently. Hashes, sizes and Range offsets always refer to the raw PDF.
 
-from mongoengine import Document, StringField, EmailField, DateTimeField, BooleanField
-from pymongo import MongoClient
+from mongoengine import Document, StringField, ObjectIdField, IntField, DateTimeField
+from mongoengine.connection import get_db
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import gridfs
-import uuid
+import hashlib
+import io
+import re
+from bson import ObjectId
 from datetime import datetime
-from django.conf import settings
-import os
 
-class CandidateGridFS(Document):
-    """
-    Alternative Candidate model using GridFS for resume storage
-    Use this instead of the BinaryField approach for very large files
-    """
-    candidate_id = StringField(max_length=100, unique=True, default=lambda: str(uuid.uuid4()))
-    email = EmailField(unique=True, required=True)
-    created_by_id = StringField(max_length=100, required=True)
-    created_at = DateTimeField(default=datetime.utcnow)
-    updated_at = DateTimeField(default=datetime.utcnow)
-    is_active = BooleanField(default=True)
-    resume_filename = StringField(max_length=255)
-    resume_gridfs_id = StringField(max_length=100)  # GridFS file ID
-    resume_content_type = StringField(max_length=100, default='application/pdf')
-    resume_size = StringField(max_length=20)
-    
-    meta = {
-        'collection': 'candidates_gridfs',
-        'ordering': ['-created_at'],
-        'indexes': [
-            'email',
-            'candidate_id',
-            'created_by_id'
-        ]
-    }
+from .blob_codecs import CODEC_IDENTITY, encode_blob, decode_blob, DecompressingReader
+
+RESUME_BUCKET = 'resumes'
+STREAM_CHUNK_SIZE = 255 * 1024  # GridFS default chunk size, so each read maps to one chunk
+
 
 class GridFSHelper:
     """
-    Helper class for GridFS operations
+    Helper class for GridFS operations on the resume bucket
     """
-    
-    def __init__(self):
-        # Get MongoDB connection details from settings
-        mongodb_url = os.getenv('MONGODB_URL')
-        mongodb_name = os.getenv('MONGODB_NAME', 'hireiq_db')
-        
-        # Create MongoDB client and GridFS instance
-        self.client = MongoClient(mongodb_url)
-        self.db = self.client[mongodb_name]
-        self.fs = gridfs.GridFS(self.db)
-    
-    def store_file(self, file_data, filename, content_type='application/pdf', metadata=None):
+
+    def __init__(self, bucket=RESUME_BUCKET):
+        # Reuse mongoengine's connection instead of opening a client per helper
+        self.db = get_db()
+        self.fs = gridfs.GridFS(self.db, collection=bucket)
+
+    def store_file(self, file_data, filename, content_type='application/pdf', metadata=None, file_id=None):
         """
         Store a file in GridFS
-        
+
         Args:
-            file_data: Binary file data
+            file_data: Binary file data (bytes or a file-like object)
             filename: Original filename
             content_type: MIME type
             metadata: Additional metadata dictionary
-            
+            file_id: Optional ObjectId to store the file under (makes retries idempotent)
+
         Returns:
-            GridFS file ID
+            ObjectId: GridFS file ID
         """
-        file_id = self.fs.put(
+        kwargs = {'_id': file_id} if file_id is not None else {}
+        return self.fs.put(
             file_data,
             filename=filename,
             contentType=content_type,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            **kwargs
         )
-        return str(file_id)
-    
+
     def get_file(self, file_id):
         """
         Retrieve a file from GridFS
-        
+
         Args:
             file_id: GridFS file ID
-            
+
         Returns:
             GridFS file object or None
         """
         try:
-            from bson import ObjectId
             return self.fs.get(ObjectId(file_id))
         except Exception:
             return None
-    
+
+    def read_file(self, gridfs_file):
+        """
+        Read a GridFS file's raw content, decoding it if it was stored compressed
+
+        Args:
+            gridfs_file: GridFS file object
+
+        Returns:
+            bytes: Raw file content
+        """
+        return decode_blob(gridfs_file.read(), stored_codec(gridfs_file))
+
     def delete_file(self, file_id):
         """
         Delete a file from GridFS
-        
+
         Args:
             file_id: GridFS file ID
         """
         try:
-            from bson import ObjectId
             self.fs.delete(ObjectId(file_id))
-        except Exception:
-            pass
-    
+        except Exception as e:
+            print(f"Error deleting GridFS file {file_id}: {str(e)}")
+
     def file_exists(self, file_id):
         """
         Check if a file exists in GridFS
-        
+
         Args:
             file_id: GridFS file ID
-            
+
         Returns:
             Boolean
         """
         try:
-            from bson import ObjectId
             return self.fs.exists(ObjectId(file_id))
         except Exception:
             return False
 
-# Example usage in views:
-"""
-from .gridfs_models import CandidateGridFS, GridFSHelper
-
-@api_view(['POST'])
-@permission_classes([])
-def upload_resume_gridfs(request):
-    candidate_id = request.data.get('candidate_id')
-    resume_file = request.FILES.get('resume')
-    
-    # ... validation code ...
-    
-    try:
-        candidate = CandidateGridFS.objects.get(candidate_id=candidate_id, is_active=True)
-        
-        # Delete old resume if exists
-        if candidate.resume_gridfs_id:
-            gridfs_helper = GridFSHelper()
-            gridfs_helper.delete_file(candidate.resume_gridfs_id)
-        
-        # Store new resume in GridFS
-        gridfs_helper = GridFSHelper()
-        file_data = resume_file.read()
-        
-        metadata = {
-            'candidate_id': candidate_id,
-            'uploaded_at': datetime.utcnow().isoformat()
+
+def stored_codec(gridfs_file):
+    """Codec a GridFS file was stored with (files from before compression have none)"""
+    return (gridfs_file.metadata or {}).get('codec') or CODEC_IDENTITY
+
+
+def stored_size(gridfs_file):
+    """Raw (decoded) size of a GridFS file"""
+    if stored_codec(gridfs_file) == CODEC_IDENTITY:
+        return gridfs_file.length
+    return gridfs_file.metadata['size']
+
+
+class ResumeBlob(Document):
+    """
+    One stored resume PDF, keyed by the SHA-256 of its bytes.
+    refcount is the number of candidates whose resume_sha256 points here; the blob and
+    its GridFS file are deleted when it drops to zero.
+    size is the raw PDF size; stored_size what the GridFS file takes after compression.
+    """
+    sha256 = StringField(primary_key=True)
+    file_id = ObjectIdField(required=True)  # GridFS file in the resumes bucket
+    size = IntField()
+    stored_size = IntField()
+    codec = StringField(max_length=20, default=CODEC_IDENTITY)
+    content_type = StringField(max_length=100, default='application/pdf')
+    refcount = IntField(default=0)
+    created_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'resume_blobs',
+        'indexes': ['file_id'],
+    }
+
+
+def acquire_blob(file_data, filename, content_type='application/pdf', sha256=None, helper=None):
+    """
+    Take a reference on the blob for these bytes, storing them only if no identical PDF exists.
+
+    Args:
+        file_data: Resume bytes
+        filename: Original filename (recorded on the GridFS file when it is first stored)
+        content_type: MIME type
+        sha256: Precomputed hex digest of file_data, if known
+
+    Returns:
+        tuple: (sha256 hex digest, GridFS file ID)
+    """
+    sha256 = sha256 or hashlib.sha256(file_data).hexdigest()
+    blobs = ResumeBlob._get_collection()
+    helper = helper or GridFSHelper()
+
+    blob = blobs.find_one_and_update(
+        {'_id': sha256},
+        {'$inc': {'refcount': 1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if blob:
+        return sha256, blob['file_id']
+
+    stored, codec = encode_blob(file_data, content_type)
+    file_id = helper.store_file(
+        stored,
+        filename=filename,
+        content_type=content_type,
+        metadata={
+            'sha256': sha256,
+            'codec': codec,
+            'size': len(file_data),
+            'uploaded_at': datetime.utcnow().isoformat(),
         }
-        
-        file_id = gridfs_helper.store_file(
-            file_data=file_data,
-            filename=resume_file.name,
-            content_type='application/pdf',
-            metadata=metadata
+    )
+    return sha256, register_blob(
+        sha256, file_id, len(file_data), content_type, helper, codec=codec, stored_size=len(stored)
+    )
+
+
+def register_blob(sha256, file_id, size, content_type='application/pdf', helper=None,
+                  codec=CODEC_IDENTITY, stored_size=None):
+    """
+    Take a reference on the blob for an already-stored GridFS file (e.g. a streamed upload).
+    If a blob with the same hash exists, the new file is a duplicate: it is deleted and the
+    existing file is referenced instead.
+
+    Args:
+        size: Raw content size
+        codec: Codec the GridFS file was written with
+        stored_size: Bytes the GridFS file takes (defaults to size)
+
+    Returns:
+        ObjectId: GridFS file ID the caller should reference
+    """
+    blobs = ResumeBlob._get_collection()
+    helper = helper or GridFSHelper()
+
+    while True:
+        blob = blobs.find_one_and_update(
+            {'_id': sha256},
+            {'$inc': {'refcount': 1}},
+            return_document=ReturnDocument.AFTER,
         )
-        
-        # Update candidate record
-        candidate.resume_filename = resume_file.name
-        candidate.resume_gridfs_id = file_id
-        candidate.resume_size = str(resume_file.size)
+        if blob:
+            if blob['file_id'] != file_id:
+                helper.delete_file(file_id)
+            return blob['file_id']
+
+        try:
+            blobs.insert_one({
+                '_id': sha256,
+                'file_id': file_id,
+                'size': size,
+                'stored_size': size if stored_size is None else stored_size,
+                'codec': codec,
+                'content_type': content_type,
+                'refcount': 1,
+                'created_at': datetime.utcnow(),
+            })
+            return file_id
+        except DuplicateKeyError:
+            # Stored concurrently by someone else; loop round and reference theirs
+            continue
+
+
+def release_blob(sha256, helper=None):
+    """Drop one reference to a blob; deletes the blob and its GridFS file at zero"""
+    if not sha256:
+        return
+    blobs = ResumeBlob._get_collection()
+    blobs.update_one({'_id': sha256}, {'$inc': {'refcount': -1}})
+
+    # Atomic delete-if-unreferenced: an acquire that raced us has already bumped refcount
+    blob = blobs.find_one_and_delete({'_id': sha256, 'refcount': {'$lte': 0}})
+    if blob:
+        from .resume_text import delete_resume_text
+        from .resume_pipeline import delete_resume_chunks
+        from .thumbnails import delete_thumbnail
+
+        (helper or GridFSHelper()).delete_file(blob['file_id'])
+        delete_resume_text(sha256)
+        delete_resume_chunks(sha256)
+        delete_thumbnail(sha256)
+
+
+def attach_resume(candidate, file_data, filename, content_type='application/pdf'):
+    """
+    Point the candidate at the content-addressed blob for this resume (saves the candidate).
+    Identical PDFs share one GridFS file; the reference to the previous resume is released
+    once the candidate references the new one.
+
+    Args:
+        candidate: Candidate document
+        file_data: Resume bytes
+        filename: Original filename
+        content_type: MIME type
+
+    Returns:
+        ObjectId: GridFS file ID
+    """
+    helper = GridFSHelper()
+    old_sha256 = candidate.resume_sha256
+    old_file_id = candidate.resume_file_id
+
+    sha256, file_id = acquire_blob(file_data, filename, content_type, helper=helper)
+
+    candidate.resume_filename = filename
+    candidate.resume_file_id = file_id
+    candidate.resume_sha256 = sha256
+    candidate.resume_data = None  # Drop any inline copy from before the GridFS migration
+    candidate.resume_content_type = content_type
+    candidate.resume_size = str(len(file_data))
+    try:
         candidate.save()
-        
-        return Response({'message': 'Resume uploaded successfully'})
-        
-    except Exception as e:
-        return Response({'error': str(e)}, status=500)
+    except Exception:
+        release_blob(sha256, helper)
+        raise
+
+    if old_sha256:
+        release_blob(old_sha256, helper)
+    elif old_file_id and old_file_id != file_id:
+        # Uploaded before content addressing: the file belonged to this candidate alone
+        helper.delete_file(old_file_id)
+
+    # Parse, chunk and embed in the background so interviews only ever read stored results
+    from .resume_pipeline import enqueue_resume
+    enqueue_resume(sha256, file_id)
+
+    return file_id
+
+
+class RangeNotSatisfiable(ValueError):
+    """Raised for a Range header that selects no bytes of the file"""
+
+
+def open_resume(candidate_id):
+    """
+    Open a candidate's resume for streaming without reading it into memory.
+
+    Args:
+        candidate_id (str): Candidate ID
+
+    Returns:
+        tuple: (file-like object positioned at 0 yielding the raw PDF, raw length in bytes,
+            sha256 hex digest or None),
+            or None if the candidate has no resume
+    """
+    from .models import Candidate
+
+    row = Candidate.objects.filter(
+        candidate_id=candidate_id,
+        is_active=True
+    ).only('resume_file_id').as_pymongo().first()
+    if not row:
+        return None
+
+    if row.get('resume_file_id'):
+        gridfs_file = GridFSHelper().get_file(row['resume_file_id'])
+        if gridfs_file:
+            sha256 = (gridfs_file.metadata or {}).get('sha256')
+            codec = stored_codec(gridfs_file)
+            if codec != CODEC_IDENTITY:
+                return DecompressingReader(gridfs_file, codec, STREAM_CHUNK_SIZE), stored_size(gridfs_file), sha256
+            return gridfs_file, gridfs_file.length, sha256
+        print(f"GridFS resume {row['resume_file_id']} missing for candidate {candidate_id}")
+
+    # Not migrated yet: the inline bytes are small enough to hash on the fly
+    content = get_resume_content(candidate_id)
+    if not content:
+        return None
+    return io.BytesIO(content), len(content), hashlib.sha256(content).hexdigest()
+
+
+def parse_range(header, length):
+    """
+    Parse a single-range 'bytes=' Range header.
+
+    Args:
+        header (str): Range header value (may be None)
+        length (int): File length
+
+    Returns:
+        tuple: (start, end) inclusive byte offsets, or None to serve the whole file
+            (no header, a non-bytes unit or a multi-range request)
+    """
+    if not header:
+        return None
+    match = re.fullmatch(r'\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*', header)
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first == '' and last == '':
+        return None
+    if first == '':
+        # Suffix range: the last N bytes
+        suffix = int(last)
+        if suffix == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, length - suffix), length - 1
+
+    start = int(first)
+    end = min(int(last), length - 1) if last else length - 1
+    if start >= length or start > end:
+        raise RangeNotSatisfiable(header)
+    return start, end
 
-@api_view(['GET'])
-@permission_classes([])
-def download_resume_gridfs(request, candidate_id):
+
+def iter_file_range(file_obj, start, end, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield bytes start..end (inclusive) of a seekable file in chunks, then close it"""
     try:
-        candidate = CandidateGridFS.objects.get(candidate_id=candidate_id, is_active=True)
-        
-        if not candidate.resume_gridfs_id:
-            return Response({'error': 'No resume found'}, status=404)
-        
-        gridfs_helper = GridFSHelper()
-        gridfs_file = gridfs_helper.get_file(candidate.resume_gridfs_id)
-        
-        if not gridfs_file:
-            return Response({'error': 'Resume file not found'}, status=404)
-        
-        response = HttpResponse(
-            gridfs_file.read(),
-            content_type=gridfs_file.contentType or 'application/pdf'
-        )
-        
-        filename = candidate.resume_filename or f"{candidate_id}_resume.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        response['Content-Length'] = gridfs_file.length
-        
-        return response
-        
-    except Exception as e:
-        return Response({'error': str(e)}, status=500)
-"""
-
-# Benefits of GridFS:
-# 1. Can handle files larger than 16MB (BSON document limit)
-# 2. Automatic chunking of large files
-# 3. Built-in metadata support
-# 4. Efficient streaming for large files
-# 5. Automatic load balancing across shards
-
-# When to use GridFS vs BinaryField:
-# - Use BinaryField for files < 10MB (like most resumes)
-# - Use GridFS for files > 16MB or when you need advanced file management features
-# - GridFS has more overhead for small files but is more efficient for large files
+        file_obj.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = file_obj.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        file_obj.close()
+
+
 def get_resume_content(candidate_id):
     """
     Get resume content (binary data) for a given candidate ID.
-    This function works with both GridFS and regular BinaryField storage.
-    
+    Reads from GridFS, falling back to inline resume_data for candidates not yet migrated.
+
     Args:
         candidate_id (str): Candidate ID
-        
+
     Returns:
         bytes: Resume PDF binary data or None if not found
     """
     try:
-        # First try to get from regular Candidate model (most common)
         from .models import Candidate
-        
-        candidate = Candidate.objects.filter(
-            candidate_id=candidate_id, 
+
+        row = Candidate.objects.filter(
+            candidate_id=candidate_id,
             is_active=True
-        ).first()
-        
-        if candidate and candidate.resume_data:
-            return candidate.resume_data
-        
-        # If not found in regular model, try GridFS model
-        try:
-            candidate_gridfs = CandidateGridFS.objects.filter(
-                candidate_id=candidate_id, 
-                is_active=True
-            ).first()
-            
-            if candidate_gridfs and candidate_gridfs.resume_gridfs_id:
-                gridfs_helper = GridFSHelper()
-                gridfs_file = gridfs_helper.get_file(candidate_gridfs.resume_gridfs_id)
-                
-                if gridfs_file:
-                    return gridfs_file.read()
-        except Exception as e:
-            print(f"Error accessing GridFS: {str(e)}")
-        
+        ).only('resume_file_id', 'resume_data').as_pymongo().first()
+
+        if not row:
+            return None
+
+        if row.get('resume_file_id'):
+            helper = GridFSHelper()
+            gridfs_file = helper.get_file(row['resume_file_id'])
+            if gridfs_file:
+                return helper.read_file(gridfs_file)
+            print(f"GridFS resume {row['resume_file_id']} missing for candidate {candidate_id}")
+
+        if row.get('resume_data'):
+            return bytes(row['resume_data'])
+
         return None
-        
+
     except Exception as e:
         print(f"Error in get_resume_content: {str(e)}")
         return None
@@ -253,54 +440,35 @@ def get_resume_content(candidate_id):
 def get_candidate_resume_info(candidate_id):
     """
     Get resume information (filename, size, content type) for a candidate.
-    
+
     Args:
         candidate_id (str): Candidate ID
-        
+
     Returns:
         dict: Resume info or None if not found
     """
     try:
-        # First try regular model
         from .models import Candidate
-        
-        candidate = Candidate.objects.filter(
-            candidate_id=candidate_id, 
+
+        row = Candidate.objects.filter(
+            candidate_id=candidate_id,
             is_active=True
-        ).first()
-        
-        if candidate and candidate.resume_data:
+        ).only('resume_file_id', 'resume_filename', 'resume_size', 'resume_content_type', 'has_resume').as_pymongo().first()
+
+        if row and Candidate.row_has_resume(row):
             return {
-                'filename': candidate.resume_filename,
-                'size': candidate.resume_size,
-                'content_type': candidate.resume_content_type,
+                'filename': row.get('resume_filename'),
+                'size': row.get('resume_size'),
+                'content_type': row.get('resume_content_type'),
                 'has_resume': True,
-                'storage_type': 'binary_field'
+                'storage_type': 'gridfs' if row.get('resume_file_id') else 'binary_field'
             }
-        
-        # Try GridFS model
-        try:
-            candidate_gridfs = CandidateGridFS.objects.filter(
-                candidate_id=candidate_id, 
-                is_active=True
-            ).first()
-            
-            if candidate_gridfs and candidate_gridfs.resume_gridfs_id:
-                return {
-                    'filename': candidate_gridfs.resume_filename,
-                    'size': candidate_gridfs.resume_size,
-                    'content_type': candidate_gridfs.resume_content_type,
-                    'has_resume': True,
-                    'storage_type': 'gridfs'
-                }
-        except Exception as e:
-            print(f"Error accessing GridFS info: {str(e)}")
-        
+
         return {
             'has_resume': False,
             'storage_type': None
         }
-        
+
     except Exception as e:
         print(f"Error in get_candidate_resume_info: {str(e)}")
         return {
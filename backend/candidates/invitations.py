@@ -0,0 +1,369 @@
+"""
+Candidate invitations: the invitation email, bulk invites and async delivery.
+
+Bulk invites validate every row, find existing invitations with one $in query
+(served by the unique (email, created_by_id) index that
+`python manage.py update_candidate_indexes` creates), insert the new candidates
+with a single unordered insert_many, and hand the emails to a per-process
+background mailer. The mailer keeps one SMTP connection open while it has work
+and closes it once the queue has been idle for a few seconds, so a campus
+batch of thousands of invites costs one SMTP login instead of one per email.
+
+Queued emails live in memory: if the process exits before the queue drains,
+the candidates exist but their emails were not sent (the mailer prints every
+failure, and `sent`/`failed`/`pending` are exposed via get_mailer_stats()).
+"""
+import csv
+import io
+import queue
+import threading
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.mail import EmailMessage, get_connection
+from django.core.validators import validate_email
+from mongoengine.errors import ValidationError
+from pymongo.errors import BulkWriteError
+
+from .cache import invalidate_recruiter
+from .models import Candidate
+
+MAX_BULK_INVITES = 5000
+CONNECTION_IDLE_TIMEOUT = 10  # seconds the mailer keeps an idle SMTP connection open
+DUPLICATE_KEY_ERROR = 11000
+
+INVITE_FIELDS = ('email', 'company', 'role', 'hr_prompt')
+
+
+class InviteError(ValueError):
+    """Raised for a bulk invite request that cannot be read at all"""
+
+
+def invitation_email(candidate_id, email, company_name=None, role_name=None):
+    """
+    Build the interview invitation email for a candidate.
+
+    Returns:
+        EmailMessage: ready to send (not sent)
+    """
+    company_name = company_name or 'Our Organization'
+    role_name = role_name or 'the position'
+
+    subject = f'🚀 Interview Invitation - {role_name} at {company_name}'
+    message = f'''
+Dear Candidate,
+
+We are delighted to invite you to participate in our AI-powered technical interview process for {role_name} at {company_name}.
+
+📋 YOUR INTERVIEW DETAILS:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🔐 Candidate ID: {candidate_id}
+🎯 Position: {role_name}
+🏢 Company: {company_name}
+🌐 Interview Portal: http://localhost:3000/candidate
+
+✨ WHAT TO EXPECT:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+• AI-powered personalized interview experience
+• Technical questions tailored to your background
+• Resume-based intelligent question generation
+• Voice-enabled interview interface
+• Comprehensive skill assessment
+• Duration: 15-20 minutes
+
+📝 PREPARATION TIPS:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+✓ Ensure you have your updated resume ready (PDF format)
+✓ Test your microphone and speakers beforehand
+✓ Find a quiet, well-lit environment
+✓ Have a stable internet connection
+✓ Keep your Candidate ID handy: {candidate_id}
+
+🔗 GETTING STARTED:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+1. Visit: http://localhost:3000/candidate
+2. Enter your Candidate ID: {candidate_id}
+3. Upload your resume
+4. Begin your AI interview
+
+⚡ NEXT STEPS:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+• Complete your interview at your convenience
+• Our AI will evaluate your responses in real-time
+• Results will be shared within 3-5 business days
+• You'll receive detailed feedback on your performance
+
+Need assistance? Simply reply to this email and our team will be happy to help.
+
+We look forward to learning more about your technical expertise!
+
+Best regards,
+The HireIQ Team
+{company_name}
+
+──────────────────────────────────────────────────
+🤖 Powered by HireIQ - Next-Generation AI Recruitment
+This is an automated message from our AI-powered recruitment platform.
+                '''
+    return EmailMessage(subject, message, settings.EMAIL_HOST_USER, [email])
+
+
+class InvitationMailer:
+    """Background sender that drains queued emails over one reused SMTP connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self.sent = 0
+        self.failed = 0
+
+    def enqueue(self, messages):
+        """Queue EmailMessages for delivery and make sure the sender thread is running"""
+        for message in messages:
+            self._queue.put(message)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='invitation-mailer', daemon=True)
+                self._thread.start()
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        connection = None
+        try:
+            while True:
+                try:
+                    message = self._queue.get(timeout=CONNECTION_IDLE_TIMEOUT)
+                except queue.Empty:
+                    # Exit only if nothing arrived between the timeout and taking the lock;
+                    # enqueue() starts a new thread once this one has cleared itself
+                    with self._lock:
+                        if self._queue.empty():
+                            self._thread = None
+                            return
+                    continue
+
+                connection = self._send(connection, message)
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+    def _send(self, connection, message):
+        # Retry once on a fresh connection: SMTP servers drop long-lived sessions
+        for attempt in range(2):
+            try:
+                if connection is None:
+                    connection = get_connection(fail_silently=False)
+                    connection.open()
+                connection.send_messages([message])
+                self.sent += 1
+                return connection
+            except Exception as e:
+                try:
+                    if connection is not None:
+                        connection.close()
+                except Exception:
+                    pass
+                connection = None
+                if attempt == 1:
+                    self.failed += 1
+                    print(f"Invitation email to {', '.join(message.to)} failed: {e}")
+        return connection
+
+
+_mailer = None
+_mailer_lock = threading.Lock()
+
+
+def get_invitation_mailer():
+    """Lazily created per-process mailer (created after fork, so each worker has its own thread)"""
+    global _mailer
+    with _mailer_lock:
+        if _mailer is None:
+            _mailer = InvitationMailer()
+        return _mailer
+
+
+def get_mailer_stats():
+    mailer = get_invitation_mailer()
+    return {'sent': mailer.sent, 'failed': mailer.failed, 'pending': mailer.pending}
+
+
+def parse_invite_rows(request):
+    """
+    Read invite rows from a bulk request.
+
+    Accepts a CSV upload (multipart 'file'), a raw text/csv body, or JSON
+    {"candidates": [...]} where each entry is an email string or an object
+    with email, company, role and hr_prompt. CSV files need an 'email' column
+    (company, role and hr_prompt are optional) or may be a bare list of emails.
+
+    Returns:
+        tuple: (list of row dicts, defaults dict applied to rows without their own values)
+    """
+    content_type = request.content_type or ''
+    if content_type.startswith('text/csv'):
+        return _parse_csv(request.body), {}
+
+    upload = request.FILES.get('file') if 'multipart' in content_type else None
+    if upload is not None:
+        defaults = {field: request.data.get(field) for field in INVITE_FIELDS[1:] if request.data.get(field)}
+        return _parse_csv(upload.read()), defaults
+
+    entries = request.data.get('candidates')
+    if not isinstance(entries, list):
+        raise InviteError('Send a CSV file, a text/csv body, or JSON {"candidates": [...]}')
+
+    rows = []
+    for entry in entries:
+        if isinstance(entry, str):
+            rows.append({'email': entry})
+        elif isinstance(entry, dict):
+            rows.append({field: entry.get(field) for field in INVITE_FIELDS})
+        else:
+            rows.append({'email': None})
+    defaults = {field: request.data.get(field) for field in INVITE_FIELDS[1:] if request.data.get(field)}
+    return rows, defaults
+
+
+def _parse_csv(raw):
+    try:
+        text = raw.decode('utf-8-sig') if isinstance(raw, bytes) else raw
+    except UnicodeDecodeError:
+        raise InviteError('CSV must be UTF-8 encoded')
+
+    lines = list(csv.reader(io.StringIO(text)))
+    lines = [line for line in lines if any(cell.strip() for cell in line)]
+    if not lines:
+        return []
+
+    header = [cell.strip().lower() for cell in lines[0]]
+    if 'email' not in header:
+        # Headerless file: first column is the email
+        return [{'email': line[0]} for line in lines]
+
+    rows = []
+    for line in lines[1:]:
+        values = dict(zip(header, line))
+        rows.append({field: values.get(field) for field in INVITE_FIELDS})
+    return rows
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def bulk_invite(user_id, rows, defaults=None):
+    """
+    Create candidates for many emails at once and queue their invitation emails.
+
+    Args:
+        user_id (str): Recruiter user ID (becomes created_by_id)
+        rows (list): dicts with email and optional company, role, hr_prompt
+        defaults (dict): company/role/hr_prompt for rows that don't set them
+
+    Returns:
+        list: one result per input row, in order:
+            {'row', 'email', 'status': created|duplicate|invalid|failed, 'candidate_id'?, 'error'?}
+    """
+    if len(rows) > MAX_BULK_INVITES:
+        raise InviteError(f'At most {MAX_BULK_INVITES} candidates can be invited at once (got {len(rows)})')
+    defaults = defaults or {}
+
+    results = []
+    pending = []  # (result, candidate) for rows that passed validation
+    seen = set()
+    now = datetime.utcnow()
+
+    for index, row in enumerate(rows, start=1):
+        email = _clean(row.get('email'))
+        result = {'row': index, 'email': email}
+        results.append(result)
+
+        try:
+            validate_email(email)
+        except DjangoValidationError:
+            result.update(status='invalid', error='Invalid email address')
+            continue
+
+        if email in seen:
+            result.update(status='duplicate', error='Email appears more than once in this request')
+            continue
+        seen.add(email)
+
+        candidate = Candidate(
+            candidate_id=str(uuid.uuid4()),
+            email=email,
+            created_by_id=user_id,
+            created_at=now,
+            updated_at=now,
+            company=_clean(row.get('company')) or _clean(defaults.get('company')),
+            role=_clean(row.get('role')) or _clean(defaults.get('role')),
+            hr_prompt=_clean(row.get('hr_prompt')) or _clean(defaults.get('hr_prompt')),
+        )
+        try:
+            candidate.validate()
+        except ValidationError as e:
+            result.update(status='invalid', error=str(e))
+            continue
+        candidate.refresh_summary_fields()
+        pending.append((result, candidate))
+
+    if not pending:
+        return results
+
+    # One indexed $in lookup instead of a query per email
+    existing = {
+        doc['email'] for doc in Candidate._get_collection().find(
+            {'created_by_id': user_id, 'email': {'$in': [candidate.email for _, candidate in pending]}},
+            {'email': 1, '_id': 0},
+        )
+    }
+    for result, candidate in pending:
+        if candidate.email in existing:
+            result.update(status='duplicate', error='You have already invited this candidate')
+    pending = [(result, candidate) for result, candidate in pending if candidate.email not in existing]
+    if not pending:
+        return results
+
+    # Unordered so one bad row (e.g. a concurrent duplicate) doesn't stop the rest
+    failed = {}
+    try:
+        Candidate._get_collection().insert_many(
+            [candidate.to_mongo() for _, candidate in pending],
+            ordered=False,
+        )
+    except BulkWriteError as e:
+        for error in e.details.get('writeErrors', []):
+            failed[error['index']] = error
+
+    created = []
+    for position, (result, candidate) in enumerate(pending):
+        error = failed.get(position)
+        if error is None:
+            result.update(status='created', candidate_id=candidate.candidate_id)
+            created.append(candidate)
+        elif error.get('code') == DUPLICATE_KEY_ERROR:
+            result.update(status='duplicate', error='You have already invited this candidate')
+        else:
+            result.update(status='failed', error=error.get('errmsg', 'Insert failed'))
+
+    if created:
+        invalidate_recruiter(user_id)
+        get_invitation_mailer().enqueue(
+            invitation_email(candidate.candidate_id, candidate.email, candidate.company, candidate.role)
+            for candidate in created
+        )
+
+    return results
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from candidates.models import Candidate
+
+
+class Command(BaseCommand):
+    help = 'Backfill has_resume, has_questions, audio_responses_count and evaluation_score_value on existing candidates'
+
+    def handle(self, *args, **options):
+        try:
+            self.stdout.write("Backfilling candidate summary fields...")
+
+            # Computed server-side with an update pipeline so no resume or audio bytes leave MongoDB.
+            # The list endpoint also backfills a recruiter's older documents on first use.
+            result = Candidate.backfill_summaries()
+
+            self.stdout.write(f"📊 Matched {result.matched_count} candidates, updated {result.modified_count}")
+            self.stdout.write(self.style.SUCCESS("✅ Candidate summary fields are up to date"))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Backfill failed: {e}"))
@@ -0,0 +1,96 @@
+from django.core.management.base import BaseCommand
+from bson import ObjectId
+from datetime import datetime, timedelta
+import time
+import uuid
+
+from candidates.models import Candidate
+from candidates.serializers import CandidateSerializer, serialize_candidate_row
+
+
+def _make_rows(count):
+    """Raw candidate documents shaped like a LIST_FIELDS projection"""
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        rows.append({
+            '_id': ObjectId(),
+            'candidate_id': str(uuid.uuid4()),
+            'email': f'candidate{i}@example.com',
+            'created_by_id': '1',
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now - timedelta(minutes=i),
+            'is_active': True,
+            'resume_filename': f'resume_{i}.pdf',
+            'resume_content_type': 'application/pdf',
+            'resume_size': str(100000 + i),
+            'has_resume': True,
+            'has_questions': i % 2 == 0,
+            'company': 'Acme',
+            'role': 'Software Engineer',
+            'hr_prompt': 'Focus on backend experience',
+            'evaluation_score': str(i % 10) if i % 3 else None,
+            'evaluation_score_value': float(i % 10) if i % 3 else None,
+            'evaluation_rating': 'Good' if i % 3 else None,
+            'audio_responses_count': i % 6,
+        })
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Compare per-row CPU cost of Document + CandidateSerializer against the raw-dict serializer'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[1000, 10000, 100000],
+            help='Row counts to benchmark (default: 1000 10000 100000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per row count; the fastest run is reported',
+        )
+
+    def _best(self, func, rows, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.process_time()
+            func(rows)
+            elapsed = time.process_time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+
+        # Both paths start from the same raw documents pymongo hands back, so the numbers
+        # measure mapping cost only (no network or MongoDB time)
+        def document_path(rows):
+            return CandidateSerializer([Candidate._from_son(row) for row in rows], many=True).data
+
+        def raw_path(rows):
+            return [serialize_candidate_row(row) for row in rows]
+
+        sample = _make_rows(1)
+        if document_path(sample)[0] != raw_path(sample)[0]:
+            self.stdout.write(self.style.ERROR("❌ Raw serializer output differs from CandidateSerializer"))
+            return
+
+        self.stdout.write("⏱️  Candidate serialization benchmark (CPU time, best of %d)" % repeat)
+        self.stdout.write(f"{'rows':>8}  {'document ms':>12}  {'raw ms':>10}  {'document µs/row':>16}  {'raw µs/row':>11}  {'speedup':>8}")
+
+        for count in options['rows']:
+            rows = _make_rows(count)
+            document_time = self._best(document_path, rows, repeat)
+            raw_time = self._best(raw_path, rows, repeat)
+            speedup = document_time / raw_time if raw_time else float('inf')
+            self.stdout.write(
+                f"{count:>8}  {document_time * 1000:>12.1f}  {raw_time * 1000:>10.1f}  "
+                f"{document_time / count * 1e6:>16.2f}  {raw_time / count * 1e6:>11.2f}  {speedup:>7.1f}x"
+            )
+
+        self.stdout.write(self.style.SUCCESS("✅ Benchmark complete"))
@@ -1,20 +1,15 @@
 from django.core.management.base import BaseCommand
-from pymongo import MongoClient
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from candidates.models import Candidate
+from hireiq_backend.mongodb_utils import get_database
 
 class Command(BaseCommand):
     help = 'Check raw MongoDB data'
 
     def handle(self, *args, **options):
         try:
-            # Connect to MongoDB directly
-            mongodb_url = os.getenv('MONGODB_URL')
-            client = MongoClient(mongodb_url)
-            db = client['hireiq_db']
-            candidates_collection = db['candidates']
+            # Raw documents through the shared client, bypassing mongoengine's document mapping
+            db = get_database()
+            candidates_collection = db[Candidate._get_collection_name()]
             
             self.stdout.write("Checking raw MongoDB data...")
             
@@ -0,0 +1,103 @@
+from django.core.management.base import BaseCommand
+from candidates.models import Candidate
+from candidates.gridfs_models import GridFSHelper, ResumeBlob
+from candidates.blob_codecs import CODEC_IDENTITY, encode_blob
+import time
+
+
+class Command(BaseCommand):
+    help = 'Rewrite resume blobs stored before compression with the current codec where it pays off'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Blobs to rewrite per batch (default: 50)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help='Seconds to pause between batches to limit load on a live cluster',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the blobs that are stored uncompressed',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            blobs = ResumeBlob._get_collection()
+            pending_filter = {'codec': {'$in': [None, CODEC_IDENTITY]}, 'compress_checked': {'$ne': True}}
+
+            remaining = blobs.count_documents(pending_filter)
+            self.stdout.write(f"📊 {remaining} resume blobs are stored uncompressed")
+            if options['dry_run'] or remaining == 0:
+                return
+
+            helper = GridFSHelper()
+            compressed = skipped = saved = 0
+
+            while True:
+                batch = list(blobs.find(pending_filter).limit(max(1, options['batch_size'])))
+                if not batch:
+                    break
+
+                for blob in batch:
+                    result = self._compress(blobs, helper, blob)
+                    if result is None:
+                        skipped += 1
+                    else:
+                        compressed += 1
+                        saved += result
+
+                self.stdout.write(f"  ✅ Compressed {compressed} so far ({skipped} left as-is)")
+                if options['sleep']:
+                    time.sleep(options['sleep'])
+
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Compressed {compressed} resume blobs, saving {saved / 1e6:.2f} MB ({skipped} left as-is)"
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Compression failed: {e}"))
+
+    def _compress(self, blobs, helper, blob):
+        """Swap one blob onto a compressed copy; bytes saved, or None if it was left as-is"""
+        old_file_id = blob['file_id']
+        gridfs_file = helper.get_file(old_file_id)
+        if gridfs_file is None:
+            blobs.update_one({'_id': blob['_id']}, {'$set': {'compress_checked': True}})
+            return None
+
+        content = helper.read_file(gridfs_file)
+        content_type = blob.get('content_type') or 'application/pdf'
+        stored, codec = encode_blob(content, content_type)
+        if codec == CODEC_IDENTITY:
+            blobs.update_one({'_id': blob['_id']}, {'$set': {'compress_checked': True}})
+            return None
+
+        new_file_id = helper.store_file(
+            stored,
+            filename=gridfs_file.filename,
+            content_type=content_type,
+            metadata=dict(gridfs_file.metadata or {}, sha256=blob['_id'], codec=codec, size=len(content)),
+        )
+
+        # Only switch if the blob still points at the file we read
+        result = blobs.update_one(
+            {'_id': blob['_id'], 'file_id': old_file_id},
+            {'$set': {'file_id': new_file_id, 'codec': codec, 'size': len(content), 'stored_size': len(stored)}},
+        )
+        if not result.modified_count:
+            helper.delete_file(new_file_id)
+            return None
+
+        Candidate._get_collection().update_many(
+            {'resume_sha256': blob['_id'], 'resume_file_id': old_file_id},
+            {'$set': {'resume_file_id': new_file_id}},
+        )
+        helper.delete_file(old_file_id)
+        return len(content) - len(stored)
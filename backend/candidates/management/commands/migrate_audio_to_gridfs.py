@@ -0,0 +1,99 @@
+from django.core.management.base import BaseCommand
+from candidates.models import Candidate
+from candidates.audio_store import store_audio, delete_audio, get_audio_helper
+from candidates.blob_codecs import unpack_audio
+from candidates.cache import invalidate_candidate
+import time
+
+
+class Command(BaseCommand):
+    help = 'Move inline audio_data out of candidate audio responses into the GridFS audio bucket'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Candidates to migrate per batch (default: 20)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help='Seconds to pause between batches to limit load on a live cluster',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the candidates that still need migrating',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            collection = Candidate._get_collection()
+            pending_filter = {'audio_responses': {'$elemMatch': {'audio_data': {'$exists': True, '$ne': None}}}}
+
+            remaining = collection.count_documents(pending_filter)
+            self.stdout.write(f"📊 {remaining} candidates have inline audio to migrate")
+            if options['dry_run'] or remaining == 0:
+                return
+
+            helper = get_audio_helper()
+            migrated = skipped = 0
+            skipped_ids = []
+
+            while True:
+                batch = list(collection.find(
+                    dict(pending_filter, _id={'$nin': skipped_ids}),
+                    {'candidate_id': 1, 'created_by_id': 1, 'audio_responses': 1},
+                ).limit(max(1, options['batch_size'])))
+                if not batch:
+                    break
+
+                for doc in batch:
+                    if self._migrate(collection, helper, doc):
+                        migrated += 1
+                        invalidate_candidate(doc.get('candidate_id'), doc.get('created_by_id'))
+                    else:
+                        skipped += 1
+                        skipped_ids.append(doc['_id'])
+
+                self.stdout.write(f"  ✅ Migrated {migrated} so far ({skipped} skipped)")
+                if options['sleep']:
+                    time.sleep(options['sleep'])
+
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Moved audio for {migrated} candidates to GridFS ({skipped} skipped, rerun to retry)"
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Audio migration failed: {e}"))
+
+    def _migrate(self, collection, helper, doc):
+        """Swap one candidate's inline audio for GridFS references; False if it changed underneath us"""
+        original = doc['audio_responses']
+        responses = []
+        stored = []
+        for response in original:
+            response = dict(response)
+            content = unpack_audio(response) if response.get('audio_data') else None
+            response.pop('audio_data', None)
+            if content:
+                fields = store_audio(
+                    doc.get('candidate_id'), response.get('question_id'), response.get('question_text'),
+                    content, transcription=response.get('transcription'), helper=helper,
+                )
+                response.update(fields)
+                stored.append(fields)
+            responses.append(response)
+
+        # Only update if no answer was saved since we read the document
+        result = collection.update_one(
+            {'_id': doc['_id'], 'audio_responses': original},
+            {'$set': {'audio_responses': responses}},
+        )
+        if not result.modified_count:
+            for fields in stored:
+                delete_audio(fields, helper)
+            return False
+        return True
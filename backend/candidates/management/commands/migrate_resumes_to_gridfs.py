@@ -0,0 +1,137 @@
+from django.core.management.base import BaseCommand
+from candidates.models import Candidate
+from candidates.gridfs_models import GridFSHelper, acquire_blob, release_blob
+from candidates.cache import invalidate_candidate
+from candidates.resume_text import ensure_resume_text
+import hashlib
+import time
+
+
+class Command(BaseCommand):
+    help = ('Move inline resume_data out of candidate documents into content-addressed GridFS blobs, '
+            'and deduplicate GridFS resumes stored before content addressing')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Candidates to migrate per batch (default: 50)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=0,
+            help='Stop after migrating this many candidates (default: all)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help='Seconds to pause between batches to limit load on a live cluster',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the candidates that still need migrating',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            collection = Candidate._get_collection()
+            # Inline bytes, or a GridFS file that isn't registered as a content-addressed blob yet
+            pending_filter = {'$or': [
+                {'resume_data': {'$exists': True, '$ne': None}},
+                {'resume_file_id': {'$ne': None}, 'resume_sha256': None},
+            ]}
+
+            remaining = collection.count_documents(pending_filter)
+            self.stdout.write(f"📊 {remaining} candidates have resumes to migrate")
+            if options['dry_run'] or remaining == 0:
+                return
+
+            helper = GridFSHelper()
+            batch_size = max(1, options['batch_size'])
+            limit = options['limit']
+            migrated = skipped = 0
+
+            # Every pass re-queries what is still pending, so an interrupted run just picks up
+            # where it stopped. A crash between taking a blob reference and updating the
+            # candidate can leave a refcount one too high: the blob is kept, never lost.
+            while True:
+                size = batch_size if not limit else min(batch_size, limit - migrated)
+                if size <= 0:
+                    break
+
+                batch = list(collection.find(
+                    pending_filter,
+                    {'candidate_id': 1, 'created_by_id': 1, 'resume_data': 1, 'resume_file_id': 1,
+                     'resume_filename': 1, 'resume_content_type': 1},
+                ).limit(size))
+                if not batch:
+                    break
+
+                for doc in batch:
+                    if self._migrate(collection, helper, doc):
+                        migrated += 1
+                        invalidate_candidate(doc.get('candidate_id'), doc.get('created_by_id'))
+                    else:
+                        skipped += 1
+
+                self.stdout.write(f"  ✅ Migrated {migrated} so far ({skipped} skipped)")
+                if options['sleep']:
+                    time.sleep(options['sleep'])
+
+            remaining = collection.count_documents(pending_filter)
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Migrated {migrated} resumes to GridFS ({skipped} skipped, {remaining} remaining)"
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Resume migration failed: {e}"))
+
+    def _migrate(self, collection, helper, doc):
+        """Point one candidate at the blob for its resume bytes; False if it changed underneath us"""
+        legacy_file_id = None
+        if doc.get('resume_data'):
+            content = bytes(doc['resume_data'])
+            condition = {'resume_data': {'$exists': True, '$ne': None}}
+        else:
+            legacy_file_id = doc['resume_file_id']
+            gridfs_file = helper.get_file(legacy_file_id)
+            if gridfs_file is None:
+                self.stdout.write(self.style.WARNING(
+                    f"  ⚠️  GridFS file {legacy_file_id} missing for candidate {doc.get('candidate_id')}"
+                ))
+                collection.update_one(
+                    {'_id': doc['_id'], 'resume_file_id': legacy_file_id},
+                    {'$unset': {'resume_file_id': ''}, '$set': {'has_resume': False}},
+                )
+                return False
+            content = helper.read_file(gridfs_file)
+            condition = {'resume_file_id': legacy_file_id, 'resume_sha256': None}
+
+        sha256, file_id = acquire_blob(
+            content,
+            filename=doc.get('resume_filename') or f"{doc.get('candidate_id')}_resume.pdf",
+            content_type=doc.get('resume_content_type') or 'application/pdf',
+            sha256=hashlib.sha256(content).hexdigest(),
+            helper=helper,
+        )
+
+        # Only update if nothing re-uploaded the resume since we read it
+        result = collection.update_one(
+            dict({'_id': doc['_id']}, **condition),
+            {
+                '$set': {'resume_file_id': file_id, 'resume_sha256': sha256, 'has_resume': True},
+                '$unset': {'resume_data': ''},
+            }
+        )
+        if not result.modified_count:
+            release_blob(sha256, helper)
+            return False
+
+        if legacy_file_id and legacy_file_id != file_id:
+            helper.delete_file(legacy_file_id)
+        ensure_resume_text(sha256, file_id, helper)
+        return True
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from candidates.models import Candidate
+from candidates.gridfs_models import GridFSHelper, ResumeBlob
+from candidates.resume_text import delete_resume_text
+from candidates.resume_pipeline import delete_resume_chunks
+from candidates.thumbnails import delete_thumbnail
+from datetime import datetime, timedelta
+
+
+class Command(BaseCommand):
+    help = 'Recompute resume blob reference counts from candidates and delete unreferenced blobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-minutes',
+            type=int,
+            default=60,
+            help='Keep unreferenced blobs younger than this, they may belong to an upload in flight (default: 60)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report differences without changing anything',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            counts = {
+                row['_id']: row['count']
+                for row in Candidate._get_collection().aggregate([
+                    {'$match': {'resume_sha256': {'$ne': None}}},
+                    {'$group': {'_id': '$resume_sha256', 'count': {'$sum': 1}}},
+                ])
+            }
+
+            blobs = ResumeBlob._get_collection()
+            cutoff = datetime.utcnow() - timedelta(minutes=options['grace_minutes'])
+            helper = GridFSHelper()
+            fixed = deleted = 0
+
+            for blob in blobs.find({}, {'refcount': 1, 'file_id': 1, 'created_at': 1}):
+                actual = counts.get(blob['_id'], 0)
+                if actual == 0 and blob.get('created_at') and blob['created_at'] < cutoff:
+                    self.stdout.write(f"  🗑️  {blob['_id'][:12]}… unreferenced (refcount was {blob.get('refcount')})")
+                    if not options['dry_run']:
+                        # Re-check at delete time in case a candidate picked it up meanwhile
+                        if blobs.find_one_and_delete({'_id': blob['_id'], 'refcount': blob.get('refcount')}):
+                            helper.delete_file(blob['file_id'])
+                            delete_resume_text(blob['_id'])
+                            delete_resume_chunks(blob['_id'])
+                            delete_thumbnail(blob['_id'])
+                    deleted += 1
+                elif actual and blob.get('refcount') != actual:
+                    self.stdout.write(f"  🔧 {blob['_id'][:12]}… refcount {blob.get('refcount')} -> {actual}")
+                    if not options['dry_run']:
+                        blobs.update_one(
+                            {'_id': blob['_id'], 'refcount': blob.get('refcount')},
+                            {'$set': {'refcount': actual}},
+                        )
+                    fixed += 1
+
+            missing = set(counts) - {blob['_id'] for blob in blobs.find({}, {'_id': 1})}
+            if missing:
+                self.stdout.write(self.style.WARNING(f"  ⚠️  {len(missing)} hashes referenced by candidates have no blob"))
+
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {len(counts)} referenced blobs, {fixed} refcounts corrected, {deleted} unreferenced blobs removed"
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Recount failed: {e}"))
@@ -0,0 +1,101 @@
+from django.core.management.base import BaseCommand
+from candidates.models import Candidate
+from candidates.gridfs_models import ResumeBlob
+from candidates.audio_store import get_audio_helper, AUDIO_BUCKET
+
+
+def _size(value):
+    """Stored size of a binary or string field, computed server-side"""
+    return {'$switch': {
+        'branches': [
+            {'case': {'$eq': [{'$type': value}, 'binData']}, 'then': {'$binarySize': value}},
+            {'case': {'$eq': [{'$type': value}, 'string']}, 'then': {'$strLenBytes': value}},
+        ],
+        'default': 0,
+    }}
+
+
+class Command(BaseCommand):
+    help = 'Report raw vs stored bytes for resumes and audio answers, per codec, and the space compression saves'
+
+    def handle(self, *args, **options):
+        try:
+            rows = []
+
+            # Content-addressed resume blobs in GridFS
+            for row in ResumeBlob._get_collection().aggregate([
+                {'$group': {
+                    '_id': {'$ifNull': ['$codec', 'identity']},
+                    'count': {'$sum': 1},
+                    'raw': {'$sum': {'$ifNull': ['$size', 0]}},
+                    'stored': {'$sum': {'$ifNull': ['$stored_size', {'$ifNull': ['$size', 0]}]}},
+                }},
+            ]):
+                rows.append(('resume blobs', row['_id'], row['count'], row['raw'], row['stored']))
+
+            collection = Candidate._get_collection()
+
+            # Resumes still inline on the candidate (not yet migrated to GridFS)
+            for row in collection.aggregate([
+                {'$match': {'resume_data': {'$exists': True, '$ne': None}}},
+                {'$group': {'_id': None, 'count': {'$sum': 1}, 'bytes': {'$sum': _size('$resume_data')}}},
+            ]):
+                rows.append(('inline resumes', 'identity', row['count'], row['bytes'], row['bytes']))
+
+            # Audio answers in the GridFS audio bucket
+            audio_files = get_audio_helper().db[f'{AUDIO_BUCKET}.files']
+            for row in audio_files.aggregate([
+                {'$match': {'metadata.type': 'audio_response'}},
+                {'$group': {
+                    '_id': {'$ifNull': ['$metadata.codec', 'identity']},
+                    'count': {'$sum': 1},
+                    'raw': {'$sum': {'$ifNull': ['$metadata.size', '$length']}},
+                    'stored': {'$sum': '$length'},
+                }},
+            ]):
+                rows.append(('audio answers', row['_id'], row['count'], row['raw'], row['stored']))
+
+            # Audio still inline on the candidate: legacy base64 strings decode to 3/4 of their length
+            for row in collection.aggregate([
+                {'$match': {'audio_responses.audio_data': {'$exists': True}}},
+                {'$unwind': '$audio_responses'},
+                {'$match': {'audio_responses.audio_data': {'$ne': None}}},
+                {'$project': {
+                    'codec': {'$cond': [
+                        {'$eq': [{'$type': '$audio_responses.audio_data'}, 'string']},
+                        'base64',
+                        {'$ifNull': ['$audio_responses.audio_codec', 'identity']},
+                    ]},
+                    'stored': _size('$audio_responses.audio_data'),
+                    'raw': {'$ifNull': [
+                        '$audio_responses.audio_size',
+                        {'$floor': {'$multiply': [_size('$audio_responses.audio_data'), 0.75]}},
+                    ]},
+                }},
+                {'$group': {'_id': '$codec', 'count': {'$sum': 1}, 'raw': {'$sum': '$raw'}, 'stored': {'$sum': '$stored'}}},
+            ]):
+                rows.append(('inline audio', row['_id'], row['count'], row['raw'], row['stored']))
+
+            if not rows:
+                self.stdout.write("📊 No stored resumes or audio answers")
+                return
+
+            self.stdout.write(f"{'kind':<16}{'codec':<10}{'count':>8}{'raw MB':>12}{'stored MB':>12}{'saved':>8}")
+            total_raw = total_stored = 0
+            for kind, codec, count, raw, stored in sorted(rows):
+                total_raw += raw
+                total_stored += stored
+                self.stdout.write(
+                    f"{kind:<16}{codec:<10}{count:>8}{raw / 1e6:>12.2f}{stored / 1e6:>12.2f}{self._percent(raw, stored):>8}"
+                )
+
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {total_stored / 1e6:.2f} MB stored for {total_raw / 1e6:.2f} MB of content "
+                f"({(total_raw - total_stored) / 1e6:.2f} MB, {self._percent(total_raw, total_stored)} saved)"
+            ))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"❌ Storage report failed: {e}"))
+
+    def _percent(self, raw, stored):
+        return f"{(raw - stored) / raw * 100:.0f}%" if raw else '-'
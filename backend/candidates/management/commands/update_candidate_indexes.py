@@ -1,29 +1,16 @@
 from django.core.management.base import BaseCommand
 from candidates.models import Candidate
+from hireiq_backend.mongodb_utils import get_database
 import pymongo
-from django.conf import settings
-import os
 
 class Command(BaseCommand):
     help = 'Update MongoDB indexes to allow same candidate email for different recruiters'
 
     def handle(self, *args, **options):
         try:
-            # Connect to MongoDB directly to manage indexes
-            from pymongo import MongoClient
-            
-            # Get MongoDB connection details from settings
-            mongodb_url = os.getenv('MONGODB_URL')
-            mongodb_name = os.getenv('MONGODB_NAME', 'hireiq_db')
-            
-            if not mongodb_url:
-                self.stdout.write(self.style.ERROR('MongoDB URL not found in environment variables'))
-                return
-            
-            # Connect to MongoDB
-            client = MongoClient(mongodb_url)
-            db = client[mongodb_name]
-            collection = db.candidate  # mongoengine collection name
+            # Manage indexes with raw pymongo on the shared client
+            db = get_database()
+            collection = db[Candidate._get_collection_name()]  # 'candidates', from Candidate.meta
             
             self.stdout.write('Connected to MongoDB successfully')
             
@@ -52,12 +39,28 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS('✅ Created new compound unique index (email + created_by_id)'))
             except pymongo.errors.DuplicateKeyError as e:
                 self.stdout.write(self.style.ERROR(f'❌ Cannot create index due to existing duplicates: {e}'))
-                self.stdout.write('You may need to clean up duplicate data first')
+                duplicates = collection.aggregate([
+                    {"$group": {"_id": {"email": "$email", "created_by_id": "$created_by_id"},
+                                "count": {"$sum": 1}, "candidate_ids": {"$push": "$candidate_id"}}},
+                    {"$match": {"count": {"$gt": 1}}},
+                ])
+                for duplicate in duplicates:
+                    self.stdout.write(
+                        f"  ⚠️  {duplicate['_id']['email']} (recruiter {duplicate['_id']['created_by_id']}): "
+                        f"{', '.join(str(c) for c in duplicate['candidate_ids'])}"
+                    )
+                self.stdout.write('Delete or merge the duplicates above, then run this command again')
                 return
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f'❌ Error creating compound index: {e}'))
                 return
             
+            # Full-text search index (replaces an older definition, see Candidate.ensure_text_index)
+            if Candidate.ensure_text_index():
+                self.stdout.write(self.style.SUCCESS('✅ Created full-text search index'))
+            else:
+                self.stdout.write('ℹ️  Full-text search index already up to date')
+            
             # List updated indexes
             self.stdout.write('\nUpdated indexes:')
             for index in collection.list_indexes():
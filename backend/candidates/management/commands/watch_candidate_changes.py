@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from candidates.change_feed import get_change_feed
+import queue
+
+
+class Command(BaseCommand):
+    help = 'Print candidate change feed events (for checking change streams against a local replica set)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recruiter',
+            help='Only show changes to this recruiter\'s candidates',
+        )
+
+    def handle(self, *args, **options):
+        recruiter_id = options.get('recruiter')
+        feed = get_change_feed()
+        listener = feed.subscribe(recruiter_id)
+
+        self.stdout.write("👀 Watching candidate changes (Ctrl+C to stop)...")
+
+        try:
+            while True:
+                try:
+                    payload = listener.get(timeout=5)
+                except queue.Empty:
+                    continue
+                candidate = payload['candidate']
+                self.stdout.write(
+                    f"[{feed.mode}] {payload['event']}: {candidate['email']} "
+                    f"({candidate['candidate_id']}) status={payload['status']}"
+                )
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped")
+        finally:
+            feed.unsubscribe(recruiter_id, listener)
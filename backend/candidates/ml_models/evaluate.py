@@ -30,39 +30,6 @@ class CandidateEvaluator:
         except Exception as e:
             raise ValueError(f"Failed to configure Gemini API: {str(e)}")
     
-    def extract_text_from_pdf(self, pdf_content: bytes) -> str:
-        """
-        Extract text content from PDF bytes using PyMuPDF (fitz).
-        Uses the same parse_resume function from questions.py module.
-        
-        Args:
-            pdf_content (bytes): PDF file content as bytes
-            
-        Returns:
-            str: Extracted text from PDF
-        """
-        try:
-            # Import the parse_resume function from questions.py
-            from .questions import parse_resume
-            
-            # Create a file-like object from bytes that mimics Django's InMemoryUploadedFile
-            class MockFile:
-                def __init__(self, content):
-                    self.content = content
-                    self.position = 0
-                
-                def read(self):
-                    return self.content
-            
-            mock_file = MockFile(pdf_content)
-            text = parse_resume(mock_file)
-            
-            return text.strip()
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF using PyMuPDF: {str(e)}")
-            # Fallback to a simple message if extraction fails
-            return "Resume content could not be extracted"
-    
     def create_evaluation_prompt(self, question: str, answer: str, resume_text: str) -> str:
         """
         Create a detailed evaluation prompt for Gemini AI.
@@ -127,23 +94,22 @@ Evaluate thoroughly and provide constructive feedback that would help both the r
 """
         return prompt
     
-    def evaluate_answer(self, question: str, answer: str, resume_content: bytes) -> Dict[str, Any]:
+    def evaluate_answer(self, question: str, answer: str, resume_text: str) -> Dict[str, Any]:
         """
         Evaluate a candidate's answer using Gemini AI.
         
         Args:
             question (str): The interview question
             answer (str): The candidate's response
-            resume_content (bytes): PDF resume content as bytes
+            resume_text (str): Resume text extracted at upload (see candidates/resume_text.py)
             
         Returns:
             Dict[str, Any]: Evaluation results with scores and feedback
         """
         try:
-            # Extract text from resume PDF
-            resume_text = self.extract_text_from_pdf(resume_content)
+            resume_text = (resume_text or "").strip()
             if not resume_text:
-                logger.warning("Could not extract text from resume PDF")
+                logger.warning("No text could be extracted from the resume PDF")
                 resume_text = "Resume content could not be extracted"
             
             # Create evaluation prompt
@@ -245,7 +211,7 @@ Evaluate thoroughly and provide constructive feedback that would help both the r
 
 
 # Convenience function for direct usage
-def evaluate_candidate_answer(question: str, answer: str, resume_content: bytes) -> Dict[str, Any]:
+def evaluate_candidate_answer(question: str, answer: str, resume_text: str) -> Dict[str, Any]:
     """
     Evaluate a candidate's answer using the CandidateEvaluator class.
     If Gemini API key is not configured, returns a mock evaluation.
@@ -253,14 +219,14 @@ def evaluate_candidate_answer(question: str, answer: str, resume_content: bytes)
     Args:
         question (str): The interview question
         answer (str): The candidate's response
-        resume_content (bytes): PDF resume content as bytes
+        resume_text (str): Resume text extracted at upload
         
     Returns:
         Dict[str, Any]: Evaluation results with scores and feedback
     """
     try:
         evaluator = CandidateEvaluator()
-        return evaluator.evaluate_answer(question, answer, resume_content)
+        return evaluator.evaluate_answer(question, answer, resume_text)
     except ValueError as e:
         # If API key is not configured, use mock evaluation
         if "GEMINI_API_KEY" in str(e):
@@ -271,7 +237,7 @@ def evaluate_candidate_answer(question: str, answer: str, resume_content: bytes)
                 backend_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
                 sys.path.insert(0, backend_path)
                 from mock_evaluation import mock_evaluate_candidate_answer
-                return mock_evaluate_candidate_answer(question, answer, resume_content)
+                return mock_evaluate_candidate_answer(question, answer, resume_text)
             except ImportError:
                 return {
                     "overall_score": 0,
@@ -304,14 +270,14 @@ def test_evaluation():
     sample_question = "Explain the difference between SQL and NoSQL databases and when you would use each."
     sample_answer = "SQL databases are relational and use structured query language. They have ACID properties and are good for complex queries. NoSQL databases are non-relational and can handle unstructured data. They are more scalable for big data applications."
     
-    # For testing, you would need to provide actual PDF bytes
-    # sample_resume_bytes = b"..." # This would be actual PDF content
+    # For testing, you would need to provide extracted resume text
+    # sample_resume_text = "..." # e.g. get_resume_text(candidate_id)['text']
     
     print("Evaluation system is ready. Use evaluate_candidate_answer() function with actual data.")
     print("Required parameters:")
     print("- question: str (interview question)")
     print("- answer: str (candidate's response)")
-    print("- resume_content: bytes (PDF file content as bytes)")
+    print("- resume_text: str (resume text extracted at upload)")
 
 
 if __name__ == "__main__":
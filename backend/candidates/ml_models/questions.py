@@ -8,14 +8,6 @@ try:
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
-# Use chromadb directly instead of langchain_community vectorstores
-try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMADB_AVAILABLE = True
-except ImportError:
-    CHROMADB_AVAILABLE = False
-
 import os
 from groq import Groq
 import requests
@@ -24,37 +16,65 @@ from dotenv import load_dotenv
 import json
 import re
 import random
+import threading
 
-import fitz
+import numpy as np
 
 # Load environment variables from .env file
 load_dotenv()
 
-class ChromaRetriever:
-    """ChromaDB retriever with sentence transformers for semantic search."""
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+_embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+
+def get_embedding_model():
+    """Load the sentence transformer once per process; loading it costs seconds, encoding a query milliseconds"""
+    global _embedding_model
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        raise ImportError("sentence-transformers is required but not available. Please install with: pip install sentence-transformers")
+    with _embedding_model_lock:
+        if _embedding_model is None:
+            _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        return _embedding_model
+
+
+def split_resume_text(text: str) -> list:
+    """Split resume text into overlapping chunks for retrieval."""
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    return text_splitter.split_text(text or "")
+
+
+def embed_texts(texts: list) -> np.ndarray:
+    """
+    Embed texts as unit-length float16 vectors (so a dot product is the cosine similarity).
+
+    Returns:
+        np.ndarray: shape (len(texts), dim), dtype float16
+    """
+    embeddings = get_embedding_model().encode(list(texts), normalize_embeddings=True)
+    return np.asarray(embeddings, dtype=np.float16)
+
+
+class ResumeRetriever:
+    """In-memory semantic search over a resume's precomputed chunk embeddings."""
     
-    def __init__(self, collection, embedding_model):
-        self.collection = collection
-        self.embedding_model = embedding_model
+    def __init__(self, chunks, embeddings):
+        self.chunks = list(chunks)
+        # Score in float32; the float16 copy is only for storage
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
     
     def get_relevant_documents(self, query, k=3):
-        """Return documents that are semantically similar to the query."""
-        # Encode the query using sentence transformers
-        query_embedding = self.embedding_model.encode([query]).tolist()
-        
-        # Query ChromaDB for similar documents
-        results = self.collection.query(
-            query_embeddings=query_embedding,
-            n_results=k
-        )
-        
-        # Convert results back to LangChain document format
-        documents = []
-        if results['documents'] and len(results['documents']) > 0:
-            for doc_text in results['documents'][0]:
-                documents.append(LangChainDocument(page_content=doc_text))
-        
-        return documents
+        """Return the k chunks most similar to the query."""
+        if not self.chunks:
+            return []
+        query_embedding = embed_texts([query])[0].astype(np.float32)
+        scores = self.embeddings @ query_embedding
+        top = np.argsort(-scores)[:k]
+        return [LangChainDocument(page_content=self.chunks[i]) for i in top]
 
 def get_interview_topics(company: str, role: str, extra_topics: str = ""):
     """
@@ -179,89 +199,21 @@ Your task:
                 return {"raw_output": reply}
         return {"raw_output": reply}
 
-# PyMuPDF for PDF parsing
-
-def parse_resume(file_obj) -> str:
-    # file_obj: Django InMemoryUploadedFile or similar
-    doc = fitz.open(stream=file_obj.read(), filetype="pdf")
-    text = ""
-    for page in doc:
-        text += page.get_text("text")
-    return text
+# Resume text comes from candidates.resume_text (extracted once per resume blob)
 
-    
 def query_resume(retriever, query, top_k=3):
-    """Query the resume using ChromaDB semantic search."""
+    """Query the resume using semantic search."""
     docs = retriever.get_relevant_documents(query, k=top_k)
     return [doc.page_content for doc in docs]
 
 
-def build_retriever(text: str, persist_directory: str = "chroma_db_00"):
-    """
-    Chunks text, creates embeddings using sentence transformers, and builds a ChromaDB retriever.
-    """
-    if not CHROMADB_AVAILABLE:
-        raise ImportError("chromadb is required but not available. Please install with: pip install chromadb")
-    
-    if not SENTENCE_TRANSFORMERS_AVAILABLE:
-        raise ImportError("sentence-transformers is required but not available. Please install with: pip install sentence-transformers")
-    
-    # Initialize the sentence transformer model
-    embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-    
-    # Split into chunks
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    chunks = text_splitter.split_text(text)
-    
-    # Initialize ChromaDB client
-    chroma_client = chromadb.Client(Settings(
-        persist_directory=persist_directory,
-        anonymized_telemetry=False
-    ))
-    
-    # Create or get collection
-    collection_name = "resume_collection"
-    try:
-        # Try to get existing collection
-        collection = chroma_client.get_collection(name=collection_name)
-        # Delete existing collection to avoid duplicates
-        chroma_client.delete_collection(name=collection_name)
-    except:
-        pass  # Collection doesn't exist, which is fine
-    
-    # Create new collection
-    collection = chroma_client.create_collection(
-        name=collection_name,
-        metadata={"description": "Resume text chunks for interview question generation"}
-    )
-    
-    # Generate embeddings and add to collection
-    if chunks:
-        # Generate embeddings for all chunks
-        embeddings = embedding_model.encode(chunks).tolist()
-        
-        # Create unique IDs for each chunk
-        ids = [f"chunk_{i}" for i in range(len(chunks))]
-        
-        # Add documents to collection
-        collection.add(
-            documents=chunks,
-            embeddings=embeddings,
-            ids=ids
-        )
-    
-    # Return ChromaDB retriever
-    return ChromaRetriever(collection, embedding_model)
-
-
-
 def generate_questions(final_topics, retriever, num_questions=5):
     """
     Generate structured interview questions: 1 DSA theoretical, 3 project-based, 1 behavioral.
     
     Args:
         final_topics: Dictionary with categorized topics (DSA_Theory, Project_Based, Behavioral)
-        retriever: ChromaDB retriever for resume context
+        retriever: ResumeRetriever for resume context
         num_questions: Total number of questions (default 5)
     
     Returns:
@@ -314,7 +266,7 @@ def generate_question(topic: str, retriever, question_type: str = "general") ->
 
     Args:
         topic (str): The technical topic for the question.
-        retriever: The ChromaDB retriever object to get resume context using semantic search.
+        retriever: ResumeRetriever used to get resume context through semantic search.
         question_type (str): Type of question - "DSA_Theory", "Project_Based", or "Behavioral"
 
     Returns:
@@ -431,12 +383,13 @@ Instructions:
 # merge_hr_with_hot_topics(HR_prompt, get_interview_topics("Microsoft", "SDE Intern"))
 
 
-def get_questions(resume_file, HR_prompt, company, role):
+def get_questions(retriever, HR_prompt, company, role):
     """
     Main function to generate interview questions based on resume and company/role.
     
     Args:
-        resume_file: PDF file object containing the candidate's resume
+        retriever: ResumeRetriever over the resume chunks embedded at upload
+            (see candidates/resume_pipeline.py)
         HR_prompt: HR instructions for evaluation
         company: Company name for the role
         role: Role/position name
@@ -450,8 +403,6 @@ def get_questions(resume_file, HR_prompt, company, role):
     if not os.getenv("PERPLEXITY_API_KEY"):
         raise ValueError("PERPLEXITY_API_KEY not found in environment variables")
     
-    text = parse_resume(resume_file)
-    retriever = build_retriever(text)
     final_topics = merge_hr_with_hot_topics(HR_prompt, get_interview_topics(company, role))
     questions = generate_questions(final_topics, retriever)
     return questions
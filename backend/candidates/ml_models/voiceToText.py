@@ -1,28 +1,51 @@
 import os
 from django.conf import settings
 
+from ..audio_normalize import normalize_audio, NormalizedAudio
+from ..blob_codecs import sniff_content_type
 
-def transcribe_audio_google(audio_file) -> str:
+# File suffixes for audio sent without normalization (ffmpeg not installed)
+_SUFFIXES = {'audio/webm': '.webm', 'audio/ogg': '.ogg', 'audio/flac': '.flac', 'audio/mpeg': '.mp3', 'audio/wav': '.wav'}
+
+
+def prepare_audio(audio_file) -> NormalizedAudio:
+    """
+    Read an uploaded answer and normalize it to 16 kHz mono for the transcription providers.
+    Falls back to the original bytes (with their detected type) when ffmpeg isn't available.
+
+    Raises:
+        AudioNormalizationError: The audio cannot be decoded, so no provider is worth calling
+    """
+    audio_file.seek(0)
+    content = audio_file.read()
+    audio = normalize_audio(content)
+    if audio is None:
+        content_type = sniff_content_type(content, 'audio/wav')
+        audio = NormalizedAudio(content, content_type, _SUFFIXES.get(content_type, '.wav'), None, None)
+    return audio
+
+
+def transcribe_audio_google(audio_file, audio=None) -> str:
     """
     Transcribes audio using Google Cloud Speech-to-Text API.
-    Supports many formats including WAV, MP3, M4A, FLAC
+    Sends the normalized 16 kHz mono audio, declaring its real encoding.
+    :param audio: Already prepared audio (see prepare_audio), to skip preparing it again
     """
     try:
         from google.cloud import speech
-        import base64
         
         # Initialize Google Cloud client
         client = speech.SpeechClient()
         
-        # Read audio file content
-        audio_file.seek(0)
-        content = audio_file.read()
+        audio = audio or prepare_audio(audio_file)
         
-        # Configure audio settings
-        audio = speech.RecognitionAudio(content=content)
+        # Configure audio settings; un-normalized audio is left for Google to detect from its header
+        encoding = speech.RecognitionConfig.AudioEncoding[audio.encoding or 'ENCODING_UNSPECIFIED']
+        recognition_audio = speech.RecognitionAudio(content=audio.data)
         config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,  # Auto-detect
-            sample_rate_hertz=16000,
+            encoding=encoding,
+            sample_rate_hertz=audio.sample_rate or 0,
+            audio_channel_count=1 if audio.encoding else 0,
             language_code="en-US",
             enable_automatic_punctuation=True,
             enable_word_time_offsets=False,
@@ -30,7 +53,7 @@ def transcribe_audio_google(audio_file) -> str:
         )
         
         # Perform transcription
-        response = client.recognize(config=config, audio=audio)
+        response = client.recognize(config=config, audio=recognition_audio)
         
         # Extract text from response
         transcript = ""
@@ -42,10 +65,11 @@ def transcribe_audio_google(audio_file) -> str:
     except Exception as e:
         raise ValueError(f"Google transcription failed: {str(e)}")
 
-def transcribe_audio_gemini(audio_file) -> str:
+def transcribe_audio_gemini(audio_file, audio=None) -> str:
     """
     Transcribes audio using Google Gemini API.
     Uses gemini-1.5-flash for better rate limits.
+    :param audio: Already prepared audio (see prepare_audio), to skip preparing it again
     """
     try:
         import google.generativeai as genai
@@ -62,10 +86,10 @@ def transcribe_audio_gemini(audio_file) -> str:
             
         genai.configure(api_key=api_key)
         
-        # Save audio to temporary file (Gemini requires file path)
-        audio_file.seek(0)
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-            temp_file.write(audio_file.read())
+        # Save audio to temporary file (Gemini requires file path), under its real type
+        audio = audio or prepare_audio(audio_file)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=audio.suffix) as temp_file:
+            temp_file.write(audio.data)
             temp_path = temp_file.name
         
         try:
@@ -73,7 +97,7 @@ def transcribe_audio_gemini(audio_file) -> str:
             
             # Upload file to Gemini
             print("📤 Uploading file to Gemini...")
-            uploaded_file = genai.upload_file(temp_path)
+            uploaded_file = genai.upload_file(temp_path, mime_type=audio.content_type)
             
             # Use Gemini Flash model (better rate limits than Pro)
             print("🤖 Generating transcription with Gemini-1.5-Flash...")
@@ -132,7 +156,12 @@ def transcribe_audio(audio_file, service="gemini") -> str:
     if service == "mock":
         print("🎭 Using mock service directly")
         return transcribe_audio_mock(audio_file)
-    elif service == "gemini":
+    
+    # Normalize once up front: smaller uploads, and undecodable audio fails here
+    # (AudioNormalizationError) instead of after a provider round trip
+    audio = prepare_audio(audio_file)
+    
+    if service == "gemini":
         try:
             # Add a quick timeout and fallback for Gemini
             print("🎤 Attempting Gemini transcription with timeout protection...")
@@ -146,7 +175,7 @@ def transcribe_audio(audio_file, service="gemini") -> str:
             def gemini_call():
                 try:
                     print("🔧 Starting Gemini API call in thread...")
-                    result["transcription"] = transcribe_audio_gemini(audio_file)
+                    result["transcription"] = transcribe_audio_gemini(audio_file, audio)
                     print("🔧 Gemini API call completed in thread")
                 except Exception as e:
                     print(f"🔧 Gemini API call failed in thread: {str(e)}")
@@ -178,7 +207,7 @@ def transcribe_audio(audio_file, service="gemini") -> str:
             return transcribe_audio_mock(audio_file)
 
     elif service == "google":
-        return transcribe_audio_google(audio_file)
+        return transcribe_audio_google(audio_file, audio)
     else:
         # Direct fallback to mock for any other cases
         print("Using mock transcription for testing")
@@ -2,7 +2,7 @@
 Mock evaluation function for testing without Gemini API key
 """
 
-def mock_evaluate_candidate_answer(question: str, answer: str, resume_content: bytes) -> dict:
+def mock_evaluate_candidate_answer(question: str, answer: str, resume_text: str) -> dict:
     """
     Mock evaluation function that returns a sample evaluation.
     Use this for testing when Gemini API key is not configured.
@@ -93,7 +93,7 @@ if __name__ == "__main__":
     
     test_question = "What is the difference between REST and GraphQL?"
     test_answer = "REST uses HTTP methods and multiple endpoints, while GraphQL uses a single endpoint with flexible queries. GraphQL allows clients to request specific data, reducing over-fetching."
-    test_resume = b"Mock resume content"
+    test_resume = "Mock resume content"
     
     result = mock_evaluate_candidate_answer(test_question, test_answer, test_resume)
     
@@ -1,7 +1,51 @@
-from mongoengine import Document, StringField, EmailField, ReferenceField, DateTimeField, BooleanField, BinaryField, DictField, ListField
+from mongoengine import Document, StringField, EmailField, ReferenceField, DateTimeField, BooleanField, BinaryField, DictField, ListField, IntField, FloatField, ObjectIdField
 import uuid
 from datetime import datetime
 from django.contrib.auth.models import User
+from .cache import invalidate_candidate
+
+def parse_score(value):
+    """Numeric value of a stored evaluation score string, or None"""
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+# Summary fields computed server-side from the fields they summarize, so no resume or audio bytes
+# leave MongoDB; applied by backfill_candidate_summaries and to documents that predate the fields
+SUMMARY_FIELDS_PIPELINE = [
+    {'$set': {
+        'has_resume': {
+            '$or': [
+                {'$ne': [{'$ifNull': ['$resume_file_id', None]}, None]},
+                {'$ne': [{'$ifNull': ['$resume_data', None]}, None]},
+            ]
+        },
+        'has_questions': {
+            '$gt': [{'$size': {'$objectToArray': {'$ifNull': ['$interview_questions', {}]}}}, 0]
+        },
+        'audio_responses_count': {'$size': {'$ifNull': ['$audio_responses', []]}},
+        'evaluation_score_value': {
+            '$convert': {'input': '$evaluation_score', 'to': 'double', 'onError': None, 'onNull': None}
+        },
+    }}
+]
+MISSING_SUMMARIES = {'$or': [{'has_resume': {'$exists': False}}, {'audio_responses_count': {'$exists': False}}]}
+
+_summaries_checked = set()  # recruiters whose older documents this process has already backfilled
+
+# Full-text search over metadata, transcripts and evaluation feedback (see candidates/search.py).
+# created_by_id is an equality prefix, so a search only walks one recruiter's postings. Feedback
+# lives under results[].evaluation on manual evaluations and evaluation_results[] on automatic ones.
+TEXT_INDEX_NAME = 'candidate_text'
+TEXT_INDEX_WEIGHTS = {
+    'email': 10,
+    'company': 5,
+    'role': 5,
+    'audio_responses.transcription': 2,
+    'evaluation_data.results.evaluation.feedback': 1,
+    'evaluation_data.evaluation_results.feedback': 1,
+}
 
 class Candidate(Document):
     candidate_id = StringField(max_length=100, unique=True, default=lambda: str(uuid.uuid4()))
@@ -11,7 +55,9 @@ class Candidate(Document):
     updated_at = DateTimeField(default=datetime.utcnow)
     is_active = BooleanField(default=True)
     resume_filename = StringField(max_length=255)  # Store original filename
-    resume_data = BinaryField()  # Store PDF binary data
+    resume_file_id = ObjectIdField()  # Resume PDF in the 'resumes' GridFS bucket (see gridfs_models.py)
+    resume_sha256 = StringField(max_length=64)  # Content hash; key of the shared ResumeBlob and derived data
+    resume_data = BinaryField()  # Legacy inline PDF bytes; moved to GridFS by migrate_resumes_to_gridfs
     resume_content_type = StringField(max_length=100, default='application/pdf')  # MIME type
     resume_size = StringField(max_length=20)  # File size in bytes
     resume_url = StringField(max_length=500)  # For backward compatibility with old records
@@ -23,13 +69,20 @@ class Candidate(Document):
     interview_questions = DictField()  # Store generated questions
     
     # Audio responses
-    audio_responses = ListField(DictField())  # Store audio responses with metadata
+    audio_responses = ListField(DictField())  # Question, transcription, duration and audio_file_id (recording in GridFS, see audio_store.py)
+    
+    # Summary fields kept in sync by save() so list views never load the blobs above
+    has_resume = BooleanField(default=False)
+    has_questions = BooleanField(default=False)
+    audio_responses_count = IntField(default=0)
     
     # Evaluation results
     evaluation_score = StringField(max_length=10)  # Overall score (e.g., "8.5")
+    evaluation_score_value = FloatField()  # Same score as a number, kept in sync by save() for range queries and sorting
     evaluation_rating = StringField(max_length=50)  # Overall rating (e.g., "Excellent", "Good")
     
-    # Note: Uniqueness is handled at application level in views.py
+    # Note: Uniqueness is enforced by the (email, created_by_id) unique index that
+    # `python manage.py update_candidate_indexes` creates (see meta below)
     # Different recruiters can invite the same candidate
     # Same recruiter cannot invite same candidate twice
     evaluation_data = DictField()  # Store complete evaluation results
@@ -43,13 +96,39 @@ class Candidate(Document):
     interview_terminated = BooleanField(default=False)  # Track if interview was terminated due to violations
     termination_reason = StringField(max_length=255)  # Reason for termination
     
+    # Fields the recruiter list needs; everything else (resume bytes, audio, evaluations) stays on the server
+    LIST_FIELDS = (
+        'id', 'candidate_id', 'email', 'created_by_id', 'created_at', 'updated_at', 'is_active',
+        'resume_filename', 'resume_content_type', 'resume_size', 'resume_sha256', 'has_resume', 'has_questions',
+        'company', 'role', 'hr_prompt', 'evaluation_score', 'evaluation_score_value', 'evaluation_rating',
+        'audio_responses_count',
+    )
+    
     meta = {
         'collection': 'candidates',
         'ordering': ['-created_at'],
         'indexes': [
             'email',
             'candidate_id',
-            'created_by_id'
+            'created_by_id',
+            # The unique (email, created_by_id) index is not declared here: creating it fails on a database
+            # that already holds duplicates, and mongoengine would then fail every Candidate query.
+            # `python manage.py update_candidate_indexes` creates it and reports any duplicates.
+            # Keyset pagination of a recruiter's list (see candidates/pagination.py)
+            {'fields': ['created_by_id', '-created_at', 'id'], 'name': 'created_by_created_at_id'},
+            # Delta sync and list ETags (see candidates/sync.py)
+            {'fields': ['created_by_id', 'updated_at'], 'name': 'created_by_updated_at'},
+            # Change feed polling fallback on standalone servers (see candidates/change_feed.py)
+            'updated_at',
+            # Resume blob reference counting (see gridfs_models.py)
+            {'fields': ['resume_sha256'], 'sparse': True},
+            # Server-side list filters and score sorting (see candidates/filters.py)
+            {'fields': ['created_by_id', '-evaluation_score_value', 'id'], 'name': 'created_by_score_id'},
+            {'fields': ['created_by_id', 'role', '-created_at'], 'name': 'created_by_role_created_at'},
+            {'fields': ['created_by_id', 'company', '-created_at'], 'name': 'created_by_company_created_at'},
+            {'fields': ['created_by_id', 'email'], 'name': 'created_by_email'},
+            # The text index is not declared here either: a collection holds one text index, so a
+            # changed definition can't be created next to the old one. See ensure_text_index().
         ]
     }
     
@@ -60,7 +139,50 @@ class Candidate(Document):
         self.updated_at = datetime.utcnow()
         if not self.candidate_id:
             self.candidate_id = str(uuid.uuid4())
-        return super().save(*args, **kwargs)
+        self.refresh_summary_fields()
+        result = super().save(*args, **kwargs)
+        invalidate_candidate(self.candidate_id, self.created_by_id)
+        return result
+    
+    def delete(self, *args, **kwargs):
+        # Delta sync clients only see deletions through tombstones (see candidates/sync.py). Written
+        # first so the change feed can always resolve the delete event's _id to a recruiter
+        CandidateTombstone._get_collection().update_one(
+            {'_id': self.candidate_id},
+            {'$set': {'created_by_id': self.created_by_id, 'document_id': self.id, 'deleted_at': datetime.utcnow()}},
+            upsert=True,
+        )
+        result = super().delete(*args, **kwargs)
+        invalidate_candidate(self.candidate_id, self.created_by_id)
+        if self.resume_sha256:
+            from .gridfs_models import release_blob
+            release_blob(self.resume_sha256)
+        if self.audio_responses:
+            from .audio_store import delete_audio, get_audio_helper
+            helper = get_audio_helper()
+            for response in self.audio_responses:
+                delete_audio(response, helper)
+        return result
+    
+    def refresh_summary_fields(self):
+        """Recompute the summary fields (has_resume, has_questions, audio_responses_count,
+        evaluation_score_value) from the fields they summarize.
+        
+        For existing documents only the summaries whose source field changed are touched, so a
+        document loaded with a projection never overwrites a summary from a field it didn't load.
+        """
+        changed = None
+        if self.pk:
+            changed = {field.split('.')[0] for field in self._get_changed_fields()}
+        
+        if changed is None or 'resume_data' in changed or 'resume_file_id' in changed:
+            self.has_resume = bool(self.resume_file_id or self.resume_data)
+        if changed is None or 'interview_questions' in changed:
+            self.has_questions = bool(self.interview_questions)
+        if changed is None or 'audio_responses' in changed:
+            self.audio_responses_count = len(self.audio_responses) if self.audio_responses else 0
+        if changed is None or 'evaluation_score' in changed:
+            self.evaluation_score_value = parse_score(self.evaluation_score)
     
     @classmethod
     def get_by_email(cls, email):
@@ -76,10 +198,111 @@ class Candidate(Document):
         except cls.DoesNotExist:
             return None
     
-    @property
-    def has_resume(self):
-        return bool(self.resume_data)
+    @classmethod
+    def backfill_summaries(cls, query=None):
+        """Recompute the summary fields server-side for the documents matching query"""
+        return cls._get_collection().update_many(query or {}, SUMMARY_FIELDS_PIPELINE)
+    
+    @classmethod
+    def ensure_summaries(cls, user_id):
+        """Backfill a recruiter's documents written before the summary fields existed (once per process),
+        so the projected list never shows them without a resume or answers"""
+        if user_id in _summaries_checked:
+            return
+        cls.backfill_summaries({'created_by_id': user_id, **MISSING_SUMMARIES})
+        _summaries_checked.add(user_id)
+    
+    @classmethod
+    def ensure_text_index(cls):
+        """Create the full-text search index, replacing a text index with other keys or weights.
+        
+        Returns:
+            bool: True if the index was (re)created
+        """
+        collection = cls._get_collection()
+        for index in collection.list_indexes():
+            if 'textIndexVersion' not in index:
+                continue
+            if index['name'] == TEXT_INDEX_NAME and dict(index.get('weights', {})) == TEXT_INDEX_WEIGHTS:
+                return False
+            collection.drop_index(index['name'])
+        collection.create_index(
+            [('created_by_id', 1)] + [(field, 'text') for field in TEXT_INDEX_WEIGHTS],
+            name=TEXT_INDEX_NAME,
+            weights=TEXT_INDEX_WEIGHTS,
+            default_language='english',
+        )
+        return True
+    
+    @classmethod
+    def row_has_resume(cls, row):
+        """has_resume of a raw document, worked out from the resume fields if it predates the flag"""
+        if row.get('has_resume') is not None:
+            return bool(row['has_resume'])
+        if row.get('resume_file_id'):
+            return True
+        return bool(cls._get_collection().count_documents(
+            {'_id': row['_id'], 'resume_data': {'$exists': True, '$ne': None}}, limit=1
+        ))
     
-    @property
-    def has_questions(self):
-        return bool(self.interview_questions)
+    @classmethod
+    def row_answer_count(cls, row):
+        """audio_responses_count of a raw document, counted from audio_responses if it predates the field"""
+        if row.get('audio_responses_count') is not None:
+            return row['audio_responses_count']
+        counted = next(cls._get_collection().aggregate([
+            {'$match': {'_id': row['_id']}},
+            {'$project': {'count': {'$size': {'$ifNull': ['$audio_responses', []]}}}},
+        ]), None)
+        return counted['count'] if counted else 0
+    
+    @classmethod
+    def list_for_recruiter(cls, user_id):
+        """Candidates created by a recruiter, projected down to LIST_FIELDS, as raw dicts
+        (see serialize_candidate_row) so read-only lists skip building Documents"""
+        cls.ensure_summaries(user_id)
+        return cls.objects.filter(created_by_id=user_id).only(*cls.LIST_FIELDS).as_pymongo()
+    
+    @classmethod
+    def get_active_row(cls, candidate_id, *fields):
+        """Raw dict of an active candidate with LIST_FIELDS plus any extra fields, or None"""
+        return (
+            cls.objects.filter(candidate_id=candidate_id, is_active=True)
+            .only(*cls.LIST_FIELDS, *fields)
+            .as_pymongo()
+            .first()
+        )
+    
+    @classmethod
+    def list_version(cls, user_id):
+        """(count, newest updated_at) of a recruiter's candidates, answered from indexes"""
+        collection = cls._get_collection()
+        count = collection.count_documents({'created_by_id': user_id})
+        latest = collection.find_one(
+            {'created_by_id': user_id},
+            {'updated_at': 1},
+            sort=[('updated_at', -1)]
+        )
+        return count, latest.get('updated_at') if latest else None
+
+
+class CandidateTombstone(Document):
+    """
+    Record of a hard-deleted candidate, so delta sync can tell dashboards to drop it.
+    Expires after TTL_SECONDS; a client whose sync_token is older should reload the full list.
+    """
+    TTL_SECONDS = 30 * 24 * 60 * 60
+    
+    candidate_id = StringField(primary_key=True)
+    created_by_id = StringField(max_length=100, required=True)
+    document_id = ObjectIdField()  # _id of the deleted candidate document, as seen by change streams
+    deleted_at = DateTimeField(default=datetime.utcnow)
+    
+    meta = {
+        'collection': 'candidate_tombstones',
+        'indexes': [
+            {'fields': ['created_by_id', 'deleted_at'], 'name': 'created_by_deleted_at'},
+            {'fields': ['document_id'], 'sparse': True},
+            {'fields': ['deleted_at'], 'expireAfterSeconds': TTL_SECONDS},
+        ],
+    }
@@ -0,0 +1,145 @@
+"""
+Keyset (cursor) pagination for the recruiter candidate list.
+
+Pages are walked in (-created_at, _id) order by default, which is served
+directly by the (created_by_id, -created_at, _id) compound index on the
+candidates collection, so fetching page 500 costs the same as fetching page 1.
+Score ordering walks the (created_by_id, -evaluation_score_value, _id) index
+the same way. The _id tie-breaker always runs against the primary direction
+so either direction is a single forward or backward index scan.
+"""
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine.queryset.visitor import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Public sort names -> Candidate fields
+SORT_FIELDS = {
+    'created_at': 'created_at',
+    'date': 'created_at',
+    'score': 'evaluation_score_value',
+}
+DEFAULT_SORT = ('created_at', True)
+
+
+class PaginationError(ValueError):
+    """Raised for a malformed cursor, page size or sort"""
+
+
+def parse_sort(value):
+    """
+    Parse a ?sort= value such as 'score', '-score', 'date' or '-created_at'.
+
+    Returns:
+        tuple: (Candidate field name, descending)
+    """
+    if not value:
+        return DEFAULT_SORT
+    descending = value.startswith('-')
+    field = SORT_FIELDS.get(value.lstrip('-'))
+    if field is None:
+        raise PaginationError(f'Invalid sort: {value}. Use one of: {", ".join(SORT_FIELDS)}')
+    return field, descending
+
+
+def order_by(queryset, sort=DEFAULT_SORT):
+    """Apply the keyset ordering for a sort to a queryset"""
+    field, descending = sort
+    if descending:
+        return queryset.order_by(f'-{field}', 'id')
+    return queryset.order_by(field, '-id')
+
+
+def encode_cursor(candidate, sort=DEFAULT_SORT):
+    """
+    Build an opaque cursor pointing just after the given candidate.
+
+    Args:
+        candidate: Raw candidate dict (only the sort field and _id are read)
+        sort: (field, descending) the page was ordered by
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    field, _ = sort
+    value = candidate.get(field)
+    payload = {
+        'f': field,
+        'v': value.isoformat() if isinstance(value, datetime) else value,
+        'id': str(candidate['_id']),
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort=DEFAULT_SORT):
+    """
+    Decode a cursor produced by encode_cursor for the same sort.
+
+    Returns:
+        tuple: (sort field value, ObjectId)
+    """
+    field, _ = sort
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if payload['f'] != field:
+            raise ValueError('cursor was issued for a different sort')
+        value = payload['v']
+        if field == 'created_at':
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, (int, float)):
+            raise ValueError('non-numeric score')
+        return value, ObjectId(payload['id'])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise PaginationError(f'Invalid cursor: {cursor}') from e
+
+
+def parse_page_size(value):
+    """Clamp the requested page size to [1, MAX_PAGE_SIZE]"""
+    if value in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        return max(1, min(MAX_PAGE_SIZE, int(value)))
+    except (TypeError, ValueError):
+        raise PaginationError(f'Invalid limit: {value}')
+
+
+def paginate(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE, sort=DEFAULT_SORT):
+    """
+    Return one page of a candidate queryset in keyset order.
+
+    Args:
+        queryset: Raw (as_pymongo) Candidate queryset already filtered by created_by_id
+        cursor: Cursor from a previous page, or None for the first page
+        limit: Page size
+        sort: (field, descending) from parse_sort
+
+    Returns:
+        tuple: (list of candidate dicts, next cursor or None when this is the last page)
+    """
+    field, descending = sort
+    if field != 'created_at':
+        # Unscored candidates have no position in a score ordering
+        queryset = queryset.filter(**{f'{field}__ne': None})
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        past = 'lt' if descending else 'gt'
+        tie = 'gt' if descending else 'lt'
+        queryset = queryset.filter(
+            Q(**{f'{field}__{past}': value}) | Q(**{field: value, f'id__{tie}': last_id})
+        )
+
+    # Fetch one extra row to find out whether another page exists
+    rows = list(order_by(queryset, sort).limit(limit + 1))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1], sort)
+    return rows, None
@@ -0,0 +1,268 @@
+"""
+Sandboxed PDF text extraction (and first-page rendering) in a bounded process pool.
+
+PyMuPDF runs in separate worker processes (spawned, so they share nothing with
+the web process) instead of the calling thread:
+
+- each worker is capped at PDF_MEMORY_MB of address space, and each task at
+  PDF_CPU_SECONDS of CPU time; the kernel kills a worker that goes over
+- at most PDF_MAX_PAGES pages are extracted; longer documents are truncated
+- documents longer than PDF_PAGES_PER_TASK pages are split into page ranges
+  extracted in parallel across the workers
+- at most PDF_MAX_IN_FLIGHT documents are queued at once, and every task has a
+  wall-clock deadline of PDF_TIMEOUT_SECONDS, counted by the worker from when it
+  starts the task (time spent queued behind other documents doesn't count)
+
+A task past its deadline fails inside its worker, which then moves on to the
+next task, so a slow document never takes other documents down with it. Every
+failure (a killed worker, a timeout, a corrupt or encrypted PDF, a full queue)
+surfaces as PdfExtractionError, so callers have one thing to handle and a bad
+upload never ties up a web worker. A worker killed by its CPU or memory limit
+breaks the pool; it is rebuilt and the document retried once, so other
+documents that were in flight at the time are not lost with it.
+
+This module must stay free of Django imports: worker processes import it on spawn.
+"""
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+PDF_WORKERS = _env_int('PDF_WORKERS', 2)
+PDF_CPU_SECONDS = _env_int('PDF_CPU_SECONDS', 10)
+PDF_MEMORY_MB = _env_int('PDF_MEMORY_MB', 1024)
+PDF_MAX_PAGES = _env_int('PDF_MAX_PAGES', 100)
+PDF_PAGES_PER_TASK = _env_int('PDF_PAGES_PER_TASK', 25)
+PDF_TIMEOUT_SECONDS = _env_int('PDF_TIMEOUT_SECONDS', 30)
+PDF_MAX_IN_FLIGHT = _env_int('PDF_MAX_IN_FLIGHT', PDF_WORKERS * 4)
+# How long a caller waits for its tasks, queueing included; only reached when the pool is backed up,
+# since every task ends PDF_TIMEOUT_SECONDS after a worker picks it up
+PDF_WAIT_SECONDS = _env_int('PDF_WAIT_SECONDS', PDF_TIMEOUT_SECONDS * (PDF_MAX_IN_FLIGHT // PDF_WORKERS + 1))
+
+
+class PdfExtractionError(Exception):
+    """The PDF could not be parsed within the sandbox limits"""
+
+
+class PdfParserBusy(PdfExtractionError):
+    """Too many documents queued; unlike other failures this says nothing about the PDF"""
+
+
+# --- worker side -------------------------------------------------------------
+
+def _init_worker(memory_mb):
+    try:
+        import resource
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        pass  # not available on this platform; CPU limit and deadline still apply
+
+
+def _limit_cpu(cpu_seconds):
+    # RLIMIT_CPU counts the worker's whole lifetime, so the budget is relative to what it
+    # has used so far. Going over sends SIGXCPU, whose default action terminates the worker.
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = usage.ru_utime + usage.ru_stime
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = int(used) + cpu_seconds + 1
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+class _TaskTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _TaskTimeout()
+
+
+@contextmanager
+def _deadline(seconds):
+    """Raise _TaskTimeout in the worker once the task has run for `seconds` of wall-clock time"""
+    if not hasattr(signal, 'setitimer'):
+        yield  # no SIGALRM on this platform; the CPU limit still applies
+        return
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_pages(pdf_bytes, first, last, cpu_seconds, timeout_seconds):
+    """Runs in a worker: (total page count, [text of pages first..last-1])"""
+    _limit_cpu(cpu_seconds)
+    try:
+        import fitz
+        with _deadline(timeout_seconds), fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+            if doc.needs_pass:
+                raise ValueError('PDF is password protected')
+            page_count = doc.page_count
+            return page_count, [doc.load_page(i).get_text('text') for i in range(first, min(last, page_count))]
+    except _TaskTimeout:
+        raise ValueError(f'PDF parsing took longer than {timeout_seconds}s') from None
+    except Exception as e:
+        # Re-raise as a plain exception so it pickles back regardless of fitz's exception types
+        raise ValueError(f'Could not parse PDF: {e}') from None
+
+
+def _render_first_page(pdf_bytes, width, cpu_seconds, timeout_seconds):
+    """Runs in a worker: (image bytes, content type, width, height) of page 1 scaled to `width` pixels"""
+    _limit_cpu(cpu_seconds)
+    try:
+        import fitz
+        with _deadline(timeout_seconds), fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+            if doc.needs_pass:
+                raise ValueError('PDF is password protected')
+            if doc.page_count == 0:
+                raise ValueError('PDF has no pages')
+            page = doc.load_page(0)
+            zoom = width / page.rect.width
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    except _TaskTimeout:
+        raise ValueError(f'PDF rendering took longer than {timeout_seconds}s') from None
+    except Exception as e:
+        raise ValueError(f'Could not render PDF: {e}') from None
+
+    # WebP is a fraction of the PNG size for rendered text; PyMuPDF can only write PNG itself
+    try:
+        import io
+        from PIL import Image
+        buffer = io.BytesIO()
+        Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples).save(buffer, 'WEBP', quality=80)
+        return buffer.getvalue(), 'image/webp', pixmap.width, pixmap.height
+    except Exception:
+        return pixmap.tobytes('png'), 'image/png', pixmap.width, pixmap.height
+
+
+# --- caller side -------------------------------------------------------------
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_in_flight = threading.BoundedSemaphore(PDF_MAX_IN_FLIGHT)
+
+
+def _get_executor():
+    """The per-process pool, created on first use (and again after a fork or a crash)"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(PDF_MEMORY_MB,),
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _discard_executor(executor):
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run(function, arguments):
+    """Run function(*args) for each args in the pool, retrying once on a fresh pool if a worker was killed"""
+    for attempt in range(2):
+        executor = _get_executor()
+        futures = []
+        try:
+            futures = [executor.submit(function, *args, PDF_CPU_SECONDS, PDF_TIMEOUT_SECONDS) for args in arguments]
+            wait_until = time.monotonic() + PDF_WAIT_SECONDS
+            return [future.result(timeout=max(0.1, wait_until - time.monotonic())) for future in futures]
+        except BrokenProcessPool:
+            _discard_executor(executor)
+            if attempt == 1:
+                raise PdfExtractionError('PDF parsing exceeded its CPU or memory limit')
+        except FutureTimeoutError:
+            # Workers time out running tasks themselves, so this only means the queue is backed up:
+            # withdraw the tasks that haven't started and leave the workers alone
+            for future in futures:
+                future.cancel()
+            raise PdfParserBusy('PDF parser is busy, try again shortly')
+        except ValueError as e:
+            raise PdfExtractionError(str(e))
+
+
+def extract_pages(pdf_bytes):
+    """
+    Extract the text of each page of a PDF in the sandboxed pool.
+
+    Args:
+        pdf_bytes (bytes): PDF content
+
+    Returns:
+        tuple: (list of page texts, total page count in the document); at most
+            PDF_MAX_PAGES pages are extracted
+
+    Raises:
+        PdfExtractionError: The PDF is unreadable, too expensive to parse, or the pool is saturated
+    """
+    with _slot():
+        # The first range also tells us the page count, so short resumes take a single task
+        first = min(PDF_PAGES_PER_TASK, PDF_MAX_PAGES)
+        [(page_count, pages)] = _run(_extract_pages, [(pdf_bytes, 0, first)])
+        wanted = min(page_count, PDF_MAX_PAGES)
+        if wanted > len(pages):
+            ranges = [
+                (pdf_bytes, start, min(start + PDF_PAGES_PER_TASK, wanted))
+                for start in range(len(pages), wanted, PDF_PAGES_PER_TASK)
+            ]
+            for _, more in _run(_extract_pages, ranges):
+                pages.extend(more)
+        return pages, page_count
+
+
+def render_first_page(pdf_bytes, width):
+    """
+    Render the first page of a PDF as a WebP image (PNG without Pillow) in the sandboxed pool.
+
+    Args:
+        pdf_bytes (bytes): PDF content
+        width (int): Output width in pixels (height keeps the page's aspect ratio)
+
+    Returns:
+        tuple: (image bytes, content type, width, height)
+
+    Raises:
+        PdfExtractionError: The PDF is unreadable, too expensive to render, or the pool is saturated
+    """
+    with _slot():
+        [rendered] = _run(_render_first_page, [(pdf_bytes, width)])
+        return rendered
+
+
+@contextmanager
+def _slot():
+    if not _in_flight.acquire(timeout=PDF_TIMEOUT_SECONDS):
+        raise PdfParserBusy('PDF parser is busy, try again shortly')
+    try:
+        yield
+    finally:
+        _in_flight.release()
@@ -0,0 +1,225 @@
+"""
+Background resume preprocessing: parse, chunk and embed at upload time.
+
+An upload enqueues the resume's hash; a per-process worker thread extracts the
+text (resume_text.py), renders a first-page thumbnail (thumbnails.py), splits
+the text into chunks and embeds them, storing chunks and float16 vectors in
+'resume_chunks' keyed by the resume SHA-256. Identical PDFs are processed once.
+Question generation then only loads the stored vectors and runs retrieval, so
+pressing start never waits on PDF parsing or chunk embedding.
+
+If question generation gets to a resume before the worker has (the process
+restarted with work queued, or the resume predates the pipeline) the same steps
+run inline once and are stored.
+"""
+import queue
+import threading
+from datetime import datetime
+
+from mongoengine import Document, StringField, IntField, ListField, BinaryField, DateTimeField
+
+from .resume_text import ResumeText, store_resume_text, get_resume_text, EXTRACTOR_VERSION
+from .thumbnails import ResumeThumbnail, store_thumbnail
+
+
+class ResumeChunks(Document):
+    """
+    Chunks of one resume's text and their embeddings, keyed by the SHA-256 of the PDF.
+    embeddings holds len(chunks) x dim float16 values, row-major, each row unit-length.
+    """
+    sha256 = StringField(primary_key=True)
+    chunks = ListField(StringField())
+    embeddings = BinaryField()
+    dim = IntField()
+    model = StringField(max_length=100)
+    created_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'resume_chunks',
+    }
+
+
+def build_resume_chunks(sha256, text, store=True):
+    """
+    Chunk and embed resume text and store the result.
+
+    Args:
+        sha256 (str): Resume hash
+        text (str): Extracted resume text
+        store (bool): False to only compute the row (resumes without a blob to own it)
+
+    Returns:
+        dict: The resume_chunks row
+    """
+    from .ml_models.questions import split_resume_text, embed_texts, EMBEDDING_MODEL_NAME
+
+    chunks = split_resume_text(text)
+    embeddings = embed_texts(chunks) if chunks else None
+    row = {
+        'chunks': chunks,
+        'embeddings': embeddings.tobytes() if embeddings is not None else b'',
+        'dim': int(embeddings.shape[1]) if embeddings is not None else 0,
+        'model': EMBEDDING_MODEL_NAME,
+        'created_at': datetime.utcnow(),
+    }
+    if store:
+        ResumeChunks._get_collection().update_one({'_id': sha256}, {'$set': row}, upsert=True)
+    return dict(row, _id=sha256)
+
+
+def _load_chunks(sha256):
+    from .ml_models.questions import EMBEDDING_MODEL_NAME
+
+    return ResumeChunks._get_collection().find_one({'_id': sha256, 'model': EMBEDDING_MODEL_NAME})
+
+
+def _read_blob(sha256, file_id=None):
+    """Raw PDF bytes of a stored blob, or None if it is gone"""
+    from .gridfs_models import GridFSHelper, ResumeBlob
+
+    if file_id is None:
+        blob = ResumeBlob._get_collection().find_one({'_id': sha256}, {'file_id': 1})
+        if not blob:
+            return None
+        file_id = blob['file_id']
+    helper = GridFSHelper()
+    gridfs_file = helper.get_file(file_id)
+    return helper.read_file(gridfs_file) if gridfs_file else None
+
+
+def process_resume(sha256, file_id=None):
+    """
+    Run every preprocessing step a stored resume is missing (text and thumbnail, then
+    chunks and embeddings). The PDF is read from GridFS at most once.
+
+    Args:
+        sha256 (str): Resume hash
+        file_id: GridFS file ID of the blob, if known
+    """
+    text_row = ResumeText._get_collection().find_one(
+        {'_id': sha256, 'extractor_version': EXTRACTOR_VERSION}, {'text': 1}
+    )
+    has_thumbnail = ResumeThumbnail._get_collection().count_documents({'_id': sha256}, limit=1)
+
+    if text_row is None or not has_thumbnail:
+        pdf_bytes = _read_blob(sha256, file_id)
+        if pdf_bytes is None:
+            return
+        if text_row is None:
+            text_row = store_resume_text(sha256, pdf_bytes)
+        if not has_thumbnail:
+            store_thumbnail(sha256, pdf_bytes)
+
+    if not _load_chunks(sha256):
+        build_resume_chunks(sha256, text_row.get('text') or '')
+
+
+def get_resume_retriever(candidate_id):
+    """
+    Build a retriever over a candidate's precomputed resume chunks.
+
+    Args:
+        candidate_id (str): Candidate ID
+
+    Returns:
+        ResumeRetriever: or None if the candidate has no resume
+    """
+    import numpy as np
+    from .ml_models.questions import ResumeRetriever
+
+    text_row = get_resume_text(candidate_id)
+    if not text_row:
+        return None
+
+    sha256 = text_row['_id']
+    if sha256 is None:
+        # No blob owns this resume yet (see get_resume_text), so nothing would clean up stored chunks
+        row = build_resume_chunks(None, text_row.get('text') or '', store=False)
+    else:
+        row = _load_chunks(sha256)
+        if row is None:
+            print(f"Resume {sha256[:12]} not preprocessed yet, embedding inline")
+            row = build_resume_chunks(sha256, text_row.get('text') or '')
+
+    dim = row.get('dim') or 0
+    embeddings = np.frombuffer(row.get('embeddings') or b'', dtype=np.float16)
+    return ResumeRetriever(row.get('chunks') or [], embeddings.reshape(-1, dim) if dim else embeddings)
+
+
+def delete_resume_chunks(sha256):
+    """Drop the chunks and embeddings for a blob that no longer exists"""
+    if sha256:
+        ResumeChunks._get_collection().delete_one({'_id': sha256})
+
+
+class ResumePipeline:
+    """Background worker that preprocesses uploaded resumes one at a time"""
+
+    IDLE_TIMEOUT = 30  # seconds the worker waits for more work before exiting
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._queued = set()
+        self._thread = None
+        self.processed = 0
+        self.failed = 0
+
+    def enqueue(self, sha256, file_id=None):
+        """Queue a resume for preprocessing and make sure the worker thread is running"""
+        with self._lock:
+            if sha256 in self._queued:
+                return
+            self._queued.add(sha256)
+            self._queue.put((sha256, file_id))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='resume-pipeline', daemon=True)
+                self._thread.start()
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            try:
+                sha256, file_id = self._queue.get(timeout=self.IDLE_TIMEOUT)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+
+            try:
+                process_resume(sha256, file_id)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Resume preprocessing failed for {sha256[:12]}: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(sha256)
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_resume_pipeline():
+    """Lazily created per-process pipeline (created after fork, so each worker has its own thread)"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ResumePipeline()
+        return _pipeline
+
+
+def enqueue_resume(sha256, file_id=None):
+    """Preprocess a newly stored resume in the background"""
+    get_resume_pipeline().enqueue(sha256, file_id)
+
+
+def get_pipeline_stats():
+    pipeline = get_resume_pipeline()
+    return {'processed': pipeline.processed, 'failed': pipeline.failed, 'pending': pipeline.pending}
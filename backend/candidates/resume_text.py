@@ -0,0 +1,244 @@
+# Extracted resume text
+# A resume PDF is parsed once, when it is uploaded, and the result (plain text, page
+# count, page and section boundaries) is stored in 'resume_texts' keyed by the PDF's
+# SHA-256 — the same key as its ResumeBlob, so identical resumes share one extraction.
+# Only blob-backed resumes are stored: the row is deleted with its blob (see release_blob).
+# Question generation and answer evaluation read the stored text and never open the PDF.
+# Parsing itself runs in the sandboxed process pool in pdf_worker.py; a PDF that fails
+# there is stored with an error and empty text, so it is not parsed again.
+
+from mongoengine import Document, StringField, IntField, ListField, DictField, DateTimeField, BooleanField
+import hashlib
+import re
+from datetime import datetime
+
+from .pdf_worker import extract_pages, PdfExtractionError, PdfParserBusy
+
+EXTRACTOR_VERSION = 1
+
+# Canonical section name -> headings that introduce it
+SECTION_HEADINGS = {
+    'summary': ('summary', 'profile', 'objective', 'about me', 'professional summary', 'career objective'),
+    'education': ('education', 'academic background', 'academics', 'qualifications'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'internships', 'internship', 'work history'),
+    'projects': ('projects', 'academic projects', 'personal projects', 'key projects'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core competencies', 'technologies'),
+    'certifications': ('certifications', 'certificates', 'courses', 'licenses'),
+    'achievements': ('achievements', 'awards', 'honors', 'accomplishments'),
+    'publications': ('publications', 'research'),
+    'activities': ('activities', 'extracurricular activities', 'leadership', 'volunteering',
+                   'positions of responsibility'),
+    'languages': ('languages',),
+    'interests': ('interests', 'hobbies'),
+}
+_HEADING_LOOKUP = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_CLEAN = re.compile(r'[^a-z ]+')
+
+
+class ResumeText(Document):
+    """
+    Text extracted from one resume PDF, keyed by the SHA-256 of the PDF bytes.
+    page_offsets[i] is the character offset in text where page i starts; each section is
+    {'name', 'title', 'start', 'end'} with character offsets into text.
+    truncated is set when only the first PDF_MAX_PAGES pages were extracted; error when
+    the PDF could not be parsed at all (text is then empty).
+    """
+    sha256 = StringField(primary_key=True)
+    text = StringField(default='')
+    page_count = IntField(default=0)
+    page_offsets = ListField(IntField())
+    sections = ListField(DictField())
+    truncated = BooleanField(default=False)
+    error = StringField()
+    extractor_version = IntField(default=EXTRACTOR_VERSION)
+    extracted_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'resume_texts',
+    }
+
+
+def detect_sections(text):
+    """
+    Find section boundaries from heading lines ("EDUCATION", "Work Experience:", ...).
+
+    Args:
+        text (str): Resume text
+
+    Returns:
+        list: [{'name', 'title', 'start', 'end'}] in document order; text before the first
+            heading, if any, is reported as a 'header' section
+    """
+    starts = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if 0 < len(stripped) <= 40:
+            key = _HEADING_CLEAN.sub('', stripped.lower()).strip()
+            key = re.sub(r'\s+', ' ', key)
+            name = _HEADING_LOOKUP.get(key)
+            if name:
+                starts.append((name, stripped.rstrip(':'), offset))
+        offset += len(line)
+
+    sections = []
+    if starts and starts[0][2] > 0 and text[:starts[0][2]].strip():
+        sections.append({'name': 'header', 'title': '', 'start': 0, 'end': starts[0][2]})
+    for index, (name, title, start) in enumerate(starts):
+        end = starts[index + 1][2] if index + 1 < len(starts) else len(text)
+        sections.append({'name': name, 'title': title, 'start': start, 'end': end})
+    return sections
+
+
+def extract_pdf_text(pdf_bytes):
+    """
+    Parse a PDF with PyMuPDF in the sandboxed worker pool.
+
+    Args:
+        pdf_bytes (bytes): PDF content
+
+    Returns:
+        dict: {'text', 'page_count', 'page_offsets', 'sections', 'truncated'}
+
+    Raises:
+        PdfExtractionError: The PDF could not be parsed within the pool's limits
+    """
+    pages, page_count = extract_pages(pdf_bytes)
+
+    page_offsets = []
+    offset = 0
+    for page_text in pages:
+        page_offsets.append(offset)
+        offset += len(page_text)
+
+    text = ''.join(pages)
+    return {
+        'text': text,
+        'page_count': page_count,
+        'page_offsets': page_offsets,
+        'sections': detect_sections(text),
+        'truncated': len(pages) < page_count,
+    }
+
+
+def _extract_row(sha256, pdf_bytes):
+    """resume_texts row for a PDF; a PDF the parser rejects gets an error and empty text"""
+    try:
+        extracted = extract_pdf_text(pdf_bytes)
+        extracted['error'] = None
+    except PdfParserBusy:
+        raise
+    except PdfExtractionError as e:
+        # Record the failure so an unparseable upload costs one sandboxed attempt, not one per read
+        print(f"Resume {sha256[:12]} could not be parsed: {e}")
+        extracted = {'text': '', 'page_count': 0, 'page_offsets': [], 'sections': [],
+                     'truncated': False, 'error': str(e)}
+    return dict(extracted, extractor_version=EXTRACTOR_VERSION, extracted_at=datetime.utcnow())
+
+
+def store_resume_text(sha256, pdf_bytes):
+    """
+    Extract and persist the text for a resume unless it is already stored.
+
+    Args:
+        sha256 (str): Hex digest of pdf_bytes
+        pdf_bytes (bytes): PDF content
+
+    Returns:
+        dict: The stored resume_texts row
+
+    Raises:
+        PdfParserBusy: The parser pool is saturated; nothing is stored, so a later call retries
+    """
+    collection = ResumeText._get_collection()
+    row = collection.find_one({'_id': sha256, 'extractor_version': EXTRACTOR_VERSION})
+    if row:
+        return row
+
+    row = _extract_row(sha256, pdf_bytes)
+    collection.update_one({'_id': sha256}, {'$set': row}, upsert=True)
+    return dict(row, _id=sha256)
+
+
+def ensure_resume_text(sha256, file_id=None, helper=None):
+    """
+    Make sure the text for a stored blob has been extracted, reading the PDF from GridFS
+    only when it hasn't. Failures are logged, never raised: readers extract lazily instead.
+
+    Args:
+        sha256 (str): Resume hash
+        file_id: GridFS file ID of the blob, if known
+    """
+    from .gridfs_models import GridFSHelper, ResumeBlob
+
+    try:
+        if ResumeText._get_collection().count_documents(
+            {'_id': sha256, 'extractor_version': EXTRACTOR_VERSION}, limit=1
+        ):
+            return
+        if file_id is None:
+            blob = ResumeBlob._get_collection().find_one({'_id': sha256}, {'file_id': 1})
+            if not blob:
+                return
+            file_id = blob['file_id']
+        helper = helper or GridFSHelper()
+        gridfs_file = helper.get_file(file_id)
+        if gridfs_file is None:
+            return
+        store_resume_text(sha256, helper.read_file(gridfs_file))
+    except Exception as e:
+        print(f"Error extracting resume text for {sha256[:12]}: {str(e)}")
+
+
+def delete_resume_text(sha256):
+    """Drop the extracted text for a blob that no longer exists"""
+    if sha256:
+        ResumeText._get_collection().delete_one({'_id': sha256})
+
+
+def get_resume_text(candidate_id):
+    """
+    Get the extracted resume text for a candidate.
+    Resumes uploaded before extraction-at-upload (or whose extraction failed) are
+    extracted here once and stored, so the next call is a single lookup.
+    Resumes without a blob (resume_sha256 unset until migrate_resumes_to_gridfs runs)
+    are extracted on every call and not stored: release_blob would never delete a row
+    keyed by a hash no blob owns.
+
+    Args:
+        candidate_id (str): Candidate ID
+
+    Returns:
+        dict: resume_texts row ('text', 'page_count', 'page_offsets', 'sections'),
+            or None if the candidate has no resume; '_id' is None if it was not stored
+    """
+    from .gridfs_models import get_resume_content
+    from .models import Candidate
+
+    try:
+        row = Candidate.objects.filter(
+            candidate_id=candidate_id,
+            is_active=True
+        ).only('resume_sha256').as_pymongo().first()
+        if not row:
+            return None
+
+        sha256 = row.get('resume_sha256')
+        if sha256:
+            stored = ResumeText._get_collection().find_one(
+                {'_id': sha256, 'extractor_version': EXTRACTOR_VERSION}
+            )
+            if stored:
+                return stored
+
+        content = get_resume_content(candidate_id)
+        if not content:
+            return None
+        if not sha256:
+            return dict(_extract_row(hashlib.sha256(content).hexdigest(), content), _id=None)
+        return store_resume_text(sha256, content)
+
+    except Exception as e:
+        print(f"Error in get_resume_text: {str(e)}")
+        return None
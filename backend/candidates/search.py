@@ -0,0 +1,171 @@
+"""
+Full-text search over a recruiter's candidates.
+
+Backed by the 'candidate_text' index (Candidate.ensure_text_index: created_by_id
+prefix + text keys over email, company, role, audio transcriptions and
+evaluation feedback). Because created_by_id is an equality prefix of the text
+index, MongoDB only walks the recruiter's own postings, so search time tracks
+the size of one recruiter's pool rather than every transcript in the
+collection. Only the top hits' text is read back to build snippets.
+"""
+import html
+import re
+
+from .models import Candidate
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+MAX_QUERY_LENGTH = 200
+SNIPPET_RADIUS = 60  # characters of context on each side of the first match
+MAX_SNIPPETS = 3
+
+# Fields read back for snippets, in the order snippets are preferred
+SNIPPET_FIELDS = ('email', 'company', 'role', 'transcription', 'feedback')
+
+PROJECTION = {
+    'score': {'$meta': 'textScore'},
+    'candidate_id': 1,
+    'email': 1,
+    'company': 1,
+    'role': 1,
+    'created_at': 1,
+    'evaluation_score_value': 1,
+    'interview_completed': 1,
+    'interview_terminated': 1,
+    'audio_responses.question_text': 1,
+    'audio_responses.transcription': 1,
+    'evaluation_data.results.evaluation.feedback': 1,
+    'evaluation_data.evaluation_results.feedback': 1,
+}
+
+_text_index_checked = False  # whether this process has made sure the text index is current
+
+
+class SearchError(ValueError):
+    """Raised for an empty, oversized or malformed search request"""
+
+
+def parse_search_limit(value):
+    """Clamp the requested number of hits to [1, MAX_SEARCH_LIMIT]"""
+    if value in (None, ''):
+        return DEFAULT_SEARCH_LIMIT
+    try:
+        return max(1, min(MAX_SEARCH_LIMIT, int(value)))
+    except (TypeError, ValueError):
+        raise SearchError(f'Invalid limit: {value}')
+
+
+def _terms(query):
+    # Words as MongoDB's tokenizer sees them, minus the '-negated' ones
+    return [
+        word.lower() for word in re.findall(r'-?[\w]+', query)
+        if not word.startswith('-') and len(word) > 1
+    ]
+
+
+def _highlight(text, pattern):
+    """Snippet of text around the first match with every match wrapped in <mark>, or None"""
+    match = pattern.search(text)
+    if not match:
+        return None
+
+    start = max(0, match.start() - SNIPPET_RADIUS)
+    end = min(len(text), match.end() + SNIPPET_RADIUS)
+    window = text[start:end]
+
+    parts, last = [], 0
+    for hit in pattern.finditer(window):
+        parts.append(html.escape(window[last:hit.start()]))
+        parts.append(f'<mark>{html.escape(hit.group(0))}</mark>')
+        last = hit.end()
+    parts.append(html.escape(window[last:]))
+
+    snippet = ''.join(parts).strip()
+    if start > 0:
+        snippet = '…' + snippet
+    if end < len(text):
+        snippet = snippet + '…'
+    return snippet
+
+
+def _texts(doc):
+    """(field, context, text) for every searchable string on a raw candidate document"""
+    for field in ('email', 'company', 'role'):
+        if doc.get(field):
+            yield field, None, doc[field]
+    for response in doc.get('audio_responses') or []:
+        if isinstance(response, dict) and response.get('transcription'):
+            yield 'transcription', response.get('question_text'), response['transcription']
+    evaluation = doc.get('evaluation_data') or {}
+    # Manual evaluations nest each result under 'evaluation'; automatic ones store it directly
+    results = [
+        result.get('evaluation') for result in evaluation.get('results') or [] if isinstance(result, dict)
+    ] + list(evaluation.get('evaluation_results') or [])
+    for result in results:
+        if isinstance(result, dict) and isinstance(result.get('feedback'), str) and result['feedback']:
+            yield 'feedback', None, result['feedback']
+
+
+def _snippets(doc, pattern):
+    snippets = []
+    for field, context, text in _texts(doc):
+        snippet = _highlight(text, pattern)
+        if snippet:
+            entry = {'field': field, 'snippet': snippet}
+            if context:
+                entry['question'] = context
+            snippets.append(entry)
+    snippets.sort(key=lambda entry: SNIPPET_FIELDS.index(entry['field']))
+    return snippets[:MAX_SNIPPETS]
+
+
+def search_candidates(user_id, query, limit=DEFAULT_SEARCH_LIMIT):
+    """
+    Rank a recruiter's candidates against a text query.
+
+    Args:
+        user_id (str): Recruiter user ID (Candidate.created_by_id)
+        query (str): MongoDB $text search string (supports "phrases" and -negation)
+        limit (int): Maximum number of hits
+
+    Returns:
+        list: hits ordered by relevance, each with candidate fields, score and snippets
+    """
+    query = (query or '').strip()
+    if not query:
+        raise SearchError('Search query (q) is required')
+    if len(query) > MAX_QUERY_LENGTH:
+        raise SearchError(f'Search query must be at most {MAX_QUERY_LENGTH} characters')
+
+    global _text_index_checked
+    if not _text_index_checked:
+        Candidate.ensure_text_index()
+        _text_index_checked = True
+
+    terms = _terms(query)
+    # Prefix match so 'python' also highlights 'Python's' and stemmed forms like 'developers'
+    pattern = re.compile(
+        r'\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\w*',
+        re.IGNORECASE,
+    ) if terms else None
+
+    cursor = Candidate._get_collection().find(
+        {'created_by_id': user_id, '$text': {'$search': query}},
+        PROJECTION,
+    ).sort([('score', {'$meta': 'textScore'})]).limit(limit)
+
+    hits = []
+    for doc in cursor:
+        hits.append({
+            'candidate_id': doc.get('candidate_id'),
+            'email': doc.get('email'),
+            'company': doc.get('company'),
+            'role': doc.get('role'),
+            'created_at': doc['created_at'].isoformat() if doc.get('created_at') else None,
+            'evaluation_score': doc.get('evaluation_score_value'),
+            'interview_completed': doc.get('interview_completed', False),
+            'interview_terminated': doc.get('interview_terminated', False),
+            'relevance': round(doc.get('score', 0), 3),
+            'snippets': _snippets(doc, pattern) if pattern else [],
+        })
+    return hits
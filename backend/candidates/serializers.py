@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Candidate
+from .thumbnails import thumbnail_url
 
 class CandidateSerializer(serializers.Serializer):
     id = serializers.CharField(read_only=True)
@@ -13,6 +14,7 @@ class CandidateSerializer(serializers.Serializer):
     resume_content_type = serializers.CharField(read_only=True)
     resume_size = serializers.CharField(read_only=True)
     has_resume = serializers.SerializerMethodField()
+    resume_thumbnail_url = serializers.SerializerMethodField()
     has_questions = serializers.SerializerMethodField()
     company = serializers.CharField(read_only=True)
     role = serializers.CharField(read_only=True)
@@ -28,13 +30,16 @@ class CandidateSerializer(serializers.Serializer):
     
     def get_audio_responses_count(self, obj):
         """Return the number of audio responses"""
-        return len(obj.audio_responses) if obj.audio_responses else 0
+        return obj.audio_responses_count or 0
     
     def get_has_resume(self, obj):
-        return bool(obj.resume_data)
+        return bool(obj.has_resume)
+    
+    def get_resume_thumbnail_url(self, obj):
+        return thumbnail_url(obj.resume_sha256)
     
     def get_has_questions(self, obj):
-        return bool(obj.interview_questions)
+        return bool(obj.has_questions)
 
     def create(self, validated_data):
         # Add the user ID from request context
@@ -63,26 +68,79 @@ class CandidateSerializer(serializers.Serializer):
             'resume_filename': instance.resume_filename,
             'resume_content_type': instance.resume_content_type,
             'resume_size': instance.resume_size,
-            'has_resume': bool(instance.resume_data),
-            'has_questions': bool(instance.interview_questions),
+            'has_resume': bool(instance.has_resume),
+            'resume_thumbnail_url': thumbnail_url(instance.resume_sha256),
+            'has_questions': bool(instance.has_questions),
             'company': instance.company,
             'role': instance.role,
             'hr_prompt': instance.hr_prompt,
             'evaluation_score': instance.evaluation_score,
             'evaluation_rating': instance.evaluation_rating,
             'interview_score': self._get_interview_score_value(instance),
-            'audio_responses_count': len(instance.audio_responses) if instance.audio_responses else 0,
+            'audio_responses_count': instance.audio_responses_count or 0,
         }
     
     def _get_interview_score_value(self, instance):
         """Helper method to safely convert evaluation_score to interview_score"""
-        if instance.evaluation_score:
-            try:
-                score = float(instance.evaluation_score)
-                return min(100, max(0, score * 10))  # Convert to 100-point scale, clamped to 0-100
-            except (ValueError, TypeError):
-                return None
-        return None
+        return interview_score(instance.evaluation_score)
+
+def interview_score(evaluation_score):
+    """0-10 evaluation_score string as a 0-100 interview_score, or None"""
+    if evaluation_score:
+        try:
+            score = float(evaluation_score)
+            return min(100, max(0, score * 10))  # Convert to 100-point scale, clamped to 0-100
+        except (ValueError, TypeError):
+            return None
+    return None
+
+def serialize_candidate_row(doc):
+    """
+    Wire representation of a raw candidate dict, e.g. from Candidate.objects.as_pymongo().
+    
+    Produces exactly what CandidateSerializer(candidate).data does, without building a
+    mongoengine Document first. Missing keys fall back to the model defaults.
+    
+    Args:
+        doc (dict): Raw MongoDB document projected to at least Candidate.LIST_FIELDS
+    
+    Returns:
+        dict: Serialized candidate
+    """
+    get = doc.get
+    return {
+        'id': str(doc['_id']),
+        'candidate_id': get('candidate_id'),
+        'email': get('email'),
+        'created_by_id': get('created_by_id'),
+        'created_at': get('created_at'),
+        'updated_at': get('updated_at'),
+        'is_active': get('is_active', True),
+        'resume_filename': get('resume_filename'),
+        'resume_content_type': get('resume_content_type', 'application/pdf'),
+        'resume_size': get('resume_size'),
+        'has_resume': bool(get('has_resume')),
+        'resume_thumbnail_url': thumbnail_url(get('resume_sha256')),
+        'has_questions': bool(get('has_questions')),
+        'company': get('company'),
+        'role': get('role'),
+        'hr_prompt': get('hr_prompt'),
+        'evaluation_score': get('evaluation_score'),
+        'evaluation_rating': get('evaluation_rating'),
+        'interview_score': interview_score(get('evaluation_score')),
+        'audio_responses_count': get('audio_responses_count') or 0,
+    }
+
+def candidate_summary(doc):
+    """Wire representation plus the interview state flags access checks need (cacheable).
+    Takes a raw candidate dict from Candidate.get_active_row()."""
+    return {
+        'is_active': doc.get('is_active', True),
+        'interview_terminated': doc.get('interview_terminated', False),
+        'termination_reason': doc.get('termination_reason'),
+        'interview_completed': doc.get('interview_completed', False),
+        'candidate': serialize_candidate_row(doc),
+    }
 
 class CandidateCreateSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -0,0 +1,126 @@
+"""
+Recruiter dashboard statistics computed inside MongoDB.
+
+A single aggregation over the recruiter's candidates (served by the
+created_by_id index) returns status counts, a score histogram and a per-role
+breakdown, so the numbers cost the same whether a recruiter has ten
+candidates or a hundred thousand.
+"""
+from .models import Candidate
+
+# Histogram buckets on the 0-10 evaluation scale: [0,2), [2,4), ... [8,10]
+SCORE_BUCKETS = [0, 2, 4, 6, 8, 10.000001]
+
+
+def _score_expression():
+    # Numeric copy of evaluation_score maintained by Candidate.save(); missing means unscored
+    return {'$ifNull': ['$evaluation_score_value', None]}
+
+
+def _flag(expression):
+    return {'$cond': [expression, 1, 0]}
+
+
+def recruiter_stats(user_id):
+    """
+    Aggregate dashboard statistics for one recruiter.
+
+    Args:
+        user_id (str): Recruiter user ID (Candidate.created_by_id)
+
+    Returns:
+        dict: totals, score_histogram and roles
+    """
+    terminated = {'$eq': ['$interview_terminated', True]}
+    not_terminated = {'$ne': ['$interview_terminated', True]}
+    completed = {'$and': [{'$eq': ['$interview_completed', True]}, not_terminated]}
+    in_progress = {'$and': [
+        {'$eq': ['$interview_started', True]},
+        {'$ne': ['$interview_completed', True]},
+        not_terminated,
+    ]}
+    evaluated = {'$ne': ['$score', None]}
+
+    pipeline = [
+        {'$match': {'created_by_id': user_id}},
+        {'$project': {
+            'role': {'$ifNull': ['$role', 'Unspecified']},
+            'is_active': 1,
+            'has_resume': 1,
+            'interview_started': 1,
+            'interview_completed': 1,
+            'interview_terminated': 1,
+            'score': _score_expression(),
+        }},
+        {'$facet': {
+            'totals': [
+                {'$group': {
+                    '_id': None,
+                    'invited': {'$sum': 1},
+                    'active': {'$sum': _flag({'$ne': ['$is_active', False]})},
+                    'with_resume': {'$sum': _flag({'$eq': ['$has_resume', True]})},
+                    'in_progress': {'$sum': _flag(in_progress)},
+                    'completed': {'$sum': _flag(completed)},
+                    'terminated': {'$sum': _flag(terminated)},
+                    'evaluated': {'$sum': _flag(evaluated)},
+                    'average_score': {'$avg': '$score'},
+                }},
+            ],
+            'score_histogram': [
+                {'$match': {'score': {'$ne': None}}},
+                {'$bucket': {
+                    'groupBy': '$score',
+                    'boundaries': SCORE_BUCKETS,
+                    'default': 'out_of_range',
+                    'output': {'count': {'$sum': 1}},
+                }},
+            ],
+            'roles': [
+                {'$group': {
+                    '_id': '$role',
+                    'invited': {'$sum': 1},
+                    'completed': {'$sum': _flag(completed)},
+                    'terminated': {'$sum': _flag(terminated)},
+                    'evaluated': {'$sum': _flag(evaluated)},
+                    'average_score': {'$avg': '$score'},
+                }},
+                {'$sort': {'invited': -1}},
+            ],
+        }},
+    ]
+
+    result = next(Candidate._get_collection().aggregate(pipeline), {})
+
+    totals = (result.get('totals') or [{}])[0]
+    totals.pop('_id', None)
+    for key in ('invited', 'active', 'with_resume', 'in_progress', 'completed', 'terminated', 'evaluated'):
+        totals.setdefault(key, 0)
+    totals['average_score'] = _round(totals.get('average_score'))
+
+    counts = {bucket['_id']: bucket['count'] for bucket in result.get('score_histogram', [])}
+    histogram = [
+        {'min': low, 'max': min(high, 10), 'count': counts.get(low, 0)}
+        for low, high in zip(SCORE_BUCKETS, SCORE_BUCKETS[1:])
+    ]
+
+    roles = [
+        {
+            'role': row['_id'],
+            'invited': row['invited'],
+            'completed': row['completed'],
+            'terminated': row['terminated'],
+            'evaluated': row['evaluated'],
+            'average_score': _round(row['average_score']),
+        }
+        for row in result.get('roles', [])
+    ]
+
+    return {
+        'totals': totals,
+        'score_histogram': histogram,
+        'roles': roles,
+    }
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
@@ -1,3 +1,983 @@
-from django.test import TestCase
+import hashlib
+import os
+import re
+import signal
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import SkipTest, mock
+
+import mongoengine
+from bson import ObjectId
+from django.core.cache import cache
+from django.core.files.uploadhandler import SkipFile, StopFutureHandlers
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from pymongo.errors import PyMongoError
+from rest_framework.test import APIClient
+
+from hireiq_backend.mongodb_utils import connect_to_mongodb
+from . import invitations, models, pdf_worker, search, transcription_jobs, uploads, views
+from .cache import (
+    list_cache_key, get_cached_list, cache_list, cache_summary, get_cached_summary, stats_cache_key,
+    invalidate_candidate, invalidate_recruiter,
+)
+from .change_feed import CandidateChangeFeed
+from .audio_uploads import (
+    create_upload, get_upload, append_chunk, claim_upload, AudioUpload, AudioUploadChunk, UploadError,
+    OffsetMismatch, STATUS_OPEN, FINALIZE_TIMEOUT_SECONDS,
+)
+from .blob_codecs import CODEC_IDENTITY, CODEC_ZLIB
+from .gridfs_models import (
+    GridFSHelper, ResumeBlob, acquire_blob, release_blob, attach_resume, parse_range, RangeNotSatisfiable,
+)
+from .invitations import bulk_invite, InviteError
+from .models import Candidate, CandidateTombstone
+from .pagination import paginate, parse_sort, decode_cursor, PaginationError
+from .resume_text import ResumeText
+from .search import search_candidates, _snippets
+from .stats import recruiter_stats
+from .sync import parse_since, changes_since, SyncError
+from .uploads import GridFSResumeUploadHandler, save_streamed_resume
+
+# Tests run against a throwaway database, never the one in MONGODB_URL
+MONGODB_TEST_URL = os.getenv('MONGODB_TEST_URL', 'mongodb://localhost:27017')
+MONGODB_TEST_NAME = os.getenv('MONGODB_TEST_NAME', 'hireiq_test')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class MongoTestCase(SimpleTestCase):
+    """
+    Connects mongoengine to MONGODB_TEST_NAME on MONGODB_TEST_URL for the test class and
+    empties every collection before each test. Skipped if no MongoDB server is reachable.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        mongoengine.disconnect()
+        mongoengine.connect(
+            db=MONGODB_TEST_NAME,
+            host=MONGODB_TEST_URL,
+            uuidRepresentation='standard',
+            serverSelectionTimeoutMS=2000,
+        )
+        try:
+            mongoengine.connection.get_db().command('ping')
+        except PyMongoError as e:
+            cls._restore_connection()
+            super().tearDownClass()
+            raise SkipTest(f'MongoDB not available at {MONGODB_TEST_URL}: {e}')
+
+    @classmethod
+    def tearDownClass(cls):
+        mongoengine.connection.get_connection().drop_database(MONGODB_TEST_NAME)
+        cls._restore_connection()
+        super().tearDownClass()
+
+    @classmethod
+    def _restore_connection(cls):
+        mongoengine.disconnect()
+        connect_to_mongodb()
+
+    def setUp(self):
+        db = mongoengine.connection.get_db()
+        for name in db.list_collection_names():
+            db[name].delete_many({})
+
+
+def recruiter_client(user_id='1'):
+    """API client authenticated as a recruiter (no SQL user row needed)"""
+    client = APIClient()
+    client.force_authenticate(user=SimpleNamespace(id=user_id, pk=user_id, is_authenticated=True))
+    return client
+
+
+def make_candidate(recruiter='1', **fields):
+    fields.setdefault('email', f'{uuid.uuid4().hex[:8]}@example.com')
+    candidate = Candidate(created_by_id=recruiter, **fields)
+    candidate.save()
+    return candidate
+
+
+class CandidateSummaryTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        models._summaries_checked.clear()
+        self.collection = Candidate._get_collection()
+
+    def insert_legacy(self, candidate_id, **fields):
+        """A document written before the summary fields existed"""
+        self.collection.insert_one(dict({
+            'candidate_id': candidate_id,
+            'email': f'{candidate_id}@example.com',
+            'created_by_id': 'r1',
+            'is_active': True,
+        }, **fields))
+        return self.collection.find_one({'candidate_id': candidate_id}, {'has_resume': 1, 'resume_file_id': 1})
+
+    def test_list_backfills_documents_without_summaries(self):
+        self.insert_legacy('legacy', resume_data=b'%PDF-1.4', audio_responses=[{'question_id': 'q_0'}])
+
+        row = Candidate.list_for_recruiter('r1').first()
+
+        self.assertTrue(row['has_resume'])
+        self.assertEqual(row['audio_responses_count'], 1)
+        self.assertNotIn('resume_data', row)
+
+    def test_resume_flag_falls_back_to_the_resume_fields(self):
+        self.assertTrue(Candidate.row_has_resume(self.insert_legacy('inline', resume_data=b'%PDF-1.4')))
+        self.assertTrue(Candidate.row_has_resume(self.insert_legacy('gridfs', resume_file_id=ObjectId())))
+        self.assertFalse(Candidate.row_has_resume(self.insert_legacy('none')))
+        self.assertFalse(Candidate.row_has_resume({'_id': ObjectId(), 'has_resume': False, 'resume_file_id': None}))
+
+
+class KeysetPaginationTests(MongoTestCase):
+
+    def make_candidates(self, count, created_at=None, score=None, recruiter='r1'):
+        candidates = []
+        for _ in range(count):
+            candidate = Candidate(
+                email=f'{uuid.uuid4().hex[:8]}@example.com',
+                created_by_id=recruiter,
+                evaluation_score=score,
+            )
+            if created_at:
+                candidate.created_at = created_at
+            candidate.save()
+            candidates.append(candidate)
+        return candidates
+
+    def walk(self, sort, limit):
+        """ids of every page in order, following next_cursor until it runs out"""
+        queryset = Candidate.list_for_recruiter('r1')
+        ids, cursor = [], None
+        for _ in range(100):
+            page, cursor = paginate(queryset, cursor=cursor, limit=limit, sort=sort)
+            ids.extend(row['_id'] for row in page)
+            if cursor is None:
+                return ids
+        self.fail('Pagination never reached the last page')
+
+    def test_cursor_round_trip_visits_every_row_once_in_order(self):
+        start = datetime(2025, 1, 1)
+        for day in range(7):
+            self.make_candidates(1, created_at=start + timedelta(days=day))
+        self.make_candidates(2, recruiter='r2')
+
+        ids = self.walk(parse_sort(None), limit=3)
+
+        expected = [row['_id'] for row in Candidate.list_for_recruiter('r1').order_by('-created_at', 'id')]
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(ids), 7)
+
+    def test_ties_on_created_at_are_broken_by_id(self):
+        self.make_candidates(5, created_at=datetime(2025, 1, 1))
+
+        ids = self.walk(parse_sort('-date'), limit=2)
+
+        self.assertEqual(len(set(ids)), 5)
+        self.assertEqual(ids, sorted(ids))
+
+    def test_ties_on_score_are_broken_by_id(self):
+        self.make_candidates(5, score='7.5')
+        self.make_candidates(2, score='9')
+
+        for sort in ('-score', 'score'):
+            ids = self.walk(parse_sort(sort), limit=2)
+            self.assertEqual(len(ids), 7)
+            self.assertEqual(len(set(ids)), 7)
+
+        scores = [row['evaluation_score_value'] for row in paginate(
+            Candidate.list_for_recruiter('r1'), limit=10, sort=parse_sort('-score'))[0]]
+        self.assertEqual(scores, [9.0, 9.0, 7.5, 7.5, 7.5, 7.5, 7.5])
+
+    def test_score_sort_leaves_out_unscored_candidates(self):
+        scored = self.make_candidates(2, score='8')
+        self.make_candidates(3)
+
+        ids = self.walk(parse_sort('-score'), limit=1)
+
+        self.assertEqual(set(ids), {candidate.id for candidate in scored})
+
+    def test_cursor_from_another_sort_is_rejected(self):
+        self.make_candidates(3, score='8')
+        _, cursor = paginate(Candidate.list_for_recruiter('r1'), limit=1, sort=parse_sort('-score'))
+
+        with self.assertRaises(PaginationError):
+            decode_cursor(cursor, parse_sort('-date'))
+        with self.assertRaises(PaginationError):
+            decode_cursor('not-a-cursor', parse_sort('-date'))
+
+
+class DeltaSyncTests(MongoTestCase):
+
+    def test_changes_since_splits_live_rows_and_tombstones(self):
+        kept = make_candidate()
+        deactivated = make_candidate()
+        deleted = make_candidate()
+        make_candidate(recruiter='2').delete()
+        since = datetime.utcnow() - timedelta(seconds=1)
+
+        deactivated.is_active = False
+        deactivated.save()
+        deleted.delete()
+        changed, removed, token = changes_since(Candidate.list_for_recruiter('1'), since, '1')
+
+        self.assertEqual([row['candidate_id'] for row in changed], [kept.candidate_id])
+        self.assertEqual(sorted(removed), sorted([deactivated.candidate_id, deleted.candidate_id]))
+        self.assertGreater(token, since)
+
+    def test_old_changes_are_left_out(self):
+        candidate = make_candidate()
+        Candidate._get_collection().update_one(
+            {'_id': candidate.id}, {'$set': {'updated_at': datetime.utcnow() - timedelta(hours=1)}}
+        )
+
+        changed, removed, _ = changes_since(Candidate.list_for_recruiter('1'), datetime.utcnow(), '1')
+
+        self.assertEqual((changed, removed), ([], []))
+
+    def test_parse_since(self):
+        self.assertEqual(parse_since('1735689600000'), datetime(2025, 1, 1))
+        self.assertEqual(parse_since('2025-01-01T05:30:00+05:30'), datetime(2025, 1, 1))
+        with self.assertRaises(SyncError):
+            parse_since('yesterday')
+
+    def test_list_endpoint_returns_deletions_as_removed(self):
+        candidate = make_candidate()
+        response = recruiter_client().get(reverse('candidate-list-create'), {'updated_since': '0'})
+        token = response.data['sync_token']
+
+        candidate.delete()
+        response = recruiter_client().get(reverse('candidate-list-create'), {'updated_since': token})
+
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(response.data['removed'], [candidate.candidate_id])
+
+
+class ListEtagTests(MongoTestCase):
+
+    def test_unchanged_list_revalidates_with_304(self):
+        make_candidate()
+        client = recruiter_client()
+
+        first = client.get(reverse('candidate-list-create'))
+        again = client.get(reverse('candidate-list-create'), HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(again.status_code, 304)
+
+    def test_change_produces_a_new_etag(self):
+        candidate = make_candidate()
+        client = recruiter_client()
+        etag = client.get(reverse('candidate-list-create'))['ETag']
+
+        candidate.company = 'Acme'
+        candidate.save()
+        response = client.get(reverse('candidate-list-create'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data[0]['company'], 'Acme')
+
+    def test_etag_depends_on_the_query(self):
+        make_candidate()
+        client = recruiter_client()
+
+        plain = client.get(reverse('candidate-list-create'))['ETag']
+        filtered = client.get(reverse('candidate-list-create'), {'status': 'invited'})['ETag']
+
+        self.assertNotEqual(plain, filtered)
+
+
+class ChangeFeedRemovalTests(MongoTestCase):
+
+    def test_deletion_reaches_only_the_owner(self):
+        feed = CandidateChangeFeed()
+        feed._thread = threading.current_thread()  # keep subscribe() from starting the watcher
+        owner, other = feed.subscribe('1'), feed.subscribe('2')
+        candidate = make_candidate()
+
+        candidate.delete()
+        tombstone = CandidateTombstone._get_collection().find_one({'document_id': candidate.id})
+        feed.publish_removal(candidate.id, tombstone)
+
+        event = owner.get_nowait()
+        self.assertEqual(event['event'], 'candidate_deleted')
+        self.assertEqual(event['candidate'], {'id': str(candidate.id), 'candidate_id': candidate.candidate_id, 'is_active': False})
+        self.assertTrue(other.empty())
+
+    def test_deletion_without_tombstone_goes_to_everyone(self):
+        feed = CandidateChangeFeed()
+        feed._thread = threading.current_thread()
+        listeners = [feed.subscribe('1'), feed.subscribe('2')]
+        document_id = ObjectId()
+
+        feed.publish_removal(document_id)
+
+        for listener in listeners:
+            self.assertEqual(listener.get_nowait()['candidate']['id'], str(document_id))
+
+
+class ListCacheTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_write_invalidates_every_cached_query_of_the_recruiter(self):
+        candidate = make_candidate()
+        keys = [list_cache_key('1', query) for query in ('', 'status=invited', 'updated_since=0')]
+        other = list_cache_key('2')
+        for key in keys + [other]:
+            cache_list(key, '"etag"', [])
+
+        candidate.company = 'Acme'
+        candidate.save()
+
+        for query in ('', 'status=invited', 'updated_since=0'):
+            self.assertIsNone(get_cached_list(list_cache_key('1', query)))
+        self.assertEqual(get_cached_list(list_cache_key('2')), {'etag': '"etag"', 'data': []})
+
+    def test_result_read_before_a_write_is_not_served_after_it(self):
+        key = list_cache_key('1')
+        self.assertIsNone(get_cached_list(key))
+
+        invalidate_recruiter('1')  # a write lands while the list query runs
+        cache_list(key, '"stale"', ['stale row'])
+
+        self.assertIsNone(get_cached_list(list_cache_key('1')))
+
+    def test_invalidate_candidate_drops_its_summary(self):
+        cache_summary('c1', {'is_active': True})
+
+        invalidate_candidate('c1', '1')
+
+        self.assertIsNone(get_cached_summary('c1'))
+
+    def test_list_endpoint_serves_cached_body_until_a_write(self):
+        candidate = make_candidate()
+        client = recruiter_client()
+        client.get(reverse('candidate-list-create'))
+
+        # Bypasses Candidate.save(), so the cached entry stays current as far as the cache knows
+        Candidate._get_collection().update_one({'_id': candidate.id}, {'$set': {'company': 'Raw'}})
+        self.assertIsNone(client.get(reverse('candidate-list-create')).data[0]['company'])
+
+        Candidate.objects.get(id=candidate.id).save()
+        self.assertEqual(client.get(reverse('candidate-list-create')).data[0]['company'], 'Raw')
+
+
+class RecruiterStatsTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        make_candidate(role='Backend', interview_started=True)
+        make_candidate(role='Backend', interview_started=True, interview_completed=True, evaluation_score='8.5')
+        make_candidate(role='Backend', interview_started=True, interview_completed=True, evaluation_score='3')
+        make_candidate(role='Frontend', interview_started=True, interview_terminated=True, is_active=False)
+        make_candidate()
+        make_candidate(recruiter='2', evaluation_score='10')
+
+    def test_facets(self):
+        stats = recruiter_stats('1')
+
+        self.assertEqual(stats['totals'], {
+            'invited': 5, 'active': 4, 'with_resume': 0, 'in_progress': 1,
+            'completed': 2, 'terminated': 1, 'evaluated': 2, 'average_score': 5.75,
+        })
+        self.assertEqual([bucket['count'] for bucket in stats['score_histogram']], [0, 1, 0, 0, 1])
+        self.assertEqual(stats['score_histogram'][-1], {'min': 8, 'max': 10, 'count': 1})
+        self.assertEqual(stats['roles'][0], {
+            'role': 'Backend', 'invited': 3, 'completed': 2, 'terminated': 0, 'evaluated': 2, 'average_score': 5.75,
+        })
+        self.assertEqual({row['role'] for row in stats['roles']}, {'Backend', 'Frontend', 'Unspecified'})
+
+    def test_recruiter_without_candidates(self):
+        stats = recruiter_stats('nobody')
+
+        self.assertEqual(stats['totals']['invited'], 0)
+        self.assertIsNone(stats['totals']['average_score'])
+        self.assertEqual(stats['roles'], [])
+
+    def test_endpoint_revalidates_until_a_write(self):
+        client = recruiter_client()
+        first = client.get(reverse('candidate-stats'))
+
+        self.assertEqual(first.data['totals']['invited'], 5)
+        self.assertIsNotNone(cache.get(stats_cache_key('1')))
+        self.assertEqual(client.get(reverse('candidate-stats'), HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        make_candidate()
+        response = client.get(reverse('candidate-stats'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals']['invited'], 6)
+
+
+class CandidateSearchTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        search._text_index_checked = False
+
+    def test_finds_a_candidate_by_a_word_only_in_its_feedback(self):
+        manual = make_candidate(evaluation_data={
+            'summary': {'average_score': 7.5},
+            'results': [{'index': 0, 'question': 'Deploys?', 'evaluation': {'feedback': 'Solid grasp of kubernetes'}}],
+        })
+        automatic = make_candidate(evaluation_data={
+            'average_score': 6,
+            'evaluation_results': [{'overall_score': 6, 'feedback': 'Explained terraform state well'}],
+        })
+        make_candidate(recruiter='2', evaluation_data={'evaluation_results': [{'feedback': 'kubernetes expert'}]})
+
+        hits = search_candidates('1', 'kubernetes')
+        self.assertEqual([hit['candidate_id'] for hit in hits], [manual.candidate_id])
+        self.assertEqual(hits[0]['snippets'], [{'field': 'feedback', 'snippet': 'Solid grasp of <mark>kubernetes</mark>'}])
+
+        hits = search_candidates('1', 'terraform')
+        self.assertEqual([hit['candidate_id'] for hit in hits], [automatic.candidate_id])
+
+    def test_outdated_text_index_is_replaced(self):
+        collection = Candidate._get_collection()
+        collection.create_index(
+            [('created_by_id', 1), ('email', 'text'), ('evaluation_data.summary', 'text')], name='candidate_text'
+        )
+
+        self.assertTrue(Candidate.ensure_text_index())
+        self.assertFalse(Candidate.ensure_text_index())
+        text_indexes = [index for index in collection.list_indexes() if 'textIndexVersion' in index]
+        self.assertEqual([dict(index['weights']) for index in text_indexes], [models.TEXT_INDEX_WEIGHTS])
+
+    def test_snippets_cover_both_feedback_shapes(self):
+        pattern = re.compile(r'\bpython\w*', re.IGNORECASE)
+        doc = {'evaluation_data': {
+            'summary': {'average_score': 8},
+            'results': [{'evaluation': {'feedback': 'Knows Python well'}}, {'error': 'Evaluation failed'}],
+            'evaluation_results': [{'feedback': 'More python please'}],
+        }}
+
+        self.assertEqual(_snippets(doc, pattern), [
+            {'field': 'feedback', 'snippet': 'Knows <mark>Python</mark> well'},
+            {'field': 'feedback', 'snippet': 'More <mark>python</mark> please'},
+        ])
+
+
+class BulkInviteTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(invitations, 'get_invitation_mailer')
+        self.mailer = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def queued_recipients(self):
+        return [message.to for call in self.mailer.enqueue.call_args_list for message in call.args[0]]
+
+    def test_each_row_gets_a_result_in_order(self):
+        make_candidate(email='known@example.com')
+
+        results = bulk_invite('1', [
+            {'email': ' new@example.com ', 'role': 'Backend'},
+            {'email': 'not-an-email'},
+            {'email': 'known@example.com'},
+            {'email': 'new@example.com'},
+            {'email': 'other@example.com'},
+        ], defaults={'company': 'Acme', 'role': 'Any'})
+
+        self.assertEqual([result['status'] for result in results], ['created', 'invalid', 'duplicate', 'duplicate', 'created'])
+        self.assertEqual([result['row'] for result in results], [1, 2, 3, 4, 5])
+        created = Candidate.objects.get(candidate_id=results[0]['candidate_id'])
+        self.assertEqual((created.email, created.company, created.role), ('new@example.com', 'Acme', 'Backend'))
+        self.assertEqual(Candidate.objects.get(email='other@example.com').role, 'Any')
+        self.assertIs(created.has_resume, False)
+        self.assertEqual(self.queued_recipients(), [['new@example.com'], ['other@example.com']])
+
+    def test_same_email_for_another_recruiter_is_invited(self):
+        make_candidate(recruiter='2', email='shared@example.com')
+
+        results = bulk_invite('1', [{'email': 'shared@example.com'}])
+
+        self.assertEqual(results[0]['status'], 'created')
+        self.assertEqual(Candidate.objects(email='shared@example.com').count(), 2)
+
+    def test_nothing_valid_sends_nothing(self):
+        results = bulk_invite('1', [{'email': ''}, {'email': None}])
+
+        self.assertEqual([result['status'] for result in results], ['invalid', 'invalid'])
+        self.mailer.enqueue.assert_not_called()
+
+    def test_too_many_rows(self):
+        with self.assertRaises(InviteError):
+            bulk_invite('1', [{'email': f'{i}@example.com'} for i in range(invitations.MAX_BULK_INVITES + 1)])
+
+    def test_csv_upload_through_the_endpoint(self):
+        body = 'Email,Role\na@example.com,Backend\n\nb@example.com,\nbroken\n'
+
+        response = recruiter_client().post(reverse('bulk-invite-candidates'), body, content_type='text/csv')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['summary'], {'created': 2, 'invalid': 1})
+        self.assertEqual(Candidate.objects.get(email='a@example.com').role, 'Backend')
+
+    def test_headerless_json_and_bad_payloads(self):
+        client = recruiter_client()
+
+        response = client.post(reverse('bulk-invite-candidates'), {'candidates': ['c@example.com', 7]}, format='json')
+        self.assertEqual([result['status'] for result in response.data['results']], ['created', 'invalid'])
+
+        response = client.post(reverse('bulk-invite-candidates'), {'emails': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class ResumeRangeTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.content = os.urandom(4096)  # incompressible, so stored as-is and seekable
+        self.candidate = make_candidate()
+        attach_resume(self.candidate, self.content, 'cv.pdf')
+
+    def download(self, **headers):
+        return recruiter_client().get(reverse('download-resume', args=[self.candidate.candidate_id]), **headers)
+
+    def test_parse_range(self):
+        cases = {
+            None: None,
+            'bytes=0-99': (0, 99),
+            'bytes=100-': (100, 999),
+            'bytes=-100': (900, 999),
+            'bytes=-5000': (0, 999),
+            'bytes=990-5000': (990, 999),
+            ' bytes = 5 - 9 ': (5, 9),
+            'bytes=0-1,5-9': None,  # multi-range: served whole
+            'items=0-9': None,
+            'bytes=-': None,
+        }
+        for header, expected in cases.items():
+            self.assertEqual(parse_range(header, 1000), expected, header)
+        for header in ('bytes=1000-', 'bytes=5-2', 'bytes=-0'):
+            with self.assertRaises(RangeNotSatisfiable, msg=header):
+                parse_range(header, 1000)
+
+    def test_partial_content(self):
+        response = self.download(HTTP_RANGE='bytes=100-199')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 100-199/4096')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.content[100:200])
+
+    def test_unsatisfiable_range_is_416(self):
+        response = self.download(HTTP_RANGE='bytes=5000-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */4096')
+
+    def test_stale_if_range_gets_the_whole_file(self):
+        response = self.download(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"outdated"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_compressible_pdf_still_serves_ranges(self):
+        content = b'%PDF-1.4\n' + b'x' * 4096
+        attach_resume(self.candidate, content, 'cv.pdf')
+
+        response = self.download(HTTP_RANGE='bytes=0-7')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4')
+
+    def test_current_copy_revalidates_with_304(self):
+        etag = self.download()['ETag']
+
+        self.assertEqual(self.download(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class ResumeBlobRefcountTests(MongoTestCase):
+
+    PDF = b'%PDF-1.4\n' + b'x' * 1000
+
+    def blob(self, sha256):
+        return ResumeBlob._get_collection().find_one({'_id': sha256})
+
+    def test_identical_resumes_share_one_file(self):
+        helper = GridFSHelper()
+        sha256, file_id = acquire_blob(self.PDF, 'a.pdf', helper=helper)
+        same_sha256, same_file_id = acquire_blob(self.PDF, 'b.pdf', helper=helper)
+
+        self.assertEqual((same_sha256, same_file_id), (sha256, file_id))
+        self.assertEqual(self.blob(sha256)['refcount'], 2)
+        self.assertEqual(helper.db['resumes.files'].count_documents({}), 1)
+
+    def test_release_keeps_blob_until_last_reference(self):
+        helper = GridFSHelper()
+        sha256, file_id = acquire_blob(self.PDF, 'a.pdf', helper=helper)
+        acquire_blob(self.PDF, 'b.pdf', helper=helper)
+
+        release_blob(sha256, helper)
+        self.assertEqual(self.blob(sha256)['refcount'], 1)
+        self.assertIsNotNone(helper.get_file(file_id))
+
+        release_blob(sha256, helper)
+        self.assertIsNone(self.blob(sha256))
+        self.assertIsNone(helper.get_file(file_id))
+
+    def test_delete_at_zero_drops_derived_text(self):
+        helper = GridFSHelper()
+        sha256, _ = acquire_blob(self.PDF, 'a.pdf', helper=helper)
+        ResumeText(sha256=sha256, text='EDUCATION').save()
+
+        release_blob(sha256, helper)
+
+        self.assertEqual(ResumeText.objects(sha256=sha256).count(), 0)
+
+    def test_acquire_after_delete_stores_again(self):
+        helper = GridFSHelper()
+        sha256, first_file_id = acquire_blob(self.PDF, 'a.pdf', helper=helper)
+        release_blob(sha256, helper)
+
+        _, file_id = acquire_blob(self.PDF, 'a.pdf', helper=helper)
+
+        self.assertNotEqual(file_id, first_file_id)
+        self.assertEqual(self.blob(sha256)['refcount'], 1)
+        self.assertIsNotNone(helper.get_file(file_id))
+
+
+class StreamingUploadTests(MongoTestCase):
+
+    def stream(self, data, file_name='cv.pdf', chunk_size=uploads.UPLOAD_CHUNK_SIZE):
+        """Feed data through the handler the way MultiPartParser does; the file, or None if skipped"""
+        handler = GridFSResumeUploadHandler()
+        try:
+            with self.assertRaises(StopFutureHandlers):
+                handler.new_file('resume', file_name, 'application/pdf', len(data))
+            for start in range(0, len(data), chunk_size):
+                handler.receive_data_chunk(data[start:start + chunk_size], start)
+        except SkipFile:
+            return handler, None
+        return handler, handler.file_complete(len(data))
+
+    def stored(self, uploaded):
+        return GridFSHelper().get_file(uploaded.file_id).read()
+
+    def test_pdf_is_stored_as_is(self):
+        data = b'%PDF-1.4\n' + b'x' * 100000
+
+        _, uploaded = self.stream(data, chunk_size=4096)
+
+        self.assertEqual(uploaded.codec, CODEC_IDENTITY)
+        self.assertEqual(self.stored(uploaded), data)
+        self.assertEqual(uploaded.sha256, hashlib.sha256(data).hexdigest())
+
+    def test_compression_is_dropped_unless_it_saves_enough(self):
+        with mock.patch.object(uploads, 'is_compressible', return_value=True), \
+                mock.patch.object(uploads, 'preferred_codec', return_value=CODEC_ZLIB):
+            _, kept = self.stream(b'%PDF-1.4\n' + b'x' * 100000)
+            noisy = b'%PDF-1.4\n' + os.urandom(100000)
+            _, dropped = self.stream(noisy, chunk_size=4096)
+
+        self.assertEqual(kept.codec, CODEC_ZLIB)
+        self.assertLess(kept.stored_size, 1000)
+        self.assertEqual(dropped.codec, CODEC_IDENTITY)
+        self.assertEqual(dropped.stored_size, len(noisy))
+        self.assertEqual(self.stored(dropped), noisy)
+        self.assertEqual(GridFSHelper().db['resumes.files'].count_documents({}), 2)
+
+    def test_invalid_files_are_skipped_and_discarded(self):
+        cases = [
+            (b'PK\x03\x04 not a pdf', 'cv.pdf', 'File is not a valid PDF'),
+            (b'%PDF-1.4', 'cv.docx', 'Only PDF files are allowed'),
+            (b'%PDF-1.4\n' + b'x' * uploads.MAX_RESUME_SIZE, 'cv.pdf', 'File size must be less than 10MB'),
+        ]
+        for data, file_name, error in cases:
+            handler, uploaded = self.stream(data, file_name)
+            self.assertIsNone(uploaded)
+            self.assertEqual(handler.error, error)
+
+        # Too short for the magic bytes: only noticed once the part is complete
+        handler, uploaded = self.stream(b'%PD')
+        self.assertIsNone(uploaded)
+        self.assertEqual(handler.error, 'File is not a valid PDF')
+        self.assertEqual(GridFSHelper().db['resumes.files'].count_documents({}), 0)
+
+    def test_magic_bytes_split_across_chunks(self):
+        data = b'%PDF-1.7\n' + b'y' * 50
+
+        _, uploaded = self.stream(data, chunk_size=2)
+
+        self.assertEqual(self.stored(uploaded), data)
+
+    def test_other_fields_are_left_to_the_default_handlers(self):
+        handler = GridFSResumeUploadHandler()
+        handler.new_file('cover_letter', 'letter.pdf', 'application/pdf', 3)
+
+        self.assertEqual(handler.receive_data_chunk(b'abc', 0), b'abc')
+        self.assertIsNone(handler.file_complete(3))
+
+    def test_save_attaches_the_upload_and_releases_the_previous_resume(self):
+        candidate = make_candidate()
+        _, first = self.stream(b'%PDF-1.4 first')
+        save_streamed_resume(candidate.candidate_id, first)
+        _, second = self.stream(b'%PDF-1.4 second')
+
+        row = save_streamed_resume(candidate.candidate_id, second)
+
+        self.assertEqual(row['resume_file_id'], second.file_id)
+        candidate.reload()
+        self.assertEqual((candidate.resume_sha256, candidate.has_resume), (second.sha256, True))
+        self.assertIsNone(ResumeBlob._get_collection().find_one({'_id': first.sha256}))
+        self.assertIsNone(GridFSHelper().get_file(first.file_id))
+
+    def test_identical_upload_reuses_the_stored_file(self):
+        data = b'%PDF-1.4 same'
+        owners = [make_candidate(), make_candidate()]
+        files = [self.stream(data)[1] for _ in owners]
+
+        rows = [save_streamed_resume(owner.candidate_id, upload) for owner, upload in zip(owners, files)]
+
+        self.assertEqual(rows[0]['resume_file_id'], rows[1]['resume_file_id'])
+        self.assertEqual(ResumeBlob._get_collection().find_one({'_id': files[0].sha256})['refcount'], 2)
+        self.assertEqual(GridFSHelper().db['resumes.files'].count_documents({}), 1)
+
+    def test_upload_for_a_missing_candidate_is_released(self):
+        _, uploaded = self.stream(b'%PDF-1.4 orphan')
+
+        self.assertIsNone(save_streamed_resume('missing', uploaded))
+        self.assertIsNone(GridFSHelper().get_file(uploaded.file_id))
+
+
+class PdfWorkerDeadlineTests(SimpleTestCase):
+
+    def test_task_deadline_runs_from_when_the_task_starts(self):
+        # _limit_cpu would cap this test process, not a worker
+        with mock.patch('fitz.open', side_effect=lambda **kwargs: time.sleep(5)), \
+                mock.patch.object(pdf_worker, '_limit_cpu'):
+            started = time.monotonic()
+            with self.assertRaisesRegex(ValueError, 'took longer than 0.2s'):
+                pdf_worker._extract_pages(b'%PDF-1.4', 0, 1, cpu_seconds=60, timeout_seconds=0.2)
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+
+    def test_backed_up_queue_withdraws_its_tasks_and_keeps_the_workers(self):
+        pending = Future()
+        executor = mock.Mock(submit=mock.Mock(return_value=pending))
+
+        with mock.patch.object(pdf_worker, '_get_executor', return_value=executor), \
+                mock.patch.object(pdf_worker, 'PDF_WAIT_SECONDS', 0), \
+                mock.patch.object(pdf_worker, '_discard_executor') as discard:
+            with self.assertRaises(pdf_worker.PdfParserBusy):
+                pdf_worker.extract_pages(b'%PDF-1.4')
+
+        self.assertTrue(pending.cancelled())
+        discard.assert_not_called()
+        executor.submit.assert_called_once_with(
+            pdf_worker._extract_pages, b'%PDF-1.4', 0, mock.ANY, pdf_worker.PDF_CPU_SECONDS, pdf_worker.PDF_TIMEOUT_SECONDS
+        )
+
+
+class ChunkedAudioUploadTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.upload_id = create_upload('c1', 'q_0', 'Tell me about yourself')['_id']
+
+    def test_chunks_are_assembled_in_order(self):
+        self.assertEqual(append_chunk(self.upload_id, 0, b'abc'), 3)
+        self.assertEqual(append_chunk(self.upload_id, 3, b'defg'), 7)
+
+        upload, content = claim_upload(self.upload_id, expected_size=7)
+
+        self.assertEqual(content, b'abcdefg')
+        self.assertEqual(upload['question_id'], 'q_0')
+
+    def test_chunk_at_wrong_offset_reports_where_to_resume(self):
+        append_chunk(self.upload_id, 0, b'abc')
+
+        with self.assertRaises(OffsetMismatch) as raised:
+            append_chunk(self.upload_id, 5, b'xyz')
+
+        self.assertEqual(raised.exception.expected, 3)
+        self.assertEqual(get_upload(self.upload_id)['size'], 3)
+
+    def test_resending_a_received_chunk_is_a_no_op(self):
+        append_chunk(self.upload_id, 0, b'abc')
+        append_chunk(self.upload_id, 3, b'def')
+
+        self.assertEqual(append_chunk(self.upload_id, 0, b'abc'), 6)
+        self.assertEqual(append_chunk(self.upload_id, 3, b'def'), 6)
+
+        self.assertEqual(get_upload(self.upload_id)['size'], 6)
+        self.assertEqual(claim_upload(self.upload_id)[1], b'abcdef')
+
+    def test_finalize_short_of_the_client_size_reopens_the_upload(self):
+        append_chunk(self.upload_id, 0, b'abc')
+
+        with self.assertRaises(OffsetMismatch) as raised:
+            claim_upload(self.upload_id, expected_size=10)
+
+        self.assertEqual(raised.exception.expected, 3)
+        self.assertEqual(get_upload(self.upload_id)['status'], STATUS_OPEN)
+        self.assertEqual(append_chunk(self.upload_id, 3, b'defghij'), 10)
+
+    def test_finalize_with_a_gap_in_the_stored_chunks_fails(self):
+        append_chunk(self.upload_id, 0, b'abc')
+        append_chunk(self.upload_id, 3, b'def')
+        append_chunk(self.upload_id, 6, b'ghi')
+        AudioUploadChunk._get_collection().delete_one({'upload_id': self.upload_id, 'offset': 3})
+
+        with self.assertRaisesRegex(UploadError, 'missing bytes at offset 3'):
+            claim_upload(self.upload_id)
+
+        self.assertEqual(get_upload(self.upload_id)['status'], STATUS_OPEN)
+
+    def test_finalized_upload_takes_no_more_chunks(self):
+        append_chunk(self.upload_id, 0, b'abc')
+        claim_upload(self.upload_id)
+
+        with self.assertRaises(UploadError):
+            append_chunk(self.upload_id, 3, b'def')
+        with self.assertRaises(UploadError):
+            claim_upload(self.upload_id)
+
+    def test_unknown_upload(self):
+        self.assertIsNone(append_chunk('missing', 0, b'abc'))
+        self.assertIsNone(claim_upload('missing'))
+
+    def test_losing_writer_of_an_offset_cannot_replace_the_winning_chunk(self):
+        append_chunk(self.upload_id, 0, b'abc')
+
+        # A second PUT for offset 0 that read the session before the first one claimed it
+        sessions = mock.Mock(wraps=AudioUpload._get_collection())
+        sessions.find_one.side_effect = [{'_id': self.upload_id, 'size': 0, 'status': STATUS_OPEN}, mock.DEFAULT]
+        with mock.patch.object(AudioUpload, '_get_collection', return_value=sessions):
+            with self.assertRaises(OffsetMismatch) as raised:
+                append_chunk(self.upload_id, 0, b'wxyz')
+
+        self.assertEqual(raised.exception.expected, 3)
+        self.assertEqual(AudioUploadChunk._get_collection().count_documents({'upload_id': self.upload_id}), 1)
+        self.assertEqual(claim_upload(self.upload_id)[1], b'abc')
+
+    def test_unlisted_chunks_are_ignored(self):
+        append_chunk(self.upload_id, 0, b'abc')
+        AudioUploadChunk._get_collection().insert_one(
+            {'_id': f'{self.upload_id}:0:crashed', 'upload_id': self.upload_id, 'offset': 0, 'data': b'zzz'}
+        )
+
+        self.assertEqual(claim_upload(self.upload_id)[1], b'abc')
+
+    def test_stale_finalize_is_taken_over(self):
+        append_chunk(self.upload_id, 0, b'abc')
+        claim_upload(self.upload_id)  # and the request dies before saving the answer
+
+        with self.assertRaisesRegex(UploadError, 'already being finalized'):
+            claim_upload(self.upload_id)
+
+        AudioUpload._get_collection().update_one({'_id': self.upload_id}, {'$set': {
+            'updated_at': datetime.utcnow() - timedelta(seconds=FINALIZE_TIMEOUT_SECONDS + 1),
+        }})
+        self.assertEqual(claim_upload(self.upload_id)[1], b'abc')
+
+
+class AnswerCountTests(MongoTestCase):
+
+    def insert_legacy(self, answers):
+        """A candidate saved before audio_responses_count existed"""
+        Candidate._get_collection().insert_one({
+            'candidate_id': 'legacy',
+            'email': 'legacy@example.com',
+            'created_by_id': '1',
+            'is_active': True,
+            'interview_questions': {'q_0': 'One?', 'q_1': 'Two?', 'q_2': 'Three?'},
+            'audio_responses': [{'question_id': f'q_{i}', 'transcription': 'answer'} for i in range(answers)],
+        })
+
+    def test_new_answer_counts_the_answers_already_there(self):
+        self.insert_legacy(answers=2)
+
+        count, _ = views.record_audio_response('legacy', 'q_2', 'Three?', None, 'answer', 1.0, check_completion=False)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(Candidate._get_collection().find_one({'candidate_id': 'legacy'})['audio_responses_count'], 3)
+
+    def test_rerecorded_answer_reports_the_counted_total(self):
+        self.insert_legacy(answers=2)
+
+        count, _ = views.record_audio_response('legacy', 'q_0', 'One?', None, 'again', 1.0, check_completion=False)
+
+        self.assertEqual(count, 2)
+
+    def test_completion_check_falls_back_to_the_answers(self):
+        self.insert_legacy(answers=3)
+        row = Candidate.get_active_row('legacy', 'interview_questions', 'evaluation_score')
+
+        with mock.patch('threading.Thread') as thread:
+            self.assertTrue(views.check_and_auto_evaluate(row))
+
+        thread.assert_called_once_with(target=views.auto_evaluate_candidate, args=('legacy',))
+
+
+class TranscriptionGuardTests(MongoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.old_audio, self.new_audio, self.other_audio = ObjectId(), ObjectId(), ObjectId()
+        self.candidate = Candidate(
+            email='a@example.com',
+            created_by_id='r1',
+            audio_responses=[
+                {'question_id': 'q_0', 'audio_file_id': self.new_audio, 'transcription': ''},
+                {'question_id': 'q_1', 'audio_file_id': self.other_audio, 'transcription': 'Second answer'},
+            ],
+        )
+        self.candidate.save()
+
+    def transcripts(self):
+        row = Candidate._get_collection().find_one({'candidate_id': self.candidate.candidate_id})
+        return {response['question_id']: response['transcription'] for response in row['audio_responses']}
+
+    def test_transcript_of_a_re_recorded_answer_is_dropped(self):
+        applied = transcription_jobs.apply_transcription(
+            self.candidate.candidate_id, 'q_0', self.old_audio, 'Old recording'
+        )
+
+        self.assertFalse(applied)
+        self.assertEqual(self.transcripts(), {'q_0': '', 'q_1': 'Second answer'})
+
+    def test_transcript_lands_on_its_own_answer(self):
+        applied = transcription_jobs.apply_transcription(
+            self.candidate.candidate_id, 'q_0', self.new_audio, 'New recording'
+        )
+
+        self.assertTrue(applied)
+        self.assertEqual(self.transcripts(), {'q_0': 'New recording', 'q_1': 'Second answer'})
+
+    def test_job_for_a_re_recorded_answer_ends_superseded(self):
+        job_id = transcription_jobs.reserve_job(self.candidate.candidate_id, 'q_0')
+        self.assertTrue(transcription_jobs.has_pending_jobs(self.candidate.candidate_id))
+
+        with mock.patch('candidates.ml_models.voiceToText.transcribe_audio', return_value='Old recording'):
+            job = transcription_jobs.start_transcription(job_id, self.old_audio, b'audio', wait=10)
+
+        self.assertEqual(job['status'], transcription_jobs.STATUS_SUPERSEDED)
+        self.assertIsNone(job.get('transcription'))
+        self.assertFalse(transcription_jobs.has_pending_jobs(self.candidate.candidate_id))
+        self.assertEqual(self.transcripts()['q_0'], '')
+
+    def test_pending_job_lookup_uses_an_index(self):
+        transcription_jobs.TranscriptionJob.ensure_indexes()
+        indexes = transcription_jobs.TranscriptionJob._get_collection().index_information()
+
+        self.assertEqual(
+            indexes['candidate_status_created_at']['key'],
+            [('candidate_id', 1), ('status', 1), ('created_at', 1)],
+        )
 
-# Create your tests here.
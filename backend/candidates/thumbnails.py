@@ -0,0 +1,101 @@
+# First-page resume thumbnails
+# Rendered once per resume hash by the resume pipeline (see resume_pipeline.py) and kept in
+# 'resume_thumbnails', so the dashboard can preview a resume without downloading the PDF.
+# A thumbnail is addressed by the PDF's SHA-256, so its URL never changes meaning and can be
+# cached by browsers indefinitely; a re-uploaded resume simply gets a new URL.
+
+from mongoengine import Document, StringField, IntField, BinaryField, DateTimeField
+from django.urls import reverse
+from datetime import datetime
+
+from .pdf_worker import render_first_page, PdfExtractionError, PdfParserBusy
+
+THUMBNAIL_WIDTH = 320  # pixels; 2x the dashboard preview size for high-DPI screens
+
+
+class ResumeThumbnail(Document):
+    """
+    First page of one resume PDF as an image, keyed by the SHA-256 of the PDF.
+    error is set (and data empty) when the PDF could not be rendered.
+    """
+    sha256 = StringField(primary_key=True)
+    data = BinaryField()
+    content_type = StringField(max_length=50)
+    width = IntField()
+    height = IntField()
+    error = StringField()
+    created_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'resume_thumbnails',
+    }
+
+
+def store_thumbnail(sha256, pdf_bytes):
+    """
+    Render and persist the thumbnail for a resume unless it is already stored.
+
+    Args:
+        sha256 (str): Hex digest of pdf_bytes
+        pdf_bytes (bytes): PDF content
+
+    Returns:
+        dict: The stored resume_thumbnails row
+
+    Raises:
+        PdfParserBusy: The worker pool is saturated; nothing is stored, so a later call retries
+    """
+    collection = ResumeThumbnail._get_collection()
+    row = collection.find_one({'_id': sha256})
+    if row:
+        return row
+
+    try:
+        data, content_type, width, height = render_first_page(pdf_bytes, THUMBNAIL_WIDTH)
+        row = {'data': data, 'content_type': content_type, 'width': width, 'height': height, 'error': None}
+    except PdfParserBusy:
+        raise
+    except PdfExtractionError as e:
+        print(f"Resume {sha256[:12]} thumbnail could not be rendered: {e}")
+        row = {'data': b'', 'content_type': None, 'width': 0, 'height': 0, 'error': str(e)}
+
+    row['created_at'] = datetime.utcnow()
+    collection.update_one({'_id': sha256}, {'$set': row}, upsert=True)
+    return dict(row, _id=sha256)
+
+
+def get_thumbnail(sha256):
+    """
+    Get the thumbnail for a stored resume, rendering it now if the pipeline hasn't yet.
+
+    Args:
+        sha256 (str): Resume hash
+
+    Returns:
+        dict: resume_thumbnails row, or None if no resume with this hash is stored
+    """
+    from .gridfs_models import GridFSHelper, ResumeBlob
+
+    row = ResumeThumbnail._get_collection().find_one({'_id': sha256})
+    if row:
+        return row
+
+    blob = ResumeBlob._get_collection().find_one({'_id': sha256}, {'file_id': 1})
+    if not blob:
+        return None
+    helper = GridFSHelper()
+    gridfs_file = helper.get_file(blob['file_id'])
+    if gridfs_file is None:
+        return None
+    return store_thumbnail(sha256, helper.read_file(gridfs_file))
+
+
+def delete_thumbnail(sha256):
+    """Drop the thumbnail for a blob that no longer exists"""
+    if sha256:
+        ResumeThumbnail._get_collection().delete_one({'_id': sha256})
+
+
+def thumbnail_url(sha256):
+    """Immutable URL of a resume's thumbnail, or None"""
+    return reverse('resume-thumbnail', args=[sha256]) if sha256 else None
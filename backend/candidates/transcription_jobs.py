@@ -0,0 +1,214 @@
+"""
+Background transcription of saved answers.
+
+An answer is saved (audio stored, response recorded) before it is transcribed, so
+a slow or failing provider never loses the recording. Transcription then runs on a
+small per-process thread pool; the request waits up to TRANSCRIPTION_WAIT_SECONDS
+for it and otherwise hands the client a job ID to poll. When the transcript is
+ready it is written into the matching audio response, guarded by the audio file
+ID so a re-recorded answer is never given the old recording's transcript; such a
+job ends 'superseded' and its transcript is not reported, since it was never saved.
+Auto-evaluation waits until no job for the candidate is still pending (see
+has_pending_jobs); the job is reserved before the answer is saved so that there is
+no moment when an untranscribed answer has no pending job.
+
+Job rows live in 'transcription_jobs' so any worker process can answer a status
+poll; they expire after a day. A job whose process died stays 'pending' in the
+collection and is reported as failed once it is older than STALE_AFTER.
+"""
+import io
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+
+from mongoengine import Document, StringField, ObjectIdField, DateTimeField
+from pymongo import ReturnDocument
+
+from .audio_store import get_audio_helper, AUDIO_BUCKET
+from .cache import invalidate_candidate
+from .models import Candidate
+
+TRANSCRIPTION_WORKERS = int(os.getenv('TRANSCRIPTION_WORKERS', 4))
+TRANSCRIPTION_WAIT_SECONDS = float(os.getenv('TRANSCRIPTION_WAIT_SECONDS', 10))
+JOB_TTL_SECONDS = 24 * 60 * 60
+STALE_AFTER = timedelta(minutes=10)
+
+STATUS_PENDING = 'pending'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_SUPERSEDED = 'superseded'
+
+
+class TranscriptionJob(Document):
+    """
+    Transcription of one saved answer
+    """
+    job_id = StringField(primary_key=True)
+    candidate_id = StringField(max_length=100, required=True)
+    question_id = StringField(max_length=100, required=True)
+    audio_file_id = ObjectIdField()
+    status = StringField(max_length=20, default=STATUS_PENDING)
+    transcription = StringField()
+    error = StringField()
+    created_at = DateTimeField(default=datetime.utcnow)
+    finished_at = DateTimeField()
+
+    meta = {
+        'collection': 'transcription_jobs',
+        'indexes': [
+            {'fields': ['created_at'], 'expireAfterSeconds': JOB_TTL_SECONDS},
+            # has_pending_jobs: equality on candidate_id and status, range on created_at
+            {'fields': ['candidate_id', 'status', 'created_at'], 'name': 'candidate_status_created_at'},
+        ],
+    }
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """The per-process pool, created on first use (and again after a fork)"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=TRANSCRIPTION_WORKERS, thread_name_prefix='transcription')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def apply_transcription(candidate_id, question_id, audio_file_id, transcription):
+    """
+    Write a transcript into the audio response it belongs to.
+
+    Returns:
+        bool: False if the answer was re-recorded (or removed) in the meantime
+    """
+    row = Candidate._get_collection().find_one_and_update(
+        {
+            'candidate_id': candidate_id,
+            'audio_responses': {'$elemMatch': {'question_id': question_id, 'audio_file_id': audio_file_id}},
+        },
+        {'$set': {'audio_responses.$.transcription': transcription, 'updated_at': datetime.utcnow()}},
+        projection={'created_by_id': 1},
+    )
+    if row is None:
+        return False
+
+    # get_detailed_report reads transcripts from the audio file metadata
+    get_audio_helper().db[f'{AUDIO_BUCKET}.files'].update_one(
+        {'_id': audio_file_id},
+        {'$set': {'metadata.transcribed_text': transcription}},
+    )
+    invalidate_candidate(candidate_id, row.get('created_by_id'))
+    return True
+
+
+def _run(job_id, candidate_id, question_id, audio_file_id, content, service, on_finished):
+    from .ml_models.voiceToText import transcribe_audio
+
+    jobs = TranscriptionJob._get_collection()
+    try:
+        transcription = transcribe_audio(io.BytesIO(content), service=service) or ''
+        if apply_transcription(candidate_id, question_id, audio_file_id, transcription):
+            jobs.update_one({'_id': job_id}, {'$set': {
+                'status': STATUS_DONE, 'transcription': transcription, 'finished_at': datetime.utcnow(),
+            }})
+        else:
+            jobs.update_one({'_id': job_id}, {'$set': {
+                'status': STATUS_SUPERSEDED,
+                'error': 'The answer was re-recorded before this transcript was ready',
+                'finished_at': datetime.utcnow(),
+            }})
+    except Exception as e:
+        # The answer is already saved; it just stays without a transcript
+        print(f"Transcription failed for candidate {candidate_id}, question {question_id}: {str(e)}")
+        jobs.update_one({'_id': job_id}, {'$set': {
+            'status': STATUS_FAILED, 'error': str(e), 'finished_at': datetime.utcnow(),
+        }})
+    finally:
+        if on_finished:
+            try:
+                on_finished()
+            except Exception as e:
+                print(f"Error after transcription job {job_id}: {str(e)}")
+
+
+def reserve_job(candidate_id, question_id):
+    """
+    Create a pending job before the answer it transcribes is saved, so that a
+    completion check running in between already sees a transcript on its way.
+
+    Returns:
+        str: Job ID, to pass to start_transcription (or cancel_job if the save fails)
+    """
+    job_id = uuid.uuid4().hex
+    TranscriptionJob._get_collection().insert_one({
+        '_id': job_id,
+        'candidate_id': candidate_id,
+        'question_id': question_id,
+        'status': STATUS_PENDING,
+        'created_at': datetime.utcnow(),
+    })
+    return job_id
+
+
+def cancel_job(job_id, error):
+    """Fail a reserved job whose answer could not be saved"""
+    TranscriptionJob._get_collection().update_one(
+        {'_id': job_id, 'status': STATUS_PENDING},
+        {'$set': {'status': STATUS_FAILED, 'error': error, 'finished_at': datetime.utcnow()}},
+    )
+
+
+def start_transcription(job_id, audio_file_id, content, service='gemini',
+                        on_finished=None, wait=TRANSCRIPTION_WAIT_SECONDS):
+    """
+    Transcribe a saved answer in the background, waiting briefly for the result.
+
+    Args:
+        job_id (str): Job from reserve_job, made before the answer was saved
+        audio_file_id: GridFS file ID of the saved recording
+        content (bytes): Raw audio
+        service (str): Transcription service (see voiceToText.transcribe_audio)
+        on_finished (callable): Called once the job has finished, successfully or not
+        wait (float): Seconds to wait for the transcript before returning a pending job
+
+    Returns:
+        dict: The transcription_jobs row; status is 'pending' if it didn't finish within wait,
+            'superseded' if the answer was re-recorded before the transcript was saved
+    """
+    job = TranscriptionJob._get_collection().find_one_and_update(
+        {'_id': job_id},
+        {'$set': {'audio_file_id': audio_file_id}},
+        return_document=ReturnDocument.AFTER,
+    )
+
+    future = _get_executor().submit(
+        _run, job_id, job['candidate_id'], job['question_id'], audio_file_id, content, service, on_finished
+    )
+    try:
+        future.result(timeout=wait)
+    except FutureTimeoutError:
+        pass
+    return get_job(job_id)
+
+
+def get_job(job_id):
+    """The transcription_jobs row, or None; a pending job abandoned by a dead process reads as failed"""
+    row = TranscriptionJob._get_collection().find_one({'_id': job_id})
+    if row and row['status'] == STATUS_PENDING and row['created_at'] < datetime.utcnow() - STALE_AFTER:
+        row.update(status=STATUS_FAILED, error='Transcription was interrupted')
+    return row
+
+
+def has_pending_jobs(candidate_id):
+    """Whether any of the candidate's answers is still being transcribed (stale jobs don't count)"""
+    return TranscriptionJob._get_collection().count_documents({
+        'candidate_id': candidate_id,
+        'status': STATUS_PENDING,
+        'created_at': {'$gte': datetime.utcnow() - STALE_AFTER},
+    }, limit=1) > 0
@@ -0,0 +1,238 @@
+"""
+Streaming resume uploads.
+
+GridFSResumeUploadHandler plugs into Django's multipart parser and writes the
+'resume' part straight into a GridFS file chunk by chunk, hashing it and
+checking the PDF magic bytes as the bytes arrive. Nothing ever holds more than
+one chunk of the upload, so peak memory per upload is bounded by
+UPLOAD_CHUNK_SIZE regardless of file size. PDFs are stored as-is so downloads
+keep serving byte ranges; a compressible type would be compressed on the way in
+and kept that way only if it saves MIN_SAVING (see blob_codecs.py). The hash
+and size limit apply to the raw bytes.
+
+save_streamed_resume() then registers the file as a content-addressed blob
+(see gridfs_models.py), points the candidate at it with one atomic update and
+queues it for text extraction and embedding (see resume_pipeline.py).
+"""
+import hashlib
+import io
+from datetime import datetime
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopFutureHandlers
+from pymongo import ReturnDocument
+
+from .blob_codecs import (
+    CODEC_IDENTITY, MIN_SAVING, DecompressingReader, compressor, is_compressible, preferred_codec,
+)
+from .cache import invalidate_candidate
+from .gridfs_models import GridFSHelper, register_blob, release_blob, STREAM_CHUNK_SIZE
+from .models import Candidate
+from .resume_pipeline import enqueue_resume
+
+RESUME_FIELD = 'resume'
+MAX_RESUME_SIZE = 10 * 1024 * 1024  # 10MB
+PDF_MAGIC = b'%PDF-'
+UPLOAD_CHUNK_SIZE = STREAM_CHUNK_SIZE  # one multipart read == one GridFS chunk
+
+
+class GridFSUploadedFile(UploadedFile):
+    """A resume that has already been written to GridFS; carries its file id and hash, not its bytes"""
+
+    def __init__(self, file_id, sha256, name, content_type, size, codec, stored_size,
+                 charset=None, content_type_extra=None):
+        super().__init__(io.BytesIO(), name, content_type, size, charset, content_type_extra)
+        self.file_id = file_id
+        self.sha256 = sha256
+        self.codec = codec
+        self.stored_size = stored_size
+
+
+class GridFSResumeUploadHandler(FileUploadHandler):
+    """
+    Upload handler that streams the 'resume' file field into GridFS.
+
+    Validation problems (not a PDF, too large, wrong extension) skip the file and are
+    reported through `self.error`; the partial GridFS file is deleted.
+    """
+
+    chunk_size = UPLOAD_CHUNK_SIZE
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.error = None
+        self._grid_in = None
+        self._hash = None
+        self._size = 0
+        self._stored = 0
+        self._head = b''
+        self._helper = None
+        self._codec = None
+        self._compress = None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        if field_name != RESUME_FIELD:
+            return
+
+        if not (file_name or '').lower().endswith('.pdf'):
+            self._fail('Only PDF files are allowed')
+
+        self._helper = self._helper or GridFSHelper()
+        self._grid_in = self._new_grid_file()
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._stored = 0
+        self._head = b''
+        self._codec = preferred_codec() if is_compressible('application/pdf') else CODEC_IDENTITY
+        self._compress = compressor(self._codec) if self._codec != CODEC_IDENTITY else None
+        # Claim this field so the default handlers never buffer it
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self._grid_in is None:
+            return raw_data
+
+        # The magic bytes may straddle chunks, so compare as many as have arrived
+        if len(self._head) < len(PDF_MAGIC):
+            self._head += raw_data[:len(PDF_MAGIC) - len(self._head)]
+            if not PDF_MAGIC.startswith(self._head):
+                self._fail('File is not a valid PDF')
+
+        self._size += len(raw_data)
+        if self._size > MAX_RESUME_SIZE:
+            self._fail('File size must be less than 10MB')
+
+        self._hash.update(raw_data)
+        self._write(self._compress.compress(raw_data) if self._compress else raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self._grid_in is None:
+            return None
+
+        if self._head != PDF_MAGIC:
+            # Too short to hold the magic bytes; file_complete can't raise SkipFile
+            self.error = 'File is not a valid PDF'
+            self._discard()
+            return None
+
+        sha256 = self._hash.hexdigest()
+        if self._compress:
+            self._write(self._compress.flush())
+            if self._stored > file_size * (1 - MIN_SAVING):
+                self._store_uncompressed()
+        self._grid_in.metadata = dict(
+            self._grid_in.metadata or {}, sha256=sha256, codec=self._codec, size=file_size
+        )
+        self._grid_in.close()
+        file_id = self._grid_in._id
+        self._grid_in = None
+
+        return GridFSUploadedFile(
+            file_id=file_id,
+            sha256=sha256,
+            name=self.file_name,
+            content_type='application/pdf',
+            size=file_size,
+            codec=self._codec,
+            stored_size=self._stored,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+        )
+
+    def _new_grid_file(self):
+        return self._helper.fs.new_file(
+            filename=self.file_name,
+            contentType='application/pdf',
+            chunkSize=UPLOAD_CHUNK_SIZE,
+            metadata={'uploaded_at': datetime.utcnow().isoformat(), 'streamed': True},
+        )
+
+    def _store_uncompressed(self):
+        """Rewrite the upload as identity when compression didn't save MIN_SAVING"""
+        self._grid_in.close()
+        compressed_id = self._grid_in._id
+        reader = DecompressingReader(self._helper.get_file(compressed_id), self._codec, UPLOAD_CHUNK_SIZE)
+        self._grid_in = self._new_grid_file()
+        self._codec, self._compress, self._stored = CODEC_IDENTITY, None, 0
+        try:
+            for chunk in iter(lambda: reader.read(UPLOAD_CHUNK_SIZE), b''):
+                self._write(chunk)
+        finally:
+            reader.close()
+            self._helper.delete_file(compressed_id)
+
+    def _write(self, data):
+        if data:
+            self._grid_in.write(data)
+            self._stored += len(data)
+
+    def upload_interrupted(self):
+        self._discard()
+
+    def _fail(self, message):
+        # SkipFile drops the rest of this part unread-into-memory but keeps parsing the other fields
+        self.error = message
+        self._discard()
+        raise SkipFile()
+
+    def _discard(self):
+        if self._grid_in is not None:
+            file_id = self._grid_in._id
+            try:
+                self._grid_in.abort()
+            except Exception:
+                self._helper.delete_file(file_id)
+            self._grid_in = None
+
+
+def save_streamed_resume(candidate_id, uploaded):
+    """
+    Attach a streamed upload to a candidate with a single atomic update.
+
+    Args:
+        candidate_id (str): Candidate ID
+        uploaded (GridFSUploadedFile): File produced by GridFSResumeUploadHandler
+
+    Returns:
+        dict: the candidate's list row after the update, or None if the candidate doesn't exist
+            (the uploaded file is released in that case)
+    """
+    helper = GridFSHelper()
+    file_id = register_blob(
+        uploaded.sha256, uploaded.file_id, uploaded.size, 'application/pdf', helper,
+        codec=uploaded.codec, stored_size=uploaded.stored_size,
+    )
+
+    changes = {
+        'resume_file_id': file_id,
+        'resume_sha256': uploaded.sha256,
+        'resume_filename': uploaded.name,
+        'resume_content_type': 'application/pdf',
+        'resume_size': str(uploaded.size),
+        'has_resume': True,
+        'updated_at': datetime.utcnow(),
+    }
+    projection = {Candidate._fields[name].db_field: 1 for name in Candidate.LIST_FIELDS}
+    projection.update({'resume_sha256': 1, 'resume_file_id': 1})
+
+    # BEFORE, so the previous resume reference can be released after the switch
+    before = Candidate._get_collection().find_one_and_update(
+        {'candidate_id': candidate_id, 'is_active': True},
+        {'$set': changes, '$unset': {'resume_data': ''}},
+        projection=projection,
+        return_document=ReturnDocument.BEFORE,
+    )
+    if before is None:
+        release_blob(uploaded.sha256, helper)
+        return None
+
+    if before.get('resume_sha256'):
+        release_blob(before['resume_sha256'], helper)
+    elif before.get('resume_file_id') and before['resume_file_id'] != file_id:
+        helper.delete_file(before['resume_file_id'])
+
+    invalidate_candidate(candidate_id, before.get('created_by_id'))
+    enqueue_resume(uploaded.sha256, file_id)
+    return dict(before, **changes)
@@ -1,13 +1,23 @@
 from django.urls import path
 from .views import (
     CandidateListCreateView, 
+    bulk_invite_candidates,
+    candidate_events,
+    get_candidate_stats,
+    search_candidates_view,
     validate_candidate_id, 
     download_resume, 
+    resume_thumbnail,
     ResumeUploadView, 
     auto_generate_questions,
     get_candidate_questions,
     transcribe_audio_view,
     save_audio_response,
+    create_audio_upload,
+    audio_upload,
+    finalize_audio_upload,
+    submit_audio_answer,
+    transcription_job_status,
     manual_evaluate_candidate,
     get_detailed_report,
     start_interview,
@@ -17,13 +27,23 @@ from .views import (
 
 urlpatterns = [
     path('', CandidateListCreateView.as_view(), name='candidate-list-create'),
+    path('bulk-invite/', bulk_invite_candidates, name='bulk-invite-candidates'),
+    path('stats/', get_candidate_stats, name='candidate-stats'),
+    path('search/', search_candidates_view, name='candidate-search'),
+    path('events/', candidate_events, name='candidate-events'),
     path('validate/', validate_candidate_id, name='validate-candidate-id'),
     path('upload-resume/', ResumeUploadView.as_view(), name='upload-resume'),
     path('download-resume/<str:candidate_id>/', download_resume, name='download-resume'),
+    path('resume-thumbnails/<str:sha256>/', resume_thumbnail, name='resume-thumbnail'),
     path('auto-generate-questions/', auto_generate_questions, name='auto-generate-questions'),
     path('questions/<str:candidate_id>/', get_candidate_questions, name='get-candidate-questions'),
     path('transcribe-audio/', transcribe_audio_view, name='transcribe-audio'),
     path('save-audio-response/', save_audio_response, name='save-audio-response'),
+    path('audio-uploads/', create_audio_upload, name='create-audio-upload'),
+    path('audio-uploads/<str:upload_id>/', audio_upload, name='audio-upload'),
+    path('audio-uploads/<str:upload_id>/finalize/', finalize_audio_upload, name='finalize-audio-upload'),
+    path('submit-audio-answer/', submit_audio_answer, name='submit-audio-answer'),
+    path('transcription-jobs/<str:job_id>/', transcription_job_status, name='transcription-job'),
     path('manual-evaluate/', manual_evaluate_candidate, name='manual-evaluate-candidate'),
     path('detailed-report/<str:candidate_id>/', get_detailed_report, name='detailed-report'),
     path('start-interview/', start_interview, name='start-interview'),
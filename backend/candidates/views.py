@@ -1,44 +1,53 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.decorators import api_view, permission_classes, renderer_classes, parser_classes
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.views import APIView
-from django.core.mail import send_mail
-from django.conf import settings
-from django.http import HttpResponse
-from mongoengine.errors import DoesNotExist, ValidationError
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from mongoengine.errors import DoesNotExist, ValidationError, NotUniqueError
 from datetime import datetime
 import os
 import uuid
 from datetime import datetime
-import gridfs
-import pymongo
+import queue
+from pymongo import ReturnDocument
 from .models import Candidate
-from .serializers import CandidateSerializer, CandidateCreateSerializer
+from .serializers import CandidateSerializer, CandidateCreateSerializer, candidate_summary, serialize_candidate_row
+from .cache import list_cache_key, get_cached_list, cache_list, stats_cache_key, get_cached_stats, cache_stats, get_cached_summary, cache_summary, invalidate_candidate
+from .pagination import paginate, parse_page_size, parse_sort, order_by, PaginationError
+from .filters import apply_filters, FilterError
+from .sync import parse_since, changes_since, list_etag, SyncError
+from .stats import recruiter_stats
+from .uploads import GridFSResumeUploadHandler, save_streamed_resume
+from .gridfs_models import GridFSHelper, attach_resume, open_resume, parse_range, iter_file_range, RangeNotSatisfiable
+from .resume_text import get_resume_text
+from .thumbnails import get_thumbnail
+from .blob_codecs import decode_audio_base64
+from .audio_normalize import AudioNormalizationError
+from .transcription_jobs import (
+    reserve_job, cancel_job, start_transcription, get_job, has_pending_jobs, STATUS_PENDING as TRANSCRIPTION_PENDING,
+)
+from .audio_store import store_audio, delete_audio, get_audio_helper, MAX_AUDIO_SIZE
+from .audio_uploads import (
+    create_upload, get_upload, append_chunk, claim_upload, release_upload, delete_upload,
+    UploadError, OffsetMismatch, MAX_CHUNK_SIZE,
+)
+from .resume_pipeline import get_resume_retriever
+from .invitations import bulk_invite, parse_invite_rows, invitation_email, get_invitation_mailer, InviteError
+from .search import search_candidates, parse_search_limit, SearchError
+from .change_feed import get_change_feed, format_sse, EventStreamRenderer, HEARTBEAT_INTERVAL
 from candidates.ml_models.voiceToText import transcribe_audio
 from candidates.ml_models.evaluate import evaluate_candidate_answer as eval_function
+from hireiq_backend.mongodb_utils import get_database
 
 # MongoDB connection helper
 def get_mongodb_connection():
-    """Get MongoDB database connection for GridFS operations"""
+    """Get the MongoDB database for GridFS operations, on the process-wide pooled client"""
     try:
-        mongodb_url = os.getenv('MONGODB_URL')
-        mongodb_name = os.getenv('MONGODB_NAME', 'hireiq_db')
-        
-        if not mongodb_url:
-            # Fallback to localhost if no URL provided
-            mongodb_url = 'mongodb://localhost:27017/'
-        
-        # Replace <db_password> placeholder with actual password if needed
-        if '<db_password>' in mongodb_url:
-            db_password = os.getenv('MONGODB_PASSWORD')
-            if db_password:
-                mongodb_url = mongodb_url.replace('<db_password>', db_password)
-        
-        client = pymongo.MongoClient(mongodb_url)
-        db = client[mongodb_name]
-        return db
+        return get_database()
     except Exception as e:
         print(f"Error connecting to MongoDB: {e}")
         return None
@@ -55,8 +64,8 @@ class CandidateListCreateView(generics.ListCreateAPIView):
         try:
             user_id = str(self.request.user.id)
             
-            # Get candidates created by the current user
-            candidates = Candidate.objects.filter(created_by_id=user_id)
+            # Get candidates created by the current user, without resume/audio blobs
+            candidates = Candidate.list_for_recruiter(user_id)
             
             return candidates
         except Exception as e:
@@ -70,19 +79,83 @@ class CandidateListCreateView(generics.ListCreateAPIView):
                     status=status.HTTP_401_UNAUTHORIZED
                 )
             
-            queryset = self.get_queryset()
+            user_id = str(request.user.id)
+            query_string = request.META.get('QUERY_STRING', '')
             
-            # Disable auto-evaluation during list to prevent inconsistencies during debugging
+            # Cache hits answer both 304s and full bodies without touching MongoDB
+            cache_key = list_cache_key(user_id, query_string)
+            cached = get_cached_list(cache_key)
+            etag = cached['etag'] if cached else list_etag(user_id, query_string)
             
-            serializer = CandidateSerializer(queryset, many=True)
+            # Answer unchanged lists with 304 before reading any candidate rows
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return not_modified
             
-            return Response(serializer.data)
+            if cached:
+                response = Response(cached['data'])
+            else:
+                response = self._list_response(request, self.get_queryset())
+                if response.status_code == status.HTTP_200_OK:
+                    cache_list(cache_key, etag, response.data)
+            
+            if response.status_code == status.HTTP_200_OK:
+                response['ETag'] = etag
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
         except Exception as e:
             return Response(
                 {'error': 'Failed to fetch candidates'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    def _list_response(self, request, queryset):
+        # Disable auto-evaluation during list to prevent inconsistencies during debugging
+        
+        # Dashboard pollers send back the previous sync_token and only get what changed
+        updated_since = request.query_params.get('updated_since')
+        if updated_since is not None:
+            try:
+                since = parse_since(updated_since)
+            except SyncError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            changed, removed, sync_token = changes_since(queryset, since, str(request.user.id))
+            return Response({
+                'results': [serialize_candidate_row(row) for row in changed],
+                'removed': removed,
+                'sync_token': sync_token.isoformat(),
+            })
+        
+        # Status, score, role, company and email filters run in MongoDB, not in the dashboard
+        try:
+            queryset = apply_filters(queryset, request.query_params)
+            sort = parse_sort(request.query_params.get('sort'))
+        except (FilterError, PaginationError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Clients that ask for a page get keyset pagination; old clients keep the plain list
+        cursor = request.query_params.get('cursor')
+        limit = request.query_params.get('limit')
+        if cursor is not None or limit is not None:
+            try:
+                page, next_cursor = paginate(queryset, cursor=cursor or None, limit=parse_page_size(limit), sort=sort)
+            except PaginationError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            return Response({
+                'results': [serialize_candidate_row(row) for row in page],
+                'next_cursor': next_cursor,
+            })
+        
+        if request.query_params.get('sort'):
+            field, _ = sort
+            if field != 'created_at':
+                queryset = queryset.filter(**{f'{field}__ne': None})
+            queryset = order_by(queryset, sort)
+        
+        return Response([serialize_candidate_row(row) for row in queryset])
+    
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         if serializer.is_valid():
@@ -91,91 +164,34 @@ class CandidateListCreateView(generics.ListCreateAPIView):
                 user_id = str(request.user.id)
                 candidate_email = serializer.validated_data['email']
                 
+                already_invited = Response(
+                    {'error': f'You have already invited candidate "{candidate_email}". Please check your candidates list.'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+                
                 existing_candidate = Candidate.objects.filter(
                     email=candidate_email,
                     created_by_id=user_id
                 ).first()
                 
                 if existing_candidate:
-                    return Response(
-                        {'error': f'You have already invited candidate "{candidate_email}". Please check your candidates list.'}, 
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                
-                candidate = serializer.save()
-                
-                # Send email to candidate with their ID
-                company_name = serializer.validated_data.get('company', 'Our Organization')
-                role_name = serializer.validated_data.get('role', 'the position')
-                
-                subject = f'🚀 Interview Invitation - {role_name} at {company_name}'
-                message = f'''
-Dear Candidate,
-
-We are delighted to invite you to participate in our AI-powered technical interview process for {role_name} at {company_name}.
-
-📋 YOUR INTERVIEW DETAILS:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-🔐 Candidate ID: {candidate.candidate_id}
-🎯 Position: {role_name}
-🏢 Company: {company_name}
-🌐 Interview Portal: http://localhost:3000/candidate
-
-✨ WHAT TO EXPECT:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-• AI-powered personalized interview experience
-• Technical questions tailored to your background
-• Resume-based intelligent question generation  
-• Voice-enabled interview interface
-• Comprehensive skill assessment
-• Duration: 15-20 minutes
-
-📝 PREPARATION TIPS:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-✓ Ensure you have your updated resume ready (PDF format)
-✓ Test your microphone and speakers beforehand
-✓ Find a quiet, well-lit environment
-✓ Have a stable internet connection
-✓ Keep your Candidate ID handy: {candidate.candidate_id}
-
-🔗 GETTING STARTED:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-1. Visit: http://localhost:3000/candidate
-2. Enter your Candidate ID: {candidate.candidate_id}
-3. Upload your resume
-4. Begin your AI interview
-
-⚡ NEXT STEPS:
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-• Complete your interview at your convenience
-• Our AI will evaluate your responses in real-time
-• Results will be shared within 3-5 business days
-• You'll receive detailed feedback on your performance
-
-Need assistance? Simply reply to this email and our team will be happy to help.
-
-We look forward to learning more about your technical expertise!
-
-Best regards,
-The HireIQ Team
-{company_name}
-
-──────────────────────────────────────────────────
-🤖 Powered by HireIQ - Next-Generation AI Recruitment
-This is an automated message from our AI-powered recruitment platform.
-                '''
+                    return already_invited
                 
                 try:
-                    result = send_mail(
-                        subject,
-                        message,
-                        settings.EMAIL_HOST_USER,
-                        [candidate.email],
-                        fail_silently=False,
+                    candidate = serializer.save()
+                except NotUniqueError:
+                    # A concurrent invite got in between the check and the insert
+                    return already_invited
+                
+                # Queue the invitation; the background mailer sends it so SMTP never blocks the request
+                get_invitation_mailer().enqueue([
+                    invitation_email(
+                        candidate.candidate_id,
+                        candidate.email,
+                        serializer.validated_data.get('company'),
+                        serializer.validated_data.get('role'),
                     )
-                except Exception as e:
-                    # Log the error but don't fail the creation
-                    pass  # Email failure shouldn't prevent candidate creation
+                ])
                 
                 return Response(
                     CandidateSerializer(candidate).data, 
@@ -195,6 +211,130 @@ This is an automated message from our AI-powered recruitment platform.
                 )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_invite_candidates(request):
+    """
+    Invite many candidates at once.
+    
+    Accepts a CSV upload (multipart 'file', columns: email, company, role, hr_prompt),
+    a raw text/csv body, or JSON {"candidates": [...], "company": ..., "role": ...}
+    where entries are emails or {email, company, role, hr_prompt} objects.
+    Returns one result per row; invitation emails are queued, not sent inline.
+    """
+    try:
+        rows, defaults = parse_invite_rows(request)
+        results = bulk_invite(str(request.user.id), rows, defaults)
+    except InviteError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        print(f"Bulk invite failed: {str(e)}")
+        return Response(
+            {'error': f'Failed to invite candidates: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    
+    return Response(
+        {'total': len(results), 'summary': summary, 'results': results},
+        status=status.HTTP_201_CREATED if summary.get('created') else status.HTTP_200_OK
+    )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_candidate_stats(request):
+    """
+    Dashboard statistics for the current recruiter: per-status counts, average score,
+    score histogram and per-role breakdown, computed by one MongoDB aggregation.
+    
+    Cached until the recruiter's next candidate write and served with an ETag, so
+    dashboard refreshes revalidate with a 304 instead of re-running the aggregation.
+    """
+    try:
+        user_id = str(request.user.id)
+        cache_key = stats_cache_key(user_id)
+        cached = get_cached_stats(cache_key)
+        etag = cached['etag'] if cached else list_etag(user_id, 'stats')
+        
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        if cached:
+            data = cached['data']
+        else:
+            data = recruiter_stats(user_id)
+            cache_stats(cache_key, etag, data)
+        
+        response = Response(data, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    except Exception as e:
+        return Response(
+            {'error': f'Failed to compute candidate stats: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_candidates_view(request):
+    """
+    Full-text search over the current recruiter's candidates: email, company, role,
+    interview transcriptions and evaluation feedback. Returns hits ranked by relevance
+    with <mark>-highlighted snippets.
+    
+    Query params: q (required), limit (default 20, max 50)
+    """
+    try:
+        limit = parse_search_limit(request.query_params.get('limit'))
+        query = request.query_params.get('q', '')
+        hits = search_candidates(str(request.user.id), query, limit)
+        return Response({'query': query, 'results': hits}, status=status.HTTP_200_OK)
+    except SearchError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        print(f"Candidate search failed: {str(e)}")
+        return Response(
+            {'error': f'Failed to search candidates: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([EventStreamRenderer])
+def candidate_events(request):
+    """
+    Server-sent event stream of changes to the current recruiter's candidates.
+    Events: candidate_created, candidate_updated, interview_started, interview_completed,
+    interview_terminated, evaluation_completed - each carrying the list row for the candidate -
+    and candidate_deleted, carrying only the id, candidate_id and is_active=false.
+    """
+    recruiter_id = str(request.user.id)
+    feed = get_change_feed()
+    listener = feed.subscribe(recruiter_id)
+    
+    def event_stream():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    payload = listener.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield format_sse(payload)
+        finally:
+            feed.unsubscribe(recruiter_id, listener)
+    
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
 @api_view(['POST'])
 @permission_classes([])
 def validate_candidate_id(request):
@@ -207,21 +347,27 @@ def validate_candidate_id(request):
         )
     
     try:
-        candidate = Candidate.objects.get(candidate_id=candidate_id, is_active=True)
+        summary = get_cached_summary(candidate_id)
+        if summary is None or not summary['is_active']:
+            row = Candidate.get_active_row(candidate_id, 'interview_terminated', 'termination_reason', 'interview_completed')
+            if row is None:
+                raise DoesNotExist()
+            summary = candidate_summary(row)
+            cache_summary(candidate_id, summary)
         
         # Check if interview has been terminated due to violations
-        if candidate.interview_terminated:
+        if summary['interview_terminated']:
             return Response(
                 {
                     'valid': False, 
-                    'error': f'Interview access has been revoked. Reason: {candidate.termination_reason or "Security violation"}',
+                    'error': f'Interview access has been revoked. Reason: {summary["termination_reason"] or "Security violation"}',
                     'terminated': True
                 }, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
         # Check if interview has already been completed
-        if candidate.interview_completed:
+        if summary['interview_completed']:
             return Response(
                 {
                     'valid': False, 
@@ -232,7 +378,7 @@ def validate_candidate_id(request):
             )
         
         return Response(
-            {'valid': True, 'candidate': CandidateSerializer(candidate).data}, 
+            {'valid': True, 'candidate': summary['candidate']}, 
             status=status.HTTP_200_OK
         )
     except DoesNotExist:
@@ -253,15 +399,19 @@ class ResumeUploadView(APIView):
     def post(self, request, *args, **kwargs):
         print(f"Upload request received - Method: {request.method}")
         print(f"Content-Type: {request.content_type}")
-        print(f"Request data keys: {list(request.data.keys()) if hasattr(request, 'data') else 'No data'}")
-        print(f"Request FILES keys: {list(request.FILES.keys()) if hasattr(request, 'FILES') else 'No FILES'}")
+        
+        # Stream the PDF straight into GridFS while the multipart body is parsed,
+        # instead of buffering it in memory or a temp file first
+        upload_handler = GridFSResumeUploadHandler(request._request)
+        request._request.upload_handlers = [upload_handler]
         
         candidate_id = request.data.get('candidate_id')
         resume_file = request.FILES.get('resume')
         
-        if not candidate_id:
+        # Extension, PDF magic bytes and the 10MB limit are checked while streaming
+        if upload_handler.error:
             return Response(
-                {'error': 'Candidate ID is required'}, 
+                {'error': upload_handler.error}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
@@ -271,58 +421,34 @@ class ResumeUploadView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Validate file type (PDF only)
-        if not resume_file.name.lower().endswith('.pdf'):
-            return Response(
-                {'error': 'Only PDF files are allowed'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Validate file size (10MB max)
-        if resume_file.size > 10 * 1024 * 1024:
+        if not candidate_id:
+            GridFSHelper().delete_file(resume_file.file_id)
             return Response(
-                {'error': 'File size must be less than 10MB'}, 
+                {'error': 'Candidate ID is required'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         try:
-            # Get candidate
-            candidate = Candidate.objects.get(candidate_id=candidate_id, is_active=True)
-            print(f"Found candidate: {candidate.email}")
-            
-            # Read file data
-            file_data = resume_file.read()
-            print(f"File data size: {len(file_data)} bytes")
-            print(f"File name: {resume_file.name}")
-            print(f"File content type: {resume_file.content_type}")
-            
-            # Update candidate record with binary data
-            candidate.resume_filename = resume_file.name
-            candidate.resume_data = file_data
-            candidate.resume_content_type = resume_file.content_type or 'application/pdf'
-            candidate.resume_size = str(resume_file.size)
-            candidate.save()
-            print(f"Successfully saved resume for candidate: {candidate.candidate_id}")
+            print(f"File name: {resume_file.name}, size: {resume_file.size} bytes, sha256: {resume_file.sha256}")
             
-            # Verify the save worked
-            saved_candidate = Candidate.objects.get(candidate_id=candidate_id)
-            print(f"Verification - Has resume data: {bool(saved_candidate.resume_data)}")
-            print(f"Verification - Resume size: {saved_candidate.resume_size}")
+            # One atomic $set on the candidate; no verification re-read
+            row = save_streamed_resume(candidate_id, resume_file)
+            if row is None:
+                print(f"Candidate not found: {candidate_id}")
+                return Response(
+                    {'error': 'Invalid candidate ID'}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            print(f"Successfully saved resume for candidate: {candidate_id} (GridFS file {row['resume_file_id']})")
             
             return Response(
                 {
                     'message': 'Resume uploaded successfully',
-                    'candidate': CandidateSerializer(candidate).data
+                    'candidate': serialize_candidate_row(row)
                 }, 
                 status=status.HTTP_200_OK
             )
             
-        except DoesNotExist:
-            print(f"Candidate not found: {candidate_id}")
-            return Response(
-                {'error': 'Invalid candidate ID'}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
         except Exception as e:
             print(f"Upload error: {str(e)}")
             import traceback
@@ -376,12 +502,8 @@ def upload_resume(request):
         # Read file data
         file_data = resume_file.read()
         
-        # Update candidate record with binary data
-        candidate.resume_filename = resume_file.name
-        candidate.resume_data = file_data
-        candidate.resume_content_type = 'application/pdf'
-        candidate.resume_size = str(resume_file.size)
-        candidate.save()
+        # Store the PDF in GridFS and reference it from the candidate
+        attach_resume(candidate, file_data, resume_file.name, 'application/pdf')
         
         return Response(
             {
@@ -405,26 +527,72 @@ def upload_resume(request):
 @api_view(['GET'])
 @permission_classes([])
 def download_resume(request, candidate_id):
+    """
+    Stream a candidate's resume PDF from GridFS.
+    
+    Supports single-range Range requests (206) so PDF viewers can load pages
+    progressively, and a content-hash ETag so unchanged resumes revalidate with a 304.
+    Compressed resumes can't seek cheaply, so they are always sent whole (200) and
+    advertise Accept-Ranges: none.
+    Pass ?inline=1 to display in the browser instead of downloading.
+    """
     try:
-        # Get candidate
-        candidate = Candidate.objects.get(candidate_id=candidate_id, is_active=True)
-        
-        if not candidate.resume_data:
+        # Get candidate metadata only; the PDF itself is streamed from GridFS
+        candidate = Candidate.objects.filter(candidate_id=candidate_id, is_active=True).only(
+            'candidate_id', 'resume_filename', 'resume_content_type', 'resume_file_id', 'has_resume'
+        ).as_pymongo().first()
+        if candidate is None:
+            raise DoesNotExist()
+        
+        opened = open_resume(candidate_id) if Candidate.row_has_resume(candidate) else None
+        if not opened:
             return Response(
                 {'error': 'No resume found for this candidate'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+        resume_file, length, sha256 = opened
+        
+        etag = f'"{sha256}"' if sha256 else None
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            resume_file.close()
+            return not_modified
+        
+        # If-Range: only honor the range when the client's copy is still current
+        range_header = request.META.get('HTTP_RANGE')
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if range_header and if_range and if_range != etag:
+            range_header = None
+        supports_ranges = resume_file.seekable()
+        if not supports_ranges:
+            range_header = None
         
-        # Create HTTP response with PDF data
-        response = HttpResponse(
-            candidate.resume_data, 
-            content_type=candidate.resume_content_type or 'application/pdf'
+        try:
+            byte_range = parse_range(range_header, length)
+        except RangeNotSatisfiable:
+            resume_file.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{length}'
+            return response
+        
+        start, end = byte_range or (0, length - 1)
+        response = StreamingHttpResponse(
+            iter_file_range(resume_file, start, end) if length else iter(()),
+            status=206 if byte_range else 200,
+            content_type=candidate.get('resume_content_type') or 'application/pdf'
         )
+        response['Content-Length'] = end - start + 1 if length else 0
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{length}'
+        response['Accept-Ranges'] = 'bytes' if supports_ranges else 'none'
+        if etag:
+            response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
         
         # Set filename for download
-        filename = candidate.resume_filename or f"{candidate_id}_resume.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        response['Content-Length'] = candidate.resume_size or len(candidate.resume_data)
+        filename = candidate.get('resume_filename') or f"{candidate_id}_resume.pdf"
+        disposition = 'inline' if request.query_params.get('inline') else 'attachment'
+        response['Content-Disposition'] = f'{disposition}; filename="{filename}"'
         
         return response
         
@@ -439,6 +607,46 @@ def download_resume(request, candidate_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['GET'])
+@permission_classes([])
+def resume_thumbnail(request, sha256):
+    """
+    Serve the first-page thumbnail of a resume, addressed by the resume's SHA-256.
+    
+    The image behind a hash never changes, so it is sent with a year-long immutable
+    cache lifetime; candidate payloads link here through resume_thumbnail_url.
+    """
+    try:
+        sha256 = sha256.lower()
+        if len(sha256) != 64 or any(c not in '0123456789abcdef' for c in sha256):
+            return Response(
+                {'error': 'Invalid resume hash'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        etag = f'"{sha256}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        thumbnail = get_thumbnail(sha256)
+        if not thumbnail or thumbnail.get('error') or not thumbnail.get('data'):
+            return Response(
+                {'error': 'No preview available for this resume'}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        response = HttpResponse(bytes(thumbnail['data']), content_type=thumbnail['content_type'])
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=31536000, immutable=True)
+        return response
+        
+    except Exception as e:
+        return Response(
+            {'error': f'Preview failed: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 @api_view(['GET'])
 @permission_classes([])
 def get_candidate_questions(request, candidate_id):
@@ -446,17 +654,19 @@ def get_candidate_questions(request, candidate_id):
     Get saved questions for a candidate.
     """
     try:
-        candidate = Candidate.objects.get(candidate_id=candidate_id, is_active=True)
+        row = Candidate.get_active_row(candidate_id, 'interview_questions')
+        if row is None:
+            raise DoesNotExist()
         
-        if not candidate.interview_questions:
+        if not row.get('interview_questions'):
             return Response(
                 {'error': 'No questions found for this candidate'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         
         return Response({
-            "questions": candidate.interview_questions,
-            "candidate": CandidateSerializer(candidate).data
+            "questions": row['interview_questions'],
+            "candidate": serialize_candidate_row(row)
         }, status=status.HTTP_200_OK)
         
     except DoesNotExist:
@@ -502,7 +712,7 @@ def auto_generate_questions(request):
                 'completed': True
             }, status=status.HTTP_403_FORBIDDEN)
         
-        if not candidate.resume_data:
+        if not (candidate.has_resume or candidate.resume_file_id or candidate.resume_data):
             return Response(
                 {'error': 'No resume found for this candidate'}, 
                 status=status.HTTP_404_NOT_FOUND
@@ -537,13 +747,16 @@ def auto_generate_questions(request):
         # Use the stored HR prompt if available, otherwise fall back to default SDE instructions
         hr_instructions = candidate.hr_prompt if candidate.hr_prompt and candidate.hr_prompt.strip() else get_default_sde_instructions()
         
-        # Create a file-like object from binary data
-        import io
-        resume_file = io.BytesIO(candidate.resume_data)
-        resume_file.name = candidate.resume_filename or f"{candidate_id}_resume.pdf"
+        # Chunks were embedded when the resume was uploaded; only retrieval happens here
+        retriever = get_resume_retriever(candidate_id)
+        if retriever is None:
+            return Response(
+                {'error': 'No resume found for this candidate'}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
         
         from candidates.ml_models.questions import get_questions
-        questions = get_questions(resume_file, hr_instructions, company, role)
+        questions = get_questions(retriever, hr_instructions, company, role)
         
         # Save questions and interview setup to candidate record
         candidate.company = company
@@ -608,36 +821,43 @@ EVALUATION CRITERIA:
 Remember: We're looking for your thought process, not just the right answer. Good luck!
 """
 
-def check_and_auto_evaluate(candidate):
+def check_and_auto_evaluate(row):
     """
     Check if the candidate has completed the interview and automatically trigger evaluation if needed.
     Returns True if interview is completed, False otherwise.
+    
+    Args:
+        row (dict): Raw candidate with _id, candidate_id, interview_questions, evaluation_score
+            and audio_responses_count
     """
+    candidate_id = row.get('candidate_id')
     try:
         # Check if candidate has interview questions
-        if not candidate.interview_questions:
+        interview_questions = row.get('interview_questions')
+        if not interview_questions:
             return False
         
         # Get the number of questions from interview_questions
-        total_questions = len(candidate.interview_questions)
+        total_questions = len(interview_questions)
         
-        # Get the number of audio responses
-        response_count = len(candidate.audio_responses) if candidate.audio_responses else 0
+        # Get the number of audio responses (counted from the answers on documents that predate the field)
+        response_count = Candidate.row_answer_count(row)
         
         # Check if all questions have been answered
         interview_completed = response_count >= total_questions
         
-        # If interview is completed and no evaluation score exists, trigger auto-evaluation
-        if interview_completed and not candidate.evaluation_score:
+        # If interview is completed and no evaluation score exists, trigger auto-evaluation,
+        # unless an answer is still being transcribed: its job re-checks when it finishes
+        if interview_completed and not row.get('evaluation_score') and not has_pending_jobs(candidate_id):
             try:
                 # Trigger evaluation in the background
                 from threading import Thread
-                thread = Thread(target=auto_evaluate_candidate, args=(candidate.candidate_id,))
+                thread = Thread(target=auto_evaluate_candidate, args=(candidate_id,))
                 thread.daemon = True
                 thread.start()
-                print(f"Auto-evaluation triggered for candidate {candidate.candidate_id}")
+                print(f"Auto-evaluation triggered for candidate {candidate_id}")
             except Exception as e:
-                print(f"Failed to trigger auto-evaluation for candidate {candidate.candidate_id}: {str(e)}")
+                print(f"Failed to trigger auto-evaluation for candidate {candidate_id}: {str(e)}")
         
         return interview_completed
         
@@ -651,15 +871,14 @@ def auto_evaluate_candidate(candidate_id):
     """
     try:
         from .ml_models.evaluate import evaluate_candidate_answer as eval_function
-        from .gridfs_models import get_resume_content
         from datetime import datetime
         
         # Get candidate
         candidate = Candidate.objects.get(candidate_id=candidate_id)
         
-        # Get resume content
-        resume_content = get_resume_content(candidate_id)
-        if not resume_content:
+        # Get resume text
+        resume_text = get_resume_text(candidate_id)
+        if not resume_text:
             print(f"No resume found for candidate {candidate_id} - skipping auto-evaluation")
             return
         
@@ -694,7 +913,7 @@ def auto_evaluate_candidate(candidate_id):
             answer = evaluation['answer']
             
             try:
-                evaluation_result = eval_function(question, answer, resume_content)
+                evaluation_result = eval_function(question, answer, resume_text['text'])
                 
                 if not evaluation_result.get('error'):
                     total_score += evaluation_result.get('overall_score', 0)
@@ -774,6 +993,8 @@ def transcribe_audio_view(request):
             'audio_size_bytes': audio_file.size,
             'message': 'Transcription successful'
         }, status=status.HTTP_200_OK)
+    except AudioNormalizationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         import traceback
         print(f"Transcription error with {service}: {str(e)}")
@@ -793,16 +1014,153 @@ def transcribe_audio_view(request):
                 'service_attempted': service
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def record_audio_response(candidate_id, question_id, question_text, content, transcription, duration, filename=None,
+                          check_completion=True):
+    """
+    Store an answer's audio in GridFS and record it on the candidate, replacing any
+    earlier answer to the same question, then check whether the interview is complete.
+    
+    The candidate is updated in place with one atomic update (never loaded and
+    re-saved), so concurrent or retried saves of the same answer can't duplicate it.
+    
+    Args:
+        candidate_id (str): Candidate ID
+        question_id (str): ID of the question answered
+        question_text (str): Text of the question answered
+        content (bytes): Raw audio, or None to record the answer without audio
+        transcription (str): Transcript of the answer
+        duration (float): Length of the answer in seconds
+        filename (str): Original filename of the recording
+        check_completion (bool): Check for a completed interview now; pass False when the
+            transcript is still to come (check_interview_completion runs once it is in)
+    
+    Returns:
+        tuple: (number of answers the candidate has saved, the stored audio response)
+    
+    Raises:
+        Candidate.DoesNotExist: No active candidate with this ID
+    """
+    response_data = {
+        "question_id": question_id,
+        "question_text": question_text,
+        "audio_file_id": None,
+        "transcription": transcription or "",
+        "duration": duration,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    helper = get_audio_helper()
+    if content:
+        response_data.update(store_audio(
+            candidate_id, question_id, question_text, content,
+            transcription=transcription,
+            filename=filename,
+            helper=helper,
+        ))
+    
+    collection = Candidate._get_collection()
+    projection = {'created_by_id': 1, 'interview_questions': 1, 'evaluation_score': 1, 'audio_responses_count': 1}
+    active = {'candidate_id': candidate_id, 'is_active': True}
+    replaced = None
+    try:
+        # A retry can race its own first attempt, so alternate until one of the two applies
+        for attempt in range(3):
+            # Answer already saved: overwrite that element, returning the old one
+            row = collection.find_one_and_update(
+                dict(active, **{'audio_responses.question_id': question_id}),
+                {'$set': {'audio_responses.$': response_data, 'updated_at': datetime.utcnow()}},
+                projection=dict(projection, audio_responses={'$elemMatch': {'question_id': question_id}}),
+                return_document=ReturnDocument.BEFORE,
+            )
+            if row is not None:
+                replaced = (row.get('audio_responses') or [None])[0]
+                break
+            
+            # First answer to this question. The count is recomputed from the array rather than
+            # incremented, so documents written before the field existed get the right number
+            row = collection.find_one_and_update(
+                dict(active, **{'audio_responses.question_id': {'$ne': question_id}}),
+                [
+                    {'$set': {
+                        'audio_responses': {'$concatArrays': [
+                            {'$ifNull': ['$audio_responses', []]}, [{'$literal': response_data}],
+                        ]},
+                        'updated_at': datetime.utcnow(),
+                    }},
+                    {'$set': {'audio_responses_count': {'$size': '$audio_responses'}}},
+                ],
+                projection=projection,
+                return_document=ReturnDocument.AFTER,
+            )
+            if row is not None:
+                break
+            
+            if not collection.count_documents(active, limit=1):
+                raise Candidate.DoesNotExist()
+        else:
+            raise RuntimeError('Audio response kept changing while being saved')
+    except Exception:
+        delete_audio(response_data, helper)
+        raise
+    
+    invalidate_candidate(candidate_id, row.get('created_by_id'))
+    
+    # The re-recorded answer's old audio is no longer referenced
+    delete_audio(replaced, helper)
+    
+    # Check if interview is completed and trigger auto-evaluation if needed
+    if check_completion:
+        try:
+            check_and_auto_evaluate(dict(row, candidate_id=candidate_id))
+        except Exception as e:
+            print(f"Error checking auto-evaluation for candidate {candidate_id}: {str(e)}")
+    
+    return Candidate.row_answer_count(row), response_data
+
+def check_interview_completion(candidate_id):
+    """Re-read a candidate and trigger auto-evaluation if every question is answered and transcribed"""
+    row = Candidate.get_active_row(candidate_id, 'interview_questions')
+    if row:
+        check_and_auto_evaluate(dict(row, candidate_id=candidate_id))
+
+def transcription_response(job_id, candidate_id, response_data, content, service, response_count):
+    """
+    Transcribe a just-saved answer and build the API response: the transcript if it is
+    ready within TRANSCRIPTION_WAIT_SECONDS, otherwise 202 with a job to poll.
+    
+    The job must have been reserved (transcription_jobs.reserve_job) before the answer was saved.
+    """
+    job = start_transcription(
+        job_id, response_data['audio_file_id'], content, service,
+        on_finished=lambda: check_interview_completion(candidate_id),
+    )
+    body = {
+        "message": "Audio response saved successfully",
+        "response_count": response_count,
+        "job_id": job['_id'],
+        "transcription_status": job['status'],
+    }
+    if job['status'] == TRANSCRIPTION_PENDING:
+        body['status_url'] = reverse('transcription-job', args=[job['_id']])
+        return Response(body, status=status.HTTP_202_ACCEPTED)
+    body['transcription'] = job.get('transcription') or ''
+    return Response(body, status=status.HTTP_200_OK)
+
 @api_view(['POST'])
 @permission_classes([])
+@parser_classes([MultiPartParser, FormParser, JSONParser])
 def save_audio_response(request):
     """
     Save audio response for a candidate.
+    
+    The recording is sent as a multipart file ('audio') and stored in GridFS; the
+    candidate document keeps only a reference, the duration and the transcription.
+    JSON with base64 'audio_data' is still accepted from older clients.
     """
     try:
         candidate_id = request.data.get("candidate_id")
         question_id = request.data.get("question_id")
         question_text = request.data.get("question_text")
+        audio_file = request.FILES.get("audio")
         audio_data = request.data.get("audio_data")
         transcription = request.data.get("transcription")
         duration = request.data.get("duration")
@@ -813,46 +1171,238 @@ def save_audio_response(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Find candidate
-        candidate = Candidate.objects.get(candidate_id=candidate_id, is_active=True)
+        content = None
+        if audio_file:
+            if audio_file.size > MAX_AUDIO_SIZE:
+                return Response(
+                    {"error": f"Audio file too large (max {MAX_AUDIO_SIZE // (1024 * 1024)}MB)"}, 
+                    status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+                )
+            content = audio_file.read()
+        elif audio_data:
+            try:
+                content = decode_audio_base64(audio_data)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            duration = float(duration or 0)
+        except (TypeError, ValueError):
+            return Response({"error": "duration must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+
+        response_count, _ = record_audio_response(
+            candidate_id, question_id, question_text, content, transcription, duration,
+            filename=audio_file.name if audio_file else None,
+        )
         
-        # Initialize audio_responses if it doesn't exist
-        if not candidate.audio_responses:
-            candidate.audio_responses = []
-        
-        response_data = {
-            "question_id": question_id,
-            "question_text": question_text,
-            "audio_data": audio_data,
-            "transcription": transcription or "",
-            "duration": duration or 0,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return Response({
+            "message": "Audio response saved successfully",
+            "response_count": response_count
+        }, status=status.HTTP_200_OK)
         
-        # Check if response already exists for this question and update it
-        existing_index = None
-        for i, response in enumerate(candidate.audio_responses):
-            if response.get("question_id") == question_id:
-                existing_index = i
-                break
+    except Candidate.DoesNotExist:
+        return Response(
+            {'error': 'Invalid candidate ID'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        return Response(
+            {'error': f'Failed to save audio response: {str(e)}'}, 
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['POST'])
+@permission_classes([])
+def create_audio_upload(request):
+    """
+    Open a resumable upload for one answer's audio (see audio_uploads.py).
+
+    The client then PUTs chunks to the returned upload as they are recorded and
+    finalizes it when recording stops.
+    """
+    try:
+        candidate_id = request.data.get("candidate_id")
+        question_id = request.data.get("question_id")
+        question_text = request.data.get("question_text")
+
+        if not all([candidate_id, question_id, question_text]):
+            return Response(
+                {"error": "Missing required fields: candidate_id, question_id, question_text"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not Candidate.get_active_row(candidate_id):
+            return Response(
+                {'error': 'Invalid candidate ID'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        upload = create_upload(candidate_id, question_id, question_text, request.data.get("filename"))
+        return Response({
+            'upload_id': upload['_id'],
+            'offset': 0,
+            'max_chunk_size': MAX_CHUNK_SIZE,
+        }, status=status.HTTP_201_CREATED)
+
+    except Exception as e:
+        return Response(
+            {'error': f'Failed to start upload: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['GET', 'PUT'])
+@permission_classes([])
+def audio_upload(request, upload_id):
+    """
+    GET: how many bytes of the upload the server has, so a client can resume after a dropped connection.
+    PUT: append the raw request body as the chunk starting at ?offset=.
+
+    A chunk at the wrong offset gets a 409 carrying the offset to resume from.
+    """
+    try:
+        if request.method == 'GET':
+            upload = get_upload(upload_id)
+            if upload is None:
+                return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+            return Response({'upload_id': upload_id, 'offset': upload['size'], 'status': upload['status']})
+
+        try:
+            offset = int(request.query_params.get('offset', ''))
+        except ValueError:
+            return Response({'error': 'offset must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            received = append_chunk(upload_id, offset, request.body)
+        except OffsetMismatch as e:
+            return Response({'error': str(e), 'offset': e.expected}, status=status.HTTP_409_CONFLICT)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if received is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'upload_id': upload_id, 'offset': received})
+
+    except Exception as e:
+        return Response(
+            {'error': f'Failed to upload chunk: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['POST'])
+@permission_classes([])
+def finalize_audio_upload(request, upload_id):
+    """
+    Assemble an upload into the answer's recording, save the response and transcribe it.
+    Returns the transcript, or 202 with a transcription job if it takes longer.
+
+    Optional: size (total bytes sent, checked against what arrived), duration,
+    transcription (skips transcribing), service (transcription service, default 'gemini').
+    """
+    try:
+        try:
+            duration = float(request.data.get("duration") or 0)
+            size = request.data.get("size")
+            size = int(size) if size not in (None, '') else None
+        except (TypeError, ValueError):
+            return Response({"error": "duration and size must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            claimed = claim_upload(upload_id, size)
+        except OffsetMismatch as e:
+            return Response({'error': 'Upload is incomplete', 'offset': e.expected}, status=status.HTTP_409_CONFLICT)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if claimed is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        upload, content = claimed
+
+        transcription = request.data.get("transcription")
+        job_id = None if transcription else reserve_job(upload['candidate_id'], upload['question_id'])
+        try:
+            response_count, response_data = record_audio_response(
+                upload['candidate_id'], upload['question_id'], upload['question_text'], content,
+                transcription, duration,
+                filename=upload.get('filename'),
+                check_completion=bool(transcription),
+            )
+        except Exception as e:
+            release_upload(upload_id)
+            if job_id:
+                cancel_job(job_id, f'Answer was not saved: {str(e)}')
+            raise
+
+        delete_upload(upload_id)
+        if transcription:
+            return Response({
+                "message": "Audio response saved successfully",
+                "transcription": transcription,
+                "response_count": response_count
+            }, status=status.HTTP_200_OK)
+        return transcription_response(
+            job_id, upload['candidate_id'], response_data, content, request.data.get("service", "gemini"),
+            response_count,
+        )
+
+    except Candidate.DoesNotExist:
+        return Response(
+            {'error': 'Invalid candidate ID'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        return Response(
+            {'error': f'Failed to finalize upload: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+@api_view(['POST'])
+@permission_classes([])
+@parser_classes([MultiPartParser, FormParser])
+def submit_audio_answer(request):
+    """
+    Save and transcribe one answer in a single request: the recording is uploaded once
+    (multipart 'audio'), stored, recorded on the candidate and transcribed.
+    
+    Returns the transcript, or 202 with a job_id/status_url to poll when transcription
+    takes longer than TRANSCRIPTION_WAIT_SECONDS. The answer is saved either way.
+    Optional: duration, service (transcription service, default 'gemini').
+    """
+    try:
+        candidate_id = request.data.get("candidate_id")
+        question_id = request.data.get("question_id")
+        question_text = request.data.get("question_text")
+        audio_file = request.FILES.get("audio")
         
-        if existing_index is not None:
-            candidate.audio_responses[existing_index] = response_data
-        else:
-            candidate.audio_responses.append(response_data)
+        if not all([candidate_id, question_id, question_text, audio_file]):
+            return Response(
+                {"error": "Missing required fields: candidate_id, question_id, question_text, audio"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        candidate.save()
+        if audio_file.size > MAX_AUDIO_SIZE:
+            return Response(
+                {"error": f"Audio file too large (max {MAX_AUDIO_SIZE // (1024 * 1024)}MB)"}, 
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
         
-        # Check if interview is completed and trigger auto-evaluation if needed
         try:
-            check_and_auto_evaluate(candidate)
-        except Exception as e:
-            print(f"Error checking auto-evaluation for candidate {candidate_id}: {str(e)}")
+            duration = float(request.data.get("duration") or 0)
+        except (TypeError, ValueError):
+            return Response({"error": "duration must be a number"}, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response({
-            "message": "Audio response saved successfully",
-            "response_count": len(candidate.audio_responses)
-        }, status=status.HTTP_200_OK)
+        content = audio_file.read()
+        job_id = reserve_job(candidate_id, question_id)
+        try:
+            response_count, response_data = record_audio_response(
+                candidate_id, question_id, question_text, content, "", duration,
+                filename=audio_file.name,
+                check_completion=False,
+            )
+        except Exception as e:
+            cancel_job(job_id, f'Answer was not saved: {str(e)}')
+            raise
+        return transcription_response(
+            job_id, candidate_id, response_data, content, request.data.get("service", "gemini"), response_count
+        )
         
     except Candidate.DoesNotExist:
         return Response(
@@ -865,6 +1415,24 @@ def save_audio_response(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['GET'])
+@permission_classes([])
+def transcription_job_status(request, job_id):
+    """
+    Status of a transcription job started by submit-audio-answer or an upload finalize.
+    """
+    job = get_job(job_id)
+    if job is None:
+        return Response({'error': 'Transcription job not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        'job_id': job_id,
+        'candidate_id': job['candidate_id'],
+        'question_id': job['question_id'],
+        'status': job['status'],
+        'transcription': job.get('transcription'),
+        'error': job.get('error'),
+    })
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def manual_evaluate_candidate(request):
@@ -950,7 +1518,6 @@ def fetch_candidate_evaluation(request):
     - evaluation_summary: Overall evaluation summary with scores and rating
     """
     try:
-        from .gridfs_models import get_resume_content
         from .ml_models.evaluate import evaluate_candidate_answer as eval_function
         from datetime import datetime
         
@@ -982,8 +1549,8 @@ def fetch_candidate_evaluation(request):
         
         # Get candidate resume
         try:
-            resume_content = get_resume_content(candidate_id)
-            if not resume_content:
+            resume_text = get_resume_text(candidate_id)
+            if not resume_text:
                 return Response(
                     {'error': 'Resume not found for this candidate'}, 
                     status=status.HTTP_404_NOT_FOUND
@@ -1022,7 +1589,7 @@ def fetch_candidate_evaluation(request):
             answer = evaluation['answer']
             
             try:
-                evaluation_result = eval_function(question, answer, resume_content)
+                evaluation_result = eval_function(question, answer, resume_text['text'])
                 
                 if not evaluation_result.get('error'):
                     total_score += evaluation_result.get('overall_score', 0)
@@ -1103,7 +1670,6 @@ def manual_evaluate_candidate(request):
     - evaluation_summary: Overall evaluation summary with scores and rating
     """
     try:
-        from .gridfs_models import get_resume_content
         from .ml_models.evaluate import evaluate_candidate_answer as eval_function
         from datetime import datetime
         
@@ -1154,14 +1720,14 @@ def manual_evaluate_candidate(request):
         
         # Get candidate resume
         try:
-            resume_content = get_resume_content(candidate_id)
-            if not resume_content:
+            resume_text = get_resume_text(candidate_id)
+            if not resume_text:
                 print(f"   ❌ No resume content found")
                 return Response(
                     {'error': 'Resume not found for this candidate'}, 
                     status=status.HTTP_404_NOT_FOUND
                 )
-            print(f"   📄 Resume content found: {len(resume_content)} characters")
+            print(f"   📄 Resume text found: {len(resume_text['text'])} characters, {resume_text['page_count']} pages")
         except Exception as e:
             print(f"   ❌ Resume retrieval error: {e}")
             return Response(
@@ -1211,7 +1777,7 @@ def manual_evaluate_candidate(request):
             print(f"   📝 Evaluating Q&A {idx+1}/{len(valid_transcriptions)}")
             
             try:
-                evaluation_result = eval_function(question, answer, resume_content)
+                evaluation_result = eval_function(question, answer, resume_text['text'])
                 
                 if not evaluation_result.get('error'):
                     score = evaluation_result.get('overall_score', 0)
@@ -1431,30 +1997,25 @@ def get_detailed_report(request, candidate_id):
         
         # Get audio responses for transcript
         try:
-            db = get_mongodb_connection()
-            if db is None:
-                print("Warning: Could not connect to MongoDB for audio responses")
-                report_data['responses'] = []
-            else:
-                fs = gridfs.GridFS(db)
-                audio_responses = []
-                
-                # Find audio responses for this candidate
-                audio_files = fs.find({
-                    'candidate_id': candidate.candidate_id,
-                    'type': 'audio_response'
-                })
-                
-                for audio_file in audio_files:
-                    response_data = {
-                        'question_id': audio_file.metadata.get('question_id', ''),
-                        'question': audio_file.metadata.get('question_text', 'Question not available'),
-                        'transcribed_text': audio_file.metadata.get('transcribed_text', 'Transcription not available'),
-                        'timestamp': audio_file.upload_date,
-                    }
-                    audio_responses.append(response_data)
+            fs = get_audio_helper().fs
+            audio_responses = []
+            
+            # Find audio responses for this candidate
+            audio_files = fs.find({
+                'metadata.candidate_id': candidate.candidate_id,
+                'metadata.type': 'audio_response'
+            })
                 
-                report_data['responses'] = audio_responses[:5]  # Limit to 5 most recent
+            for audio_file in audio_files:
+                response_data = {
+                    'question_id': audio_file.metadata.get('question_id', ''),
+                    'question': audio_file.metadata.get('question_text', 'Question not available'),
+                    'transcribed_text': audio_file.metadata.get('transcribed_text', 'Transcription not available'),
+                    'timestamp': audio_file.upload_date,
+                }
+                audio_responses.append(response_data)
+            
+            report_data['responses'] = audio_responses[:5]  # Limit to 5 most recent
             
         except Exception as e:
             print(f"Error fetching audio responses: {e}")
@@ -3,6 +3,10 @@ from django.views.decorators.http import require_GET
 from django.views.decorators.cache import never_cache
 import mongoengine
 from django.conf import settings
+from candidates.cache import get_cache_stats
+from candidates.invitations import get_mailer_stats
+from candidates.resume_pipeline import get_pipeline_stats
+from .mongodb_utils import get_client, get_pool_stats
 
 @require_GET
 @never_cache
@@ -20,12 +24,24 @@ def health_check(request):
     # Check MongoDB connection
     try:
         # Try to ping the database
-        mongoengine.connection.get_connection().admin.command('ping')
+        get_client().admin.command('ping')
         health_status['services']['mongodb'] = 'healthy'
     except Exception as e:
         health_status['services']['mongodb'] = f'unhealthy: {str(e)}'
         overall_healthy = False
     
+    # Connection pool usage for this process (sizing: MONGODB_MAX_POOL_SIZE etc.)
+    health_status['mongodb_pool'] = get_pool_stats()
+    
+    # Candidate cache effectiveness (hit/miss counters)
+    health_status['cache'] = get_cache_stats()
+    
+    # Invitation emails sent, failed and still queued in this process
+    health_status['invitation_mailer'] = get_mailer_stats()
+    
+    # Resumes parsed and embedded, failed and still queued in this process
+    health_status['resume_pipeline'] = get_pipeline_stats()
+    
     # Check if we're in debug mode (shouldn't be in production)
     if settings.DEBUG:
         health_status['services']['debug_mode'] = 'warning: debug is enabled'
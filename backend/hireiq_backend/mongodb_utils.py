@@ -1,45 +1,206 @@
 """
 MongoDB Atlas connection utilities for HireIQ backend
+
+The process has exactly one MongoClient: the one registered with mongoengine by
+connect_to_mongodb(). Raw pymongo access (GridFS, aggregations, bulk writes,
+management commands) goes through get_database()/get_client() so it shares that
+client's connection pool instead of opening new pools, TLS handshakes and
+monitoring threads of its own.
+
+The client is created with connect=False, so nothing is opened until the first
+operation, and a fork hook drops any client inherited from a parent process,
+along with the collections Document classes cached on it: each worker builds
+its own pool on first use.
+
+Pool sizing and timeouts are tunable through environment variables (see
+POOL_SETTINGS), and pool activity is counted by PoolMetrics for the health check.
 """
 import os
+import threading
 import mongoengine
+import mongoengine.connection
+from mongoengine.base.common import _document_registry
+from pymongo import monitoring
 from django.conf import settings
 
+DEFAULT_MONGODB_URL = 'mongodb://localhost:27017/'
+DEFAULT_MONGODB_NAME = 'hireiq_db'
+
+# MongoClient option -> (environment variable, default)
+POOL_SETTINGS = {
+    'maxPoolSize': ('MONGODB_MAX_POOL_SIZE', 50),
+    'minPoolSize': ('MONGODB_MIN_POOL_SIZE', 0),
+    'maxIdleTimeMS': ('MONGODB_MAX_IDLE_TIME_MS', 300000),
+    'waitQueueTimeoutMS': ('MONGODB_WAIT_QUEUE_TIMEOUT_MS', 10000),
+    'connectTimeoutMS': ('MONGODB_CONNECT_TIMEOUT_MS', 10000),
+    'serverSelectionTimeoutMS': ('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 10000),
+    'socketTimeoutMS': ('MONGODB_SOCKET_TIMEOUT_MS', 30000),
+}
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Counts connection pool events (CMAP) for this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.created = 0
+            self.closed = 0
+            self.checked_out = 0
+            self.checked_in = 0
+            self.checkout_failed = 0
+            self.pool_cleared = 0
+            self.in_use = 0
+            self.max_in_use = 0
+            self.open = 0
+
+    def _count(self, **changes):
+        with self._lock:
+            for name, delta in changes.items():
+                setattr(self, name, getattr(self, name) + delta)
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count(pool_cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count(created=1, open=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count(closed=1, open=-1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._count(checkout_failed=1)
+
+    def connection_checked_out(self, event):
+        self._count(checked_out=1, in_use=1)
+
+    def connection_checked_in(self, event):
+        self._count(checked_in=1, in_use=-1)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'open_connections': self.open,
+                'in_use': self.in_use,
+                'max_in_use': self.max_in_use,
+                'created': self.created,
+                'closed': self.closed,
+                'checkouts': self.checked_out,
+                'checkout_failures': self.checkout_failed,
+                'pool_clears': self.pool_cleared,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+def get_pool_options():
+    """MongoClient pool and timeout options from the environment"""
+    options = {}
+    for option, (variable, default) in POOL_SETTINGS.items():
+        value = os.getenv(variable)
+        try:
+            options[option] = int(value) if value not in (None, '') else default
+        except ValueError:
+            print(f"⚠️ Ignoring invalid {variable}={value!r}, using {default}")
+            options[option] = default
+    return options
+
+
+def get_mongodb_url():
+    """
+    Resolve the MongoDB URL from the environment, filling in the <db_password> placeholder
+    """
+    mongodb_url = os.getenv('MONGODB_URL') or DEFAULT_MONGODB_URL
+
+    # Replace <db_password> placeholder with actual password if needed
+    if '<db_password>' in mongodb_url:
+        db_password = os.getenv('MONGODB_PASSWORD')
+        if db_password:
+            mongodb_url = mongodb_url.replace('<db_password>', db_password)
+        else:
+            raise ValueError("MONGODB_PASSWORD environment variable not set")
+    return mongodb_url
+
+
 def connect_to_mongodb():
     """
-    Connect to MongoDB Atlas using the configuration from environment variables
+    Connect to MongoDB Atlas using the configuration from environment variables.
+    Registers the process-wide client with mongoengine; no connection is opened until first use.
     """
     try:
-        mongodb_url = os.getenv('MONGODB_URL')
-        mongodb_name = os.getenv('MONGODB_NAME', 'hireiq_db')
-        
-        if not mongodb_url:
-            raise ValueError("MONGODB_URL environment variable not set")
-        
-        # Replace <db_password> placeholder with actual password if needed
-        if '<db_password>' in mongodb_url:
-            db_password = os.getenv('MONGODB_PASSWORD')
-            if db_password:
-                mongodb_url = mongodb_url.replace('<db_password>', db_password)
-            else:
-                raise ValueError("MONGODB_PASSWORD environment variable not set")
-        
-        # Connect to MongoDB Atlas
+        mongodb_name = os.getenv('MONGODB_NAME', DEFAULT_MONGODB_NAME)
+
         mongoengine.connect(
             db=mongodb_name,
-            host=mongodb_url,
+            host=get_mongodb_url(),
             uuidRepresentation='standard',
             retryWrites=True,
-            w='majority'
+            w='majority',
+            connect=False,
+            event_listeners=[pool_metrics],
+            **get_pool_options()
         )
-        
-        print(f"✅ Successfully connected to MongoDB Atlas database: {mongodb_name}")
+
+        print(f"✅ MongoDB client configured for database: {mongodb_name} (connects on first use)")
         return True
-        
+
     except Exception as e:
         print(f"❌ Failed to connect to MongoDB Atlas: {e}")
         return False
 
+
+def _forget_inherited_client():
+    # MongoClient is not fork-safe: drop the parent's client (without closing its sockets,
+    # which the parent still owns) so this process lazily builds its own from the registered settings
+    alias = mongoengine.DEFAULT_CONNECTION_NAME
+    mongoengine.connection._connections.pop(alias, None)
+    mongoengine.connection._dbs.pop(alias, None)
+    # Each Document class caches its collection, which is bound to the parent's client too
+    for document_class in _document_registry.values():
+        if issubclass(document_class, mongoengine.Document):
+            document_class._collection = None
+    pool_metrics.reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_inherited_client)
+
+
+def get_client():
+    """The process-wide MongoClient shared with mongoengine"""
+    return mongoengine.connection.get_connection()
+
+
+def get_database():
+    """The HireIQ database on the process-wide client"""
+    return mongoengine.connection.get_db()
+
+
+def get_pool_stats():
+    """Pool configuration and activity counters for this process"""
+    return dict(pool_metrics.snapshot(), options=get_pool_options(), pid=os.getpid())
+
+
 def disconnect_from_mongodb():
     """
     Disconnect from MongoDB
@@ -55,9 +216,9 @@ def get_database_info():
     Get information about the current database connection
     """
     try:
-        connection = mongoengine.connection.get_connection()
-        database = mongoengine.connection.get_db()
-        
+        connection = get_client()
+        database = get_database()
+
         return {
             'connected': True,
             'database_name': database.name,
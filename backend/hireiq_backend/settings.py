@@ -100,16 +100,11 @@ DATABASES = {
 MONGODB_URL = os.getenv('MONGODB_URL')
 MONGODB_NAME = os.getenv('MONGODB_NAME', 'hireiq_db')
 
-# Connect to MongoDB Atlas
-try:
-    mongoengine.connect(
-        db=MONGODB_NAME,
-        host=MONGODB_URL,
-        uuidRepresentation='standard'
-    )
-    print("Successfully connected to MongoDB Atlas")
-except Exception as e:
-    print(f"Failed to connect to MongoDB Atlas: {e}")
+# Connect to MongoDB Atlas: one lazily-connected, fork-safe client per process, shared by
+# mongoengine and all raw pymongo/GridFS access. Pool size and timeouts come from
+# MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE, ... (see hireiq_backend/mongodb_utils.py)
+from .mongodb_utils import connect_to_mongodb
+connect_to_mongodb()
 
 # CORS settings - More permissive for development
 CORS_ALLOW_ALL_ORIGINS = True  # Allow all origins during development
@@ -2,6 +2,7 @@ import React, { useState, useRef, useEffect, useCallback } from 'react';
 import axios from 'axios';
 import { useTheme } from '../contexts/ThemeContext';
 import useSecurityMonitor from '../hooks/useSecurityMonitor';
+import useChunkedAudioUpload from '../hooks/useChunkedAudioUpload';
 
 interface Question {
   id: string;
@@ -15,6 +16,8 @@ interface AudioInterviewProps {
   onBackToPortal: () => void;
 }
 
+const RECORDER_TIMESLICE_MS = 1000; // how often MediaRecorder hands over a chunk to upload
+
 const AudioInterview: React.FC<AudioInterviewProps> = ({ candidateId, onBackToPortal }) => {
   const [questions, setQuestions] = useState<Question[]>([]);
   const [currentQuestionIndex, setCurrentQuestionIndex] = useState(0);
@@ -41,6 +44,7 @@ const AudioInterview: React.FC<AudioInterviewProps> = ({ candidateId, onBackToPo
   const streamRef = useRef<MediaStream | null>(null);
 
   const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
+  const { startUpload, appendChunk, finishUpload, abandonUpload } = useChunkedAudioUpload(candidateId);
 
   // Security monitoring
   const handleSecurityViolation = (reason: string) => {
@@ -158,9 +162,16 @@ const AudioInterview: React.FC<AudioInterviewProps> = ({ candidateId, onBackToPo
       mediaRecorderRef.current = mediaRecorder;
       audioChunksRef.current = [];
 
+      // Upload the answer while it is being recorded; without a session it is sent after stopping
+      const currentQuestion = questions[currentQuestionIndex];
+      if (currentQuestion) {
+        await startUpload(currentQuestion.id, currentQuestion.text);
+      }
+
       mediaRecorder.ondataavailable = (event) => {
         if (event.data.size > 0) {
           audioChunksRef.current.push(event.data);
+          appendChunk(event.data);
         }
       };
 
@@ -169,7 +180,7 @@ const AudioInterview: React.FC<AudioInterviewProps> = ({ candidateId, onBackToPo
         setAudioBlob(audioBlob);
       };
 
-      mediaRecorder.start();
+      mediaRecorder.start(RECORDER_TIMESLICE_MS);
       setIsRecording(true);
       setRecordingTime(0);
       console.log('🎙️ Recording started successfully');
@@ -230,17 +241,29 @@ const AudioInterview: React.FC<AudioInterviewProps> = ({ candidateId, onBackToPo
     }
   };
 
-  const blobToBase64 = (blob: Blob): Promise<string> => {
-    return new Promise((resolve, reject) => {
-      const reader = new FileReader();
-      reader.onloadend = () => {
-        const base64 = reader.result as string;
-        // Remove the data:audio/wav;base64, prefix
-        resolve(base64.split(',')[1]);
-      };
-      reader.onerror = reject;
-      reader.readAsDataURL(blob);
+  // Fallback when no chunked upload is available: upload the whole recording once; the
+  // server stores it, saves the response and transcribes it
+  const uploadWholeResponse = async (currentQuestion: Question) => {
+    if (!audioBlob) return;
+
+    const responseData = new FormData();
+    responseData.append('candidate_id', candidateId);
+    responseData.append('question_id', currentQuestion.id);
+    responseData.append('question_text', currentQuestion.text);
+    responseData.append('audio', audioBlob, 'response.wav');
+    responseData.append('duration', String(recordingTime));
+    responseData.append('service', 'gemini'); // Use Gemini transcription service
+
+    const response = await axios.post(`${API_BASE_URL}/candidates/submit-audio-answer/`, responseData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
     });
+
+    // 202: saved, transcript still being produced on the server (nothing to wait for here)
+    if (response.data.transcription) {
+      console.log('Transcription successful:', response.data.transcription.substring(0, 100) + '...');
+    }
   };
 
   const saveResponse = async () => {
@@ -253,42 +276,12 @@ const AudioInterview: React.FC<AudioInterviewProps> = ({ candidateId, onBackToPo
     setIsSubmitting(true);
 
     try {
-      // First, transcribe the audio
-      let transcription = '';
-      try {
-        const formData = new FormData();
-        formData.append('audio', audioBlob, 'response.wav');
-        formData.append('service', 'gemini'); // Use Gemini transcription service
-        
-        console.log('Transcribing audio...');
-        const transcriptionResponse = await axios.post(`${API_BASE_URL}/candidates/transcribe-audio/`, formData, {
-          headers: {
-            'Content-Type': 'multipart/form-data',
-          },
-        });
-        
-        if (transcriptionResponse.data.transcription) {
-          transcription = transcriptionResponse.data.transcription;
-          console.log('Transcription successful:', transcription.substring(0, 100) + '...');
-        }
-      } catch (transcriptionError) {
-        console.warn('Transcription failed, saving without transcription:', transcriptionError);
-        // Continue saving even if transcription fails
+      // Most of the recording was uploaded while it was being made: flush the rest and
+      // let the server transcribe and save it
+      const uploaded = await finishUpload(recordingTime);
+      if (!uploaded) {
+        await uploadWholeResponse(currentQuestion);
       }
-
-      // Then save the response with transcription
-      const audioBase64 = await blobToBase64(audioBlob);
-      
-      const responseData = {
-        candidate_id: candidateId,
-        question_id: currentQuestion.id,
-        question_text: currentQuestion.text,
-        audio_data: audioBase64,
-        transcription: transcription, // Now includes actual transcription
-        duration: recordingTime
-      };
-
-      await axios.post(`${API_BASE_URL}/candidates/save-audio-response/`, responseData);
       
       // Save response locally for UI
       setResponses(prev => ({
@@ -321,6 +314,7 @@ const AudioInterview: React.FC<AudioInterviewProps> = ({ candidateId, onBackToPo
   const previousQuestion = () => {
     if (currentQuestionIndex > 0) {
       setCurrentQuestionIndex(prev => prev - 1);
+      abandonUpload();
       setAudioBlob(null);
       setRecordingTime(0);
       setError('');
@@ -330,6 +324,7 @@ const AudioInterview: React.FC<AudioInterviewProps> = ({ candidateId, onBackToPo
   const skipQuestion = () => {
     if (currentQuestionIndex < questions.length - 1) {
       setCurrentQuestionIndex(prev => prev + 1);
+      abandonUpload();
       setAudioBlob(null);
       setRecordingTime(0);
       setError('');
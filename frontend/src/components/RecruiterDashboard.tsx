@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { GoogleLogin, googleLogout } from '@react-oauth/google';
 import { useNavigate } from 'react-router-dom';
 import { useTheme } from '../contexts/ThemeContext';
@@ -21,6 +21,7 @@ interface Candidate {
   candidate_id: string;
   email: string;
   created_at: string;
+  updated_at?: string;
   is_active: boolean;
   has_resume?: boolean;
   has_questions?: boolean;
@@ -34,6 +35,19 @@ interface Candidate {
   audio_responses_count?: number;
 }
 
+interface CandidateStats {
+  totals: {
+    invited: number;
+    active: number;
+    with_resume: number;
+    in_progress: number;
+    completed: number;
+    terminated: number;
+    evaluated: number;
+    average_score: number | null;
+  };
+}
+
 interface User {
   id: number;
   email: string;
@@ -55,6 +69,16 @@ const RecruiterDashboard: React.FC = () => {
   const [showDetailedReport, setShowDetailedReport] = useState(false);
   const [detailedReport, setDetailedReport] = useState<any>(null);
   const [loadingReport, setLoadingReport] = useState(false);
+  const [stats, setStats] = useState<CandidateStats | null>(null);
+  // Newest updated_at we've seen; the poller asks the backend only for changes after it
+  const syncTokenRef = useRef<string | null>(null);
+  const candidatesRef = useRef<Candidate[]>([]);
+  // Set whenever the list changes; stats are only refetched then
+  const statsStaleRef = useRef(false);
+
+  useEffect(() => {
+    candidatesRef.current = candidates;
+  }, [candidates]);
 
   const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
 
@@ -168,14 +192,35 @@ const RecruiterDashboard: React.FC = () => {
     if (user) {
       fetchCandidates();
       
+      // Live updates pushed by the backend; the interval below remains as a fallback
+      const candidateEvents = new EventSource(`${API_BASE_URL}/candidates/events/`, {
+        withCredentials: true,
+      });
+      const applyCandidateEvent = (event: MessageEvent) => {
+        const { candidate } = JSON.parse(event.data);
+        statsStaleRef.current = true;
+        setCandidates(previous => {
+          // Deletions may carry only the document id
+          const others = previous.filter(c => c.candidate_id !== candidate.candidate_id && c.id !== candidate.id);
+          if (!candidate.is_active) return others;
+          return [candidate, ...others].sort((a, b) => (a.created_at < b.created_at ? 1 : -1));
+        });
+      };
+      [
+        'candidate_created',
+        'candidate_updated',
+        'interview_started',
+        'interview_completed',
+        'interview_terminated',
+        'evaluation_completed',
+        'candidate_deleted',
+      ].forEach(name => candidateEvents.addEventListener(name, applyCandidateEvent as EventListener));
+      
       // Set up auto-refresh and auto-evaluation for candidates with completed interviews
       const autoRefreshInterval = setInterval(async () => {
-        // Fetch current candidates to check if any need evaluation updates
+        // Fetch only the candidates that changed since the last poll and merge them in
         try {
-          const response = await axios.get(`${API_BASE_URL}/candidates/`, {
-            withCredentials: true,
-          });
-          const currentCandidates = response.data;
+          const currentCandidates = await fetchCandidateChanges();
           
           // Check for candidates that have completed interviews but don't have scores
           const candidatesNeedingEvaluation = currentCandidates.filter((c: any) => 
@@ -196,12 +241,19 @@ const RecruiterDashboard: React.FC = () => {
           
           // Update candidates list
           setCandidates(currentCandidates);
+          if (statsStaleRef.current) {
+            statsStaleRef.current = false;
+            fetchStats();
+          }
         } catch (error) {
           console.error('Auto-refresh failed:', error);
         }
       }, 30000); // Check every 30 seconds for evaluation updates
       
-      return () => clearInterval(autoRefreshInterval);
+      return () => {
+        clearInterval(autoRefreshInterval);
+        candidateEvents.close();
+      };
     }
   }, [user]);
 
@@ -294,6 +346,8 @@ const RecruiterDashboard: React.FC = () => {
       console.log('Candidates response:', response.data);
       
       setCandidates(response.data);
+      syncTokenRef.current = latestUpdatedAt(response.data);
+      fetchStats();
     } catch (error: any) {
       console.error('Failed to fetch candidates:', error);
       if (error.response?.status === 401) {
@@ -305,6 +359,57 @@ const RecruiterDashboard: React.FC = () => {
     }
   };
 
+  const fetchStats = async () => {
+    try {
+      // Served with an ETag, so the browser's revalidation usually comes back 304
+      const response = await axios.get(`${API_BASE_URL}/candidates/stats/`, {
+        withCredentials: true,
+      });
+      setStats(response.data);
+    } catch (error) {
+      console.error('Failed to fetch candidate stats:', error);
+    }
+  };
+
+  const latestUpdatedAt = (rows: Candidate[]): string | null => {
+    let latest: string | null = null;
+    for (const row of rows) {
+      if (row.updated_at && (!latest || row.updated_at > latest)) {
+        latest = row.updated_at;
+      }
+    }
+    return latest;
+  };
+
+  const fetchCandidateChanges = async (): Promise<Candidate[]> => {
+    if (!syncTokenRef.current) {
+      // No baseline yet - take the full list once
+      const response = await axios.get(`${API_BASE_URL}/candidates/`, {
+        withCredentials: true,
+      });
+      syncTokenRef.current = latestUpdatedAt(response.data);
+      return response.data;
+    }
+
+    // The browser revalidates with If-None-Match, so an idle dashboard gets a 304
+    const response = await axios.get(`${API_BASE_URL}/candidates/`, {
+      params: { updated_since: syncTokenRef.current },
+      withCredentials: true,
+    });
+    const { results, removed, sync_token } = response.data;
+    syncTokenRef.current = sync_token;
+    if (results.length || removed.length) {
+      statsStaleRef.current = true;
+    }
+
+    const changedIds = new Set(results.map((c: Candidate) => c.candidate_id));
+    const removedIds = new Set(removed);
+    return [
+      ...results,
+      ...candidatesRef.current.filter(c => !changedIds.has(c.candidate_id) && !removedIds.has(c.candidate_id)),
+    ].sort((a, b) => (a.created_at < b.created_at ? 1 : -1));
+  };
+
   const triggerCandidateEvaluation = async (candidateId: string) => {
     try {
       console.log(`Triggering evaluation for candidate: ${candidateId}`);
@@ -690,7 +795,7 @@ const RecruiterDashboard: React.FC = () => {
                 </svg>
               </div>
               <div className="ml-4">
-                <p className="text-2xl font-bold text-gray-900 dark:text-white">{candidates.length}</p>
+                <p className="text-2xl font-bold text-gray-900 dark:text-white">{stats?.totals.invited ?? candidates.length}</p>
                 <p className="text-sm text-gray-600 dark:text-gray-400 font-medium">Total Candidates</p>
               </div>
             </div>
@@ -704,7 +809,7 @@ const RecruiterDashboard: React.FC = () => {
                 </svg>
               </div>
               <div className="ml-4">
-                <p className="text-2xl font-bold text-gray-900 dark:text-white">{candidates.filter(c => c.is_active).length}</p>
+                <p className="text-2xl font-bold text-gray-900 dark:text-white">{stats?.totals.active ?? candidates.filter(c => c.is_active).length}</p>
                 <p className="text-sm text-gray-600 dark:text-gray-400 font-medium">Active Candidates</p>
               </div>
             </div>
@@ -718,7 +823,7 @@ const RecruiterDashboard: React.FC = () => {
                 </svg>
               </div>
               <div className="ml-4">
-                <p className="text-2xl font-bold text-gray-900 dark:text-white">{candidates.filter(c => c.has_resume).length}</p>
+                <p className="text-2xl font-bold text-gray-900 dark:text-white">{stats?.totals.with_resume ?? candidates.filter(c => c.has_resume).length}</p>
                 <p className="text-sm text-gray-600 dark:text-gray-400 font-medium">Resumes Uploaded</p>
               </div>
             </div>
@@ -732,7 +837,7 @@ const RecruiterDashboard: React.FC = () => {
                 </svg>
               </div>
               <div className="ml-4">
-                <p className="text-2xl font-bold text-gray-900 dark:text-white">{candidates.filter(c => c.interview_score && c.interview_score > 0).length}</p>
+                <p className="text-2xl font-bold text-gray-900 dark:text-white">{stats?.totals.evaluated ?? candidates.filter(c => c.interview_score && c.interview_score > 0).length}</p>
                 <p className="text-sm text-gray-600 dark:text-gray-400 font-medium">AI Interviews Done</p>
               </div>
             </div>
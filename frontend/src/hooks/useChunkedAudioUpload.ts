@@ -0,0 +1,143 @@
+import { useCallback, useRef } from 'react';
+import axios from 'axios';
+
+interface UploadSession {
+  uploadId: string;
+  maxChunkSize: number;
+  parts: Blob[];      // everything recorded so far, kept until the server has it
+  recorded: number;   // bytes recorded
+  offset: number;     // bytes the server has acknowledged
+  sending: Promise<void> | null;
+  abandoned: boolean;
+}
+
+const RETRY_DELAY_MS = 1000;
+const MAX_RETRIES = 5;
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Uploads an answer while it is being recorded: each MediaRecorder chunk is sent to a
+ * resumable upload session as soon as it is available, so stopping only has to flush
+ * the last few seconds. Dropped requests are retried from the offset the server reports.
+ */
+const useChunkedAudioUpload = (candidateId: string) => {
+  const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
+  const sessionRef = useRef<UploadSession | null>(null);
+
+  const uploadUrl = useCallback((uploadId: string) => (
+    `${API_BASE_URL}/candidates/audio-uploads/${uploadId}/`
+  ), [API_BASE_URL]);
+
+  // Send everything recorded but not yet acknowledged, one chunk at a time
+  const drain = useCallback(async (session: UploadSession) => {
+    let failures = 0;
+    while (!session.abandoned && session.offset < session.recorded) {
+      const end = Math.min(session.recorded, session.offset + session.maxChunkSize);
+      const chunk = new Blob(session.parts).slice(session.offset, end);
+      try {
+        const response = await axios.put(`${uploadUrl(session.uploadId)}?offset=${session.offset}`, chunk, {
+          headers: { 'Content-Type': 'application/octet-stream' },
+        });
+        session.offset = response.data.offset;
+        failures = 0;
+      } catch (error: any) {
+        if (error.response?.status === 409 && typeof error.response.data?.offset === 'number') {
+          session.offset = error.response.data.offset; // resume where the server actually is
+          continue;
+        }
+        if (++failures > MAX_RETRIES) throw error;
+        console.warn(`Chunk upload failed, retrying (${failures}/${MAX_RETRIES})`, error);
+        await sleep(RETRY_DELAY_MS * failures);
+        try {
+          const status = await axios.get(uploadUrl(session.uploadId));
+          session.offset = status.data.offset;
+        } catch (statusError) {
+          // Still offline; retry the same chunk after the next delay
+        }
+      }
+    }
+  }, [uploadUrl]);
+
+  const kick = useCallback((session: UploadSession) => {
+    if (session.sending) return;
+    // drain() keeps going until it catches up with the recording, so one sender is enough;
+    // if it gives up, finishUpload() tries once more before falling back
+    session.sending = drain(session)
+      .catch(error => console.error('Chunked upload stalled:', error))
+      .finally(() => {
+        session.sending = null;
+      });
+  }, [drain]);
+
+  /** Open an upload session for a question; returns false if the server can't take one */
+  const startUpload = useCallback(async (questionId: string, questionText: string) => {
+    if (sessionRef.current) sessionRef.current.abandoned = true;
+    sessionRef.current = null;
+    try {
+      const response = await axios.post(`${API_BASE_URL}/candidates/audio-uploads/`, {
+        candidate_id: candidateId,
+        question_id: questionId,
+        question_text: questionText,
+        filename: 'response.wav',
+      });
+      sessionRef.current = {
+        uploadId: response.data.upload_id,
+        maxChunkSize: response.data.max_chunk_size,
+        parts: [],
+        recorded: 0,
+        offset: 0,
+        sending: null,
+        abandoned: false,
+      };
+      return true;
+    } catch (error) {
+      console.warn('Could not start chunked upload, will upload after recording:', error);
+      return false;
+    }
+  }, [API_BASE_URL, candidateId]);
+
+  /** Queue a recorded chunk for upload */
+  const appendChunk = useCallback((data: Blob) => {
+    const session = sessionRef.current;
+    if (!session || data.size === 0) return;
+    session.parts.push(data);
+    session.recorded += data.size;
+    kick(session);
+  }, [kick]);
+
+  /**
+   * Flush the remaining chunks and finalize; the server transcribes and saves the answer.
+   * Returns the finalize response, or null if there is no usable upload (use the fallback).
+   */
+  const finishUpload = useCallback(async (duration: number) => {
+    const session = sessionRef.current;
+    if (!session) return null;
+    try {
+      if (session.sending) await session.sending;
+      await drain(session);
+      const response = await axios.post(`${uploadUrl(session.uploadId)}finalize/`, {
+        size: session.recorded,
+        duration,
+        service: 'gemini',
+      });
+      sessionRef.current = null;
+      return response.data;
+    } catch (error) {
+      console.warn('Chunked upload failed, falling back to a single upload:', error);
+      session.abandoned = true;
+      sessionRef.current = null;
+      return null;
+    }
+  }, [drain, uploadUrl]);
+
+  /** Drop the current upload (e.g. the answer is being re-recorded); the server expires it */
+  const abandonUpload = useCallback(() => {
+    if (sessionRef.current) sessionRef.current.abandoned = true;
+    sessionRef.current = null;
+  }, []);
+
+  return { startUpload, appendChunk, finishUpload, abandonUpload };
+};
+
+export default useChunkedAudioUpload;